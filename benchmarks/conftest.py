@@ -0,0 +1,49 @@
+"""Shared fixtures for the framework benchmarks.
+
+The benchmarks are not part of the regular test run (``testpaths`` is
+``tests``). Run them with::
+
+    uv run --group bench pytest benchmarks --benchmark-autosave
+
+Set ``NGARGPARSER_BENCH_FULL=1`` to add the largest sizes (1e7 result rows),
+which take minutes and several GB of memory.
+"""
+
+import os
+import sys
+from argparse import Namespace
+
+import pytest
+
+from ngargparser import cli
+
+FULL = os.environ.get("NGARGPARSER_BENCH_FULL", "").strip().lower() not in ("", "0", "false", "no")
+
+
+def sizes(*default, full=()):
+    """Parametrize sizes: ``default`` always, ``full`` only with NGARGPARSER_BENCH_FULL=1."""
+    return list(default) + (list(full) if FULL else [])
+
+
+@pytest.fixture(scope="session")
+def demo_project(tmp_path_factory):
+    """A generated project named 'demo' with its ``src/`` importable (``core.*``, ``DemoArgumentParser``)."""
+    root = tmp_path_factory.mktemp("scaffold")
+    mp = pytest.MonkeyPatch()
+    mp.chdir(root)
+    mp.setattr(cli.shutil, "which", lambda _cmd: None)
+    try:
+        assert not cli.startapp_command(Namespace(project_name="demo"))
+    finally:
+        mp.undo()
+    project = root / "demo"
+    (project / "paths.py").write_text("")
+    (project / ".env").write_text(f"APP_ROOT={project}\nAPP_NAME=demo\n")
+
+    src = str(project / "src")
+    sys.path.insert(0, src)
+    yield project
+    sys.path.remove(src)
+    for name in list(sys.modules):
+        if name == "core" or name.startswith("core.") or name in ("DemoArgumentParser", "validators"):
+            del sys.modules[name]
@@ -0,0 +1,92 @@
+"""Build staging (``scripts/core/build.py``) of a large vendored ``libs/`` tree."""
+
+import shutil
+import subprocess
+
+import pytest
+from conftest import sizes
+
+from ngargparser import build
+
+
+@pytest.fixture(scope="module", params=sizes(2_000, 20_000, full=[200_000]), ids=lambda n: f"{n}files")
+def project(request, tmp_path_factory):
+    """A project whose libs/ holds ``n`` files, a tenth of them excluded (``*.pyc`` under ``__pycache__/``)."""
+    n = request.param
+    root = tmp_path_factory.mktemp("project")
+    excluded = []
+    per_pkg = 100
+    for i in range(n // per_pkg):
+        pkg = root / "libs" / f"pkg{i}"
+        (pkg / "__pycache__").mkdir(parents=True)
+        for j in range(per_pkg - per_pkg // 10):
+            (pkg / f"mod{j}.py").write_text("")
+        for j in range(per_pkg // 10):
+            (pkg / "__pycache__" / f"mod{j}.pyc").write_bytes(b"")
+            excluded.append(f"libs/pkg{i}/__pycache__/mod{j}.pyc")
+        excluded.append(f"libs/pkg{i}/__pycache__/")
+    return root, build.Exclusions(excluded)
+
+
+@pytest.mark.parametrize("link_mode", build.LINK_MODES)
+def test_stage_libs(benchmark, project, tmp_path, link_mode):
+    root, exclusions = project
+    counter = iter(range(10**6))
+
+    def run():
+        build_dir = tmp_path / str(next(counter))
+        build.Stager(exclusions, link_mode=link_mode).stage_project(str(root), str(build_dir), ["libs"])
+        return build_dir
+
+    build_dir = benchmark.pedantic(run, rounds=3, iterations=1)
+
+    assert not list((build_dir / "libs").glob("*/__pycache__"))
+    shutil.rmtree(tmp_path)
+
+
+def test_restage_unchanged_libs(benchmark, project, tmp_path):
+    """An incremental rebuild with nothing changed: stats and manifest lookups, no copies."""
+    root, exclusions = project
+    build_dir, manifest_path = str(tmp_path / "tool"), str(tmp_path / "manifest.json")
+
+    def run():
+        manifest = build.prepare_incremental(manifest_path, build_dir, "key")
+        build.Stager(exclusions, manifest=manifest).stage_project(str(root), build_dir, ["libs"])
+        manifest.save()
+        return manifest
+
+    run()
+    manifest = benchmark.pedantic(run, rounds=3, iterations=1)
+
+    assert manifest.restaged == []
+    shutil.rmtree(tmp_path)
+
+
+@pytest.mark.parametrize("jobs", [1, None], ids=["1thread", "allcpus"])
+def test_package_python_gzip(benchmark, project, tmp_path, jobs):
+    """``build.py package`` with the built-in parallel gzip (no pigz)."""
+    root, _exclusions = project
+    output = str(tmp_path / "tool.tar.gz")
+
+    benchmark.pedantic(build.write_tarball, args=(str(root), "libs", output, "python", jobs), rounds=3, iterations=1)
+
+
+def test_package_cache_hit(benchmark, project, tmp_path):
+    """Re-packaging an unchanged tree: hash it, then link the cached tarball."""
+    root, _exclusions = project
+    args = (str(root), "libs", str(tmp_path / "tool.tar.gz"), "python", None, 0, str(tmp_path / "cache"))
+    build.write_tarball(*args)
+
+    assert benchmark.pedantic(build.write_tarball, args=args, rounds=3, iterations=1) == "cache"
+
+
+def test_evaluate_exclusions(benchmark, project, tmp_path):
+    """``build.py exclusions``: one walk, pruning the excluded ``__pycache__/`` dirs unread."""
+    root, exclusions = project
+    repo = tmp_path / "repo"
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    (repo / ".gitignore").write_text(".*\n__pycache__/\n")
+
+    _candidates, excluded = benchmark.pedantic(build.evaluate_exclusions, args=(str(root), str(repo)), rounds=3)
+
+    assert len(excluded) == len([path for path in exclusions.excluded if path.endswith("/")])
@@ -0,0 +1,43 @@
+"""Preprocess output layout: ``create_directory_structure_for_dependencies`` and re-runs on an existing layout."""
+
+import pytest
+
+from ngargparser import cli, core_validators
+
+
+@pytest.fixture(params=[1, 10, 100], ids=lambda n: f"{n}deps")
+def paths_file(request, tmp_path):
+    sections = []
+    for i in range(request.param):
+        section = cli.generate_dependency_section(f"tool {i}")
+        sections.append(section.replace(f"tool_{i}_path=None", f"tool_{i}_path='/opt/tool_{i}'"))
+    path = tmp_path / "paths.py"
+    path.write_text("\n\n".join(sections) + "\n")
+    return request.param, path
+
+
+def test_create_directory_structure(benchmark, paths_file, tmp_path_factory, capsys):
+    n_deps, path = paths_file
+    outputs = iter(tmp_path_factory.mktemp("out") / str(i) for i in range(10**6))
+
+    def run():
+        return core_validators.create_directory_structure_for_dependencies(next(outputs), path)
+
+    created = benchmark.pedantic(run, rounds=10, iterations=1)
+
+    capsys.readouterr()
+    assert len(created) == n_deps + 1
+
+
+def test_rerun_on_existing_layout(benchmark, paths_file, tmp_path):
+    """Re-running preprocess on an output dir that already has its layout: plan + existence checks only."""
+    _, path = paths_file
+    layout, _ = core_validators.plan_output_layout(tmp_path / "out", path)
+    core_validators.materialize_layout(layout)
+
+    def run():
+        core_validators._materialized.clear()
+        planned, _ = core_validators.plan_output_layout(tmp_path / "out", path)
+        return core_validators.materialize_layout(planned)
+
+    assert benchmark(run) == []
@@ -0,0 +1,52 @@
+"""``create_job_descriptions_file`` on a 1e5-unit preprocess run, with and without a manifest."""
+
+import pytest
+
+from ngargparser import job_descriptions as jd
+
+N_UNITS = 100_000
+
+
+@pytest.fixture(scope="module")
+def preprocessed_run(tmp_path_factory):
+    """A run directory whose params dir holds 1e5 unit files, plus a manifest listing them."""
+    run = tmp_path_factory.mktemp("run")
+    params = run / "predict-inputs" / "params"
+    params.mkdir(parents=True)
+    manifest = jd.RunManifest(run)
+    for i in range(N_UNITS):
+        path = params / f"{i}.json"
+        path.write_text('{"peptides": ["SIINFEKL"]}')
+        manifest.add_unit(path, records=i % 100 + 1)
+    manifest.save()
+    return run, params
+
+
+def test_from_manifest(benchmark, preprocessed_run):
+    run, params = preprocessed_run
+
+    _, n_jobs = benchmark.pedantic(
+        jd.create_job_descriptions_file, args=(run, "run_demo.py", params), rounds=3, iterations=1
+    )
+
+    assert n_jobs == N_UNITS + 1
+
+
+def test_ctime_fallback(benchmark, preprocessed_run, tmp_path):
+    """Projects without a manifest scan and stat the params directory instead."""
+    _, params = preprocessed_run
+
+    _, n_jobs = benchmark.pedantic(
+        jd.create_job_descriptions_file, args=(tmp_path, "run_demo.py", params), rounds=3, iterations=1
+    )
+
+    assert n_jobs >= 2
+
+
+def test_iterate_job_descriptions(benchmark, preprocessed_run):
+    run, params = preprocessed_run
+    jd_path, _ = jd.create_job_descriptions_file(run, "run_demo.py", params)
+
+    count = benchmark.pedantic(lambda: sum(1 for _ in jd.iter_job_descriptions(jd_path)), rounds=3, iterations=1)
+
+    assert count == N_UNITS + 1
@@ -0,0 +1,30 @@
+"""Parser construction and ``parse_args`` latency for ``predict`` — paid by every job."""
+
+import importlib
+import sys
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def parser_cls(demo_project):
+    return importlib.import_module("DemoArgumentParser").DemoArgumentParser
+
+
+def test_construct_parser(benchmark, parser_cls):
+    benchmark(parser_cls)
+
+
+def test_parse_predict_args(benchmark, parser_cls, monkeypatch, tmp_path):
+    parser = parser_cls()
+    monkeypatch.setattr(sys, "argv", ["run_demo.py", "predict", "-o", str(tmp_path / "result"), "-f", "json"])
+
+    args = benchmark(parser.parse_args)
+
+    assert args.subcommand == "predict"
+
+
+def test_construct_and_parse_predict(benchmark, parser_cls, monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, "argv", ["run_demo.py", "predict", "-o", str(tmp_path / "result")])
+
+    benchmark(lambda: parser_cls().parse_args())
@@ -0,0 +1,31 @@
+"""``write_results`` throughput for tsv and json envelopes of growing size."""
+
+import pytest
+from conftest import sizes
+
+from ngargparser.result_writer import write_results
+
+ROWS = sizes(10_000, 100_000, 1_000_000, full=(10_000_000,))
+
+
+@pytest.fixture(scope="module", params=ROWS, ids=lambda n: f"{n:.0e}rows")
+def envelope(request):
+    n = request.param
+    rows = [[f"PEP{i}", i % 9 + 8, i * 0.001] for i in range(n)]
+    return n, {
+        "warnings": [],
+        "errors": [],
+        "results": [{"type": "peptide_table", "table_columns": ["peptide", "length", "score"], "table_data": rows}],
+    }
+
+
+@pytest.mark.parametrize("output_format", ["tsv", "json"])
+def test_write_results(benchmark, envelope, output_format, tmp_path, capsys):
+    n, result = envelope
+    benchmark.extra_info["rows"] = n
+
+    rounds = 5 if n <= 100_000 else 1
+    written = benchmark.pedantic(write_results, args=(result, tmp_path / "out", output_format), rounds=rounds)
+
+    capsys.readouterr()
+    assert len(written) == 1
@@ -0,0 +1,41 @@
+"""``core.set_pythonpath`` import cost with a large vendored ``libs/`` tree."""
+
+import runpy
+import sys
+from pathlib import Path
+
+import pytest
+
+SET_PYTHONPATH = Path(__file__).resolve().parents[1] / "ngargparser" / "templates" / "set_pythonpath.py"
+
+
+@pytest.fixture(scope="module", params=[(20, 10), (200, 20)], ids=lambda p: f"{p[0]}pkgs-x{p[1]}")
+def app_root(request, tmp_path_factory):
+    """An APP_ROOT whose libs/ holds ``n_pkgs`` packages, each with ``width`` subpackages and data dirs."""
+    n_pkgs, width = request.param
+    root = tmp_path_factory.mktemp("app")
+    for i in range(n_pkgs):
+        pkg = root / "libs" / f"pkg{i}"
+        for j in range(width):
+            sub = pkg / f"sub{j}"
+            sub.mkdir(parents=True)
+            (sub / "__init__.py").write_text("")
+            (pkg / f"data{j}").mkdir()
+            (pkg / f"data{j}" / "table.tsv").write_text("a\tb\n")
+        (pkg / "__init__.py").write_text("")
+    return root
+
+
+def test_import_set_pythonpath(benchmark, app_root, monkeypatch):
+    monkeypatch.setenv("APP_ROOT", str(app_root))
+    original = list(sys.path)
+
+    def run():
+        runpy.run_path(str(SET_PYTHONPATH))
+        added = len(sys.path) - len(original)
+        sys.path[:] = original
+        return added
+
+    added = benchmark(run)
+
+    assert added > 1
@@ -1,12 +1,14 @@
 import argparse
 import textwrap
-import string
-import random
-import json
 import os
+import sys
 import core.core_validators as validators
+import core.anchors as anchors
+import core.job_descriptions as job_descriptions
+import core.timing as timing
+import core.parser_cache as parser_cache
+from core.job_descriptions import JobDescriptionParams  # re-exported for tools that import it from here
 from pathlib import Path
-from typing import TypedDict, List
 import dotenv
 
 # Load environment variables from .env file
@@ -32,7 +34,16 @@ class SubparserWrapper:
     
     def __getattr__(self, name):
         """Delegate attribute access to the wrapped subparser"""
+        if name.startswith('__') or name in ('_subparser', '_subparser_name', '_parent_parser', '_help_text'):
+            # Not set yet (e.g. while unpickling): don't recurse through _subparser
+            raise AttributeError(name)
         return getattr(self._subparser, name)
+
+    def __getstate__(self):
+        return self.__dict__
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
     
     def __setattr__(self, name, value):
         if name.startswith('_'):
@@ -111,62 +122,82 @@ class SubparserWrapper:
         if not args:
             return False
         
-        # Get the primary argument name (first argument)
-        argument_name = args[0]
-        
-        # Find the argument in any existing group
-        target_action = None
-        original_group = None
-        
-        for group in self._subparser._action_groups:
-            for action in group._group_actions:
-                if argument_name in action.option_strings:
-                    target_action = action
-                    original_group = group
-                    break
-            if target_action:
-                break
-        
-        if not target_action or not original_group:
+        # Look the argument up by its primary option string (first argument) in
+        # argparse's own option-string index, and its group via action.container
+        target_action = self._subparser._option_string_actions.get(args[0])
+        original_group = getattr(target_action, 'container', None)
+        if target_action is None or original_group is None:
             return False
         
         # Remove from original group
         original_group._group_actions.remove(target_action)
         
-        # Update option strings if new ones are provided
+        # Update option strings if new ones are provided, keeping the index in step
         if len(args) > 1:
+            index = self._subparser._option_string_actions
+            for option_string in target_action.option_strings:
+                if index.get(option_string) is target_action:
+                    del index[option_string]
             target_action.option_strings = list(args)
+            for option_string in target_action.option_strings:
+                index[option_string] = target_action
         
         # Apply new properties to the action
         for key, value in new_kwargs.items():
             if hasattr(target_action, key):
                 setattr(target_action, key, value)
         
-        # Handle group change if specified
+        # Handle group change if specified, finding or creating the new group
         new_group_name = new_kwargs.get('group')
-        if new_group_name:
-            # Find or create the new group
-            new_group = None
-            for group in self._subparser._action_groups:
-                if group.title == new_group_name:
-                    new_group = group
-                    break
-            
-            if not new_group:
-                # Create new group if it doesn't exist
-                new_group = self._subparser.add_argument_group(new_group_name)
-            
-            # Add to new group
-            new_group._group_actions.append(target_action)
-        else:
-            # Keep in original group
-            original_group._group_actions.append(target_action)
+        new_group = group_by_title(self._subparser, new_group_name, create=True) if new_group_name else original_group
+        new_group._group_actions.append(target_action)
+        target_action.container = new_group
         
         return True
 
 
 
 
+def group_by_title(parser, title, create=False):
+    """Return ``parser``'s argument group titled ``title``, or None.
+
+    Lookups go through a ``{title: group}`` index kept on the parser
+    (``parser._argument_groups``). Only a miss scans ``_action_groups``, for
+    groups created without going through the index, and the result is then
+    indexed too. With ``create=True`` a missing group is created.
+    """
+    parser = getattr(parser, '_subparser', parser)
+    index = parser.__dict__.setdefault('_argument_groups', {})
+    group = index.get(title)
+    if group is None:
+        group = next((g for g in parser._action_groups if g.title == title), None)
+        if group is None and create:
+            group = parser.add_argument_group(title)
+        if group is not None:
+            index[title] = group
+    return group
+
+
+class GroupedAddArgument:
+    """The ``add_argument`` that ``patch_parser_for_groups`` installs on a parser.
+
+    It accepts an extra ``group='Title'`` keyword. A class rather than a closure
+    so patched parsers stay picklable (see core.parser_cache).
+    """
+    def __init__(self, parser, target):
+        self.parser = parser
+        self.target = target
+
+    def __call__(self, *args, **kwargs):
+        group_name = kwargs.pop('group', None)
+        parser = self.parser
+
+        if group_name:
+            # Existing group (by title) or a new one, found through the title index
+            return group_by_title(parser, group_name, create=True).add_argument(*args, **kwargs)
+        return type(self.target).add_argument(self.target, *args, **kwargs)
+
+
 class NGArgumentParser(argparse.ArgumentParser):
     ''' Setting default paths '''
     # defaults for preprocessing
@@ -204,6 +235,13 @@ class NGArgumentParser(argparse.ArgumentParser):
         # Variable to decide whether or not the default output file structure
         # should be used or not.
         self.use_default_fs=True
+
+        # Checks run on the parsed arguments (see add_validation_step); the
+        # skippable ones don't run under --assume-valid
+        self.validation_steps = []
+        self.add_validation_step(self.validate_mutually_exclusive_args,
+                                 subcommands=['postprocess'],
+                                 skippable=False)
         
         # Create subparser 'preprocess'
         # -----------------------------------------------------
@@ -237,7 +275,7 @@ class NGArgumentParser(argparse.ArgumentParser):
         # defaults will be set dynamically based on output-dir
         self.preprocess_optional_group.add_argument("--params-dir",
                                         dest="preprocess_parameters_dir",
-                                        type=validators.validate_directory,
+                                        type=self._validate_preprocess_directory,
                                         help="""
                                         a directory to store preprocessed JSON input files
                                         (default: $OUTPUT_DIR/predict-inputs/params)
@@ -246,17 +284,14 @@ class NGArgumentParser(argparse.ArgumentParser):
         # defaults will be set dynamically based on output-dir
         self.preprocess_optional_group.add_argument("--inputs-dir",
                                         dest="preprocess_inputs_dir",
-                                        type=validators.validate_directory,
+                                        type=self._validate_preprocess_directory,
                                         help="""
                                         a directory to store other, non-JSON inputs (e.g., fasta files)
                                         (default: $OUTPUT_DIR/predict-inputs/data)
                                         """)
 
-        self.preprocess_optional_group.add_argument("--assume-valid",
-                                        action="store_true",
-                                        dest="assume_valid_flag",
-                                        default=False,
-                                        help="flag to indicate validation can be skipped")
+        self.add_assume_valid_argument(self.preprocess_optional_group)
+        self.add_profile_argument(self.preprocess_optional_group)
         
         # Create subparser 'postprocess'
         # -----------------------------------------------------
@@ -306,11 +341,25 @@ class NGArgumentParser(argparse.ArgumentParser):
                                 help="postprocessed result output format "
                                      "(choices: %(choices)s; default: %(default)s).")
 
+        self.add_assume_valid_argument(self.postprocess_optional_group)
+        self.add_profile_argument(self.postprocess_optional_group)
+
         # Add patch for groups
         self.patch_parser_for_groups(self.parser_preprocess)
         self.patch_parser_for_groups(self.parser_postprocess)
 
 
+    @classmethod
+    def cached(cls):
+        """Build this parser, or load it from the parser spec cache.
+
+        The first run pickles the finished parser; later runs with unchanged
+        sources unpickle it instead of re-running ``__init__``. ``--help`` always
+        builds from scratch (see core.parser_cache).
+        """
+        with timing.stage('build_parser'):
+            return parser_cache.load_or_build(cls)
+
     def add_predict_subparser(self, help='', description='', formatter_class=argparse.HelpFormatter):
         '''
         Creates and returns a 'predict' subparser with customizable help and description text.
@@ -355,20 +404,51 @@ class NGArgumentParser(argparse.ArgumentParser):
                                 help="prediction result output format "
                                      "(choices: %(choices)s; default: %(default)s).",
                                 group="output options")
+        self.add_assume_valid_argument(self.parser_predict, group="output options")
+        self.add_profile_argument(self.parser_predict, group="output options")
 
         # add common arguments across tools
         # self.parser_predict.add_argument("--input-json", "-j",
         #                          dest="input_json",
         #                          help="JSON file containing input parameters.",
         #                          metavar="JSON_FILE")
-        # self.parser_predict.add_argument("--assume-valid",
-        #                                 action="store_true",
-        #                                 dest="assume_valid_flag",
-        #                                 default=False,
-        #                                 help="flag to indicate validation can be skipped")
         
         return self.parser_predict
 
+    @staticmethod
+    def add_assume_valid_argument(parser, **kwargs):
+        """Add the framework-wide ``--assume-valid`` option to a subcommand.
+
+        With it, the ``core_validators`` path checks (and any validator decorated
+        with ``skip_if_assume_valid``) return their input unchecked, and skippable
+        validation steps don't run. Preprocess still creates its output tree. Predict jobs generated by preprocess pass it (see
+        core.job_descriptions).
+        """
+        parser.add_argument(validators.ASSUME_VALID_FLAG,
+                            action="store_true",
+                            dest="assume_valid_flag",
+                            default=False,
+                            help="skip validation; for trusted, machine-generated inputs.",
+                            **kwargs)
+
+    @staticmethod
+    def add_profile_argument(parser, **kwargs):
+        """Add the framework-wide ``--profile[=cprofile|tracemalloc]`` option to a subcommand.
+
+        ``parse_args`` starts the requested profiler, so ``run_<tool>.py`` needs
+        no changes (see core.timing.start_profile).
+        """
+        parser.add_argument("--profile",
+                            dest="profile",
+                            nargs="?",
+                            const="cprofile",
+                            choices=timing.PROFILE_MODES,
+                            default=None,
+                            help="profile this run and write a .prof file (cprofile, the default) or an "
+                                 "allocation snapshot (tracemalloc) next to the output prefix.",
+                            metavar="{cprofile,tracemalloc}",
+                            **kwargs)
+
     def set_subcommand_order(self, order):
         """Reorder subcommands in help output.
         
@@ -409,6 +489,38 @@ class NGArgumentParser(argparse.ArgumentParser):
                 action.choices = new_choices
                 break
 
+    def add_validation_step(self, step, subcommands=None, skippable=True):
+        """Register a check to run on the parsed arguments.
+
+        Steps run in the order added, after argparse has converted every
+        argument. A step reports a problem by raising
+        ``argparse.ArgumentTypeError``, which is shown as a usage error of the
+        subcommand. Put schema checks that need several arguments together
+        here rather than in a ``type=`` validator.
+
+        Args:
+            step (callable): Called as ``step(args)``.
+            subcommands (list, optional): Subcommands the step applies to
+                (default: all).
+            skippable (bool): Skip the step under ``--assume-valid``.
+        """
+        self.validation_steps.append((step, subcommands, skippable))
+
+    def run_validation_steps(self, args):
+        """Run the registered validation steps that apply to ``args.subcommand``."""
+        subcommand = getattr(args, 'subcommand', None)
+        trusted = validators.assume_valid()
+        for step, subcommands, skippable in self.validation_steps:
+            if subcommands is not None and subcommand not in subcommands:
+                continue
+            if skippable and trusted:
+                continue
+            try:
+                step(args)
+            except argparse.ArgumentTypeError as e:
+                subparser = getattr(self, f'parser_{subcommand}', None) or self
+                subparser.error(str(e))
+
     def validate_mutually_exclusive_args(self, args):
         """Manually validate that exactly one of the mutually exclusive args is provided"""
         job_desc_provided = args.job_desc_file is not None
@@ -422,9 +534,10 @@ class NGArgumentParser(argparse.ArgumentParser):
     def parse_args(self):
         """Parse command line arguments and perform validation.
 
-        This method extends the base ArgumentParser's parse_args() to add custom validation
-        for mutually exclusive arguments in the postprocess command. It ensures that exactly 
-        one of --job-desc-file or --input-results-dir is provided when using postprocess.
+        This method extends the base ArgumentParser's parse_args() to run the validation
+        steps registered with add_validation_step, e.g. that exactly one of --job-desc-file
+        or --input-results-dir is provided when using postprocess. With --assume-valid the
+        path checks in core_validators and the skippable steps are skipped.
 
         Returns:
             argparse.Namespace: The parsed command-line arguments with all validations passed
@@ -432,23 +545,66 @@ class NGArgumentParser(argparse.ArgumentParser):
         Raises:
             ArgumentError: If validation fails for mutually exclusive arguments
         """
-        args = super().parse_args()
+        # type= validators run while parsing, before --assume-valid is seen
+        validators.set_assume_valid(validators.assume_valid_in_argv(sys.argv[1:]))
+        validators.take_planned_layouts()  # drop any left by an earlier, failed parse
+        with timing.stage('parse_args'):
+            args = super().parse_args()
+        validators.set_assume_valid(getattr(args, 'assume_valid_flag', False))
         
         # If preprocess command is used and output_dir is set, set defaults for other args
         if hasattr(args, 'subcommand') and args.subcommand == 'preprocess':
             if hasattr(args, 'output_dir') and args.output_dir:
-                from pathlib import Path
                 if not args.preprocess_inputs_dir:
                     args.preprocess_inputs_dir = str(Path(args.output_dir) / "predict-inputs" / "data")
                 if not args.preprocess_parameters_dir:
                     args.preprocess_parameters_dir = str(Path(args.output_dir) / "predict-inputs" / "params")
             
-        # If postprocess command is used, validate mutual exclusion
-        if hasattr(args, 'subcommand') and args.subcommand == 'postprocess':
-            self.validate_mutually_exclusive_args(args)
+        # Run the validation pipeline (e.g. postprocess's mutual exclusion)
+        with timing.stage('validate'):
+            self.run_validation_steps(args)
+
+        # Only once every argument is valid, create preprocess's output layout
+        # and any layout validate_preprocess_dir planned
+        planned = validators.take_planned_layouts()
+        if getattr(args, 'subcommand', None) == 'preprocess' or planned:
+            with timing.stage('materialize_layout'):
+                self.materialize_output_layout(planned)
+
+        # Write a timing sidecar next to the outputs when NGARGPARSER_TIMING is set
+        self.start_timing(args)
+
+        # Profile the dispatched subcommand when --profile is given
+        self.start_profile(args)
 
         return args
 
+    def start_profile(self, args):
+        """Start the profiler chosen with ``--profile``; its output is written at exit.
+
+        Output goes next to the same stem as the timing sidecar, or into the
+        current directory when predict prints to stdout (see core.timing).
+        """
+        mode = getattr(args, 'profile', None)
+        if not mode:
+            return None
+        kwargs = vars(args)
+        output_dir = kwargs.get('output_dir') or kwargs.get('postprocess_result_dir')
+        stem = timing.output_stem(args.subcommand, kwargs.get('output_prefix'), output_dir) or Path(args.subcommand)
+        return timing.start_profile(mode, stem)
+
+    def start_timing(self, args):
+        """Register the subcommand with core.timing so its stages land in a sidecar.
+
+        The sidecar goes next to ``--output-prefix`` when given, else into the
+        preprocess ``--output-dir`` or postprocess ``--postprocessed-results-dir``
+        (see core.timing). Predict runs that print to stdout write no sidecar.
+        """
+        kwargs = vars(args)
+        output_dir = kwargs.get('output_dir') or kwargs.get('postprocess_result_dir')
+        sidecar = timing.sidecar_path(args.subcommand, kwargs.get('output_prefix'), output_dir)
+        return timing.start_command(args.subcommand, sidecar)
+
 
     def patch_parser_for_groups(self, parser):
         """Patch an argparse.ArgumentParser instance to support argument grouping.
@@ -467,30 +623,11 @@ class NGArgumentParser(argparse.ArgumentParser):
             parser.add_argument('--flag', help='Some help text', group='My Group')
             # This will add the argument to a group named 'My Group' in the help output
         """
-        if not hasattr(parser, '_argument_groups'):
-            parser._argument_groups = {}
-
-        original_add_argument = parser.add_argument
-        
-        def add_argument_with_groups(*args, **kwargs):
-            group_name = kwargs.pop('group', None)
-
-            group_mapping = {
-                group.title: group
-                for group in getattr(parser, '_action_groups', [])
-            }
-
-            if group_name:
-                if group_name in group_mapping:
-                    return group_mapping[group_name].add_argument(*args, **kwargs)
-                else:
-                    # Create new group if not in mapping
-                    if group_name not in parser._argument_groups:
-                        parser._argument_groups[group_name] = parser.add_argument_group(group_name)
-                    return parser._argument_groups[group_name].add_argument(*args, **kwargs)
-            return original_add_argument(*args, **kwargs)
-        
-        parser.add_argument = add_argument_with_groups
+        # The argparse parser underneath a SubparserWrapper, which holds the
+        # {title: group} index used by group_by_title
+        target = getattr(parser, '_subparser', parser)
+        target.__dict__.setdefault('_argument_groups', {})
+        parser.add_argument = GroupedAddArgument(parser, target)
         return parser
 
 
@@ -512,7 +649,6 @@ class NGArgumentParser(argparse.ArgumentParser):
             to ensure complete cleanup of the argument.
         """
 
-        actions_to_remove = []
         subparser = None
 
         if subparser_name == 'predict':
@@ -524,75 +660,69 @@ class NGArgumentParser(argparse.ArgumentParser):
         if subparser_name == 'postprocess':
             subparser = self.parser_postprocess
 
-        for group in subparser._action_groups:
-            for action in group._group_actions:
-                if argument_name in action.option_strings:
-                    actions_to_remove.append((action, group._group_actions))
-
-        for action, group_actions in actions_to_remove:
-            # Need to remove from both the group and the subparser
-            group_actions.remove(action)
+        # Find the action through argparse's option-string index
+        index = subparser._option_string_actions
+        action = index.get(argument_name)
+        if action is None:
+            return
+
+        # Need to remove from the group, the subparser and the index, so the
+        # option is no longer accepted either
+        group = getattr(action, 'container', None)
+        if group is not None and action in group._group_actions:
+            group._group_actions.remove(action)
+        if action in subparser._actions:
             subparser._actions.remove(action)
+        for option_string in action.option_strings:
+            if index.get(option_string) is action:
+                del index[option_string]
+
+
+    def create_job_descriptions_file(self, args):
+        """Write ``<output_dir>/job_descriptions.json`` after preprocess.
+
+        Jobs are built from the run manifest preprocess recorded with
+        ``core.job_descriptions.RunManifest``; without one, the newest ctime-group
+        of files in the params directory is used (see core.job_descriptions).
+        """
+        kwargs = vars(args)
+        output_dir = kwargs.get('output_dir')
+        params_dir = kwargs.get('preprocess_parameters_dir')
+
+        # exec file path - the run_<tool>.py being executed; fall back to the
+        # current working directory name when not launched from a script
+        exec_file_path = os.path.abspath(sys.argv[0]) if sys.argv and sys.argv[0].endswith('.py') else None
+        if not exec_file_path or not os.path.isfile(exec_file_path):
+            proj_name = self.format_exec_name(os.path.basename(os.getcwd()))
+            exec_file_path = str(Path(__file__).parent.parent) + f'/run_{proj_name}.py'
+
+        with timing.stage('job_descriptions'):
+            jd_path, n_jobs = job_descriptions.create_job_descriptions_file(output_dir, exec_file_path, params_dir)
+
+        print(f"Created job descriptions file: {jd_path}")
+        print(f"Total jobs: {n_jobs}")
+
+    def format_exec_name(self, name):
+        """Format the project name for use in executable file names."""
+        # Convert to lowercase and replace spaces/hyphens with underscores
+        formatted = name.lower().replace(' ', '_').replace('-', '_')
+        return formatted
 
 
     @staticmethod
-    def get_app_root_dir(start_dir=None, anchor_files=None):
-        """Find the app root directory by looking for known anchor files."""
-        if start_dir is None:
-            start_dir = os.getcwd()  # Default to the current working directory
-        
-        if anchor_files is None:
-            anchor_files = ['LICENSE']
-        
-        # Normalize to absolute path
-        current_dir = os.path.abspath(start_dir)
-        
-        # Traverse up the directory tree until an anchor file is found or root is reached
-        while current_dir != os.path.dirname(current_dir):
-            # Check for anchor files in the current directory
-            for anchor in anchor_files:
-                if os.path.isfile(os.path.join(current_dir, anchor)) or os.path.isdir(os.path.join(current_dir, anchor)):
-                    return current_dir  # Return the directory where the anchor file is found
-
-            # Check for anchor files in child directories
-            for root, dirs, files in os.walk(current_dir):
-                for anchor in anchor_files:
-                    if anchor in dirs or anchor in files:
-                        return root  # Return the child directory where the anchor file is found
-
-            current_dir = os.path.dirname(current_dir)  # Move up one level
-        
-        # If no anchor file is found, return None or raise an error
-        return None
+    def get_app_root_dir(start_dir=None, anchor_files=None, max_depth=anchors.DEFAULT_MAX_DEPTH):
+        """Find the app root directory by looking for known anchor files.
+
+        The downward search is bounded by ``max_depth``, skips ``anchors.PRUNE_DIRS``,
+        honors ``NGARGPARSER_ANCHOR_ROOT`` and is cached per process (see core.anchors).
+        """
+        return anchors.find_app_root(start_dir, anchor_files, max_depth=max_depth)
 
 
     @staticmethod
-    def find_file_path(start_dir=None, filename=None):
+    def find_file_path(start_dir=None, filename=None, max_depth=anchors.DEFAULT_MAX_DEPTH):
         """Find the full path of a given file by searching both upwards and downwards from the start directory."""
-        if start_dir is None:
-            start_dir = os.getcwd()  # Default to the current working directory
-        
-        if filename is None:
-            raise ValueError("Filename must be provided")
-        
-        # Normalize to absolute path
-        start_dir = os.path.abspath(start_dir)
-        
-        # Check upwards
-        current_dir = start_dir
-        while current_dir != os.path.dirname(current_dir):
-            target_path = os.path.join(current_dir, filename)
-            if os.path.isfile(target_path):
-                return target_path  # Return the full path of the file if found
-            
-            current_dir = os.path.dirname(current_dir)  # Move up one level
-        
-        # Check downwards
-        for root, _, files in os.walk(start_dir):
-            if filename in files:
-                return os.path.join(root, filename)
-        
-        return None  # Return None if the file is not found
+        return anchors.find_file(start_dir, filename, max_depth=max_depth)
     
 
     @staticmethod
@@ -628,53 +758,75 @@ class NGArgumentParser(argparse.ArgumentParser):
 
     def _validate_and_set_preprocess_defaults(self, output_dir):
         """
-        Custom validator that creates the output directory structure and returns
-        default values for preprocess directories.
-        
-        NEW LOGIC:
+        Custom validator that plans the output directory structure and sets
+        default values for preprocess directories. Nothing is created here:
+        argparse calls this while parsing, possibly before another argument
+        fails, so parse_args creates the planned directories afterwards
+        (see materialize_output_layout).
+
         - If there are dependencies: Set defaults to main tool's directories
         - If no dependencies: Set defaults to output directory's directories
         """
-        from pathlib import Path
-        from .core_validators import create_directory_structure_for_dependencies, get_dependencies_from_paths
-        
         output_path = Path(output_dir)
-        
-        # Create the directory structure
-        print(f"Creating directory structure under: {output_path}")
-        created = create_directory_structure_for_dependencies(output_path)
-        
-        print(f"Successfully created directory structures for {len(created)} tools:")
-        for tool_name, dirs in created.items():
-            print(f"\n{tool_name}:")
-            for dir_path in dirs:
-                print(f"  - {dir_path}")
-        
-        # Determine the correct default paths based on whether there are dependencies
+
         try:
-            # Check if there are dependencies by looking for paths.py
+            # paths.py decides whether there are dependencies
             paths_file = Path(APP_ROOT) / "paths.py" if APP_ROOT else Path(__file__).resolve().parent.parent / "paths.py"
-            dependencies = get_dependencies_from_paths(paths_file)
-            
-            if dependencies:
-                # With dependencies: Use main tool's directories
-                # Get the current app name using the same logic as core_validators
-                curr_app_name = self._get_current_app_name(paths_file)
-                self._default_inputs_dir = str(output_path / curr_app_name / "predict-inputs" / "data")
-                self._default_params_dir = str(output_path / curr_app_name / "predict-inputs" / "params")
-            else:
-                # No dependencies: Use output directory's directories
-                self._default_inputs_dir = str(output_path / "predict-inputs" / "data")
-                self._default_params_dir = str(output_path / "predict-inputs" / "params")
-                
+            self._output_layout, main_dir = validators.plan_output_layout(output_path, paths_file)
         except Exception as e:
             # Fallback to no-dependencies case if paths.py can't be read
             print(f"Warning: Could not read paths.py, using default structure: {e}")
-            self._default_inputs_dir = str(output_path / "predict-inputs" / "data")
-            self._default_params_dir = str(output_path / "predict-inputs" / "params")
-        
+            main_dir = output_path
+            self._output_layout = {"default": [output_path / sub for sub in validators.MAIN_TOOL_SUBDIRS]}
+
+        self._default_inputs_dir = str(main_dir / "predict-inputs" / "data")
+        self._default_params_dir = str(main_dir / "predict-inputs" / "params")
+
         return output_path
 
+    def _validate_preprocess_directory(self, path_str):
+        """validate_directory that also accepts a directory planned for --output-dir.
+
+        Such a directory only exists once parse_args has materialized the layout.
+        """
+        layout = getattr(self, '_output_layout', None)
+        if layout and os.path.normpath(path_str) in validators.leaf_directories(layout):
+            return Path(path_str)
+        return validators.validate_directory(path_str)
+
+    def materialize_output_layout(self, planned=()):
+        """Create the directories planned for preprocess's --output-dir in one pass.
+
+        ``planned`` adds the layouts ``type=validate_preprocess_dir`` arguments
+        planned (see core_validators.take_planned_layouts); they are created in
+        the same pass and listed together.
+
+        Also done under --assume-valid, which skips checks, not the outputs
+        preprocess writes into. Directories that already exist are left alone,
+        so re-running preprocess on an existing output directory does no
+        filesystem writes (see core_validators.materialize_layout).
+
+        Returns:
+            list: The directories created.
+        """
+        layout = {}
+        for part in [getattr(self, '_output_layout', None) or {}, *planned]:
+            for tool_name, dirs in part.items():
+                layout.setdefault(tool_name, []).extend(dirs)
+        if not layout or validators.layout_exists(layout):
+            return []
+        try:
+            created = validators.materialize_layout(layout)
+        except OSError as e:
+            where = "" if planned else "argument --output-dir/-o: "
+            self.parser_preprocess.error(f"{where}can't create {e.filename}: {e.strerror}")
+        print(f"Successfully created directory structures for {len(layout)} tools:")
+        for tool_name, dirs in layout.items():
+            print(f"\n{tool_name}:")
+            for dir_path in dirs:
+                print(f"  - {dir_path}")
+        return created
+
     def _get_default_inputs_dir(self):
         """Get the default inputs directory if it was set by the output-dir validator."""
         return getattr(self, '_default_inputs_dir', None)
@@ -722,12 +874,3 @@ class NGArgumentParser(argparse.ArgumentParser):
             curr_app_name = 'app'  # Generic fallback
             
         return curr_app_name
-
-
-class JobDescriptionParams(TypedDict):
-    # Blueprint for creating job description file
-    shell_cmd: str
-    job_id: int
-    job_type: str
-    depends_on_job_ids: List[int]
-    expected_outputs: List[str]
\ No newline at end of file
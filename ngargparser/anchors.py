@@ -0,0 +1,157 @@
+"""
+Bounded anchor resolution for ngargparser tools (framework-owned).
+
+This module is installed into each project as ``src/core/anchors.py`` and is
+refreshed by ``cli sync``. Do not edit it in a project — edit it in the
+ngargparser framework and re-sync.
+
+``NGArgumentParser.get_app_root_dir`` and ``NGArgumentParser.find_file_path``
+delegate here. Both look *up* from a start directory and then *down* into its
+subtree. The downward search used to be an unbounded ``os.walk``, repeated at
+every ancestor level — minutes of syscalls when run from a results directory
+holding 100k job outputs. Here it is bounded:
+
+* ``max_depth`` limits how far below a directory the downward search descends
+  (``0`` disables it; ``None`` means unbounded).
+* Directories named in ``PRUNE_DIRS`` (build output, VCS metadata, per-job
+  prediction outputs, vendored libs) are never descended into.
+* Each ancestor level skips the child it came from, which the previous level
+  already searched.
+* ``NGARGPARSER_ANCHOR_ROOT`` short-circuits the search: when set, it *is* the
+  app root, and file lookups search only beneath it.
+* Results (including misses) are cached per process; ``clear_cache()`` resets.
+"""
+
+import os
+from collections import deque
+
+# Environment variable that pins the anchor root and skips the tree search.
+ANCHOR_ROOT_ENV = "NGARGPARSER_ANCHOR_ROOT"
+
+# How many directory levels below a search root the downward pass may descend.
+DEFAULT_MAX_DEPTH = 3
+
+# Directory names the downward search never enters.
+PRUNE_DIRS = frozenset({"build", ".git", "predict-outputs", "libs"})
+
+_cache: dict = {}
+
+
+def clear_cache():
+    """Forget every cached resolution (e.g. after creating an anchor file)."""
+    _cache.clear()
+
+
+def _override_root():
+    """Return the absolute ``NGARGPARSER_ANCHOR_ROOT`` directory, or None."""
+    root = os.environ.get(ANCHOR_ROOT_ENV)
+    return os.path.abspath(root) if root else None
+
+
+def _search_down(top, names, max_depth, skip=None, files_only=False):
+    """Breadth-first search below ``top`` for an entry named in ``names``.
+
+    Returns ``(directory, name)`` for the shallowest directory containing a
+    match, or None. ``top`` itself is not checked (the upward pass did that);
+    ``skip`` is a child directory of ``top`` that must not be entered. With
+    ``files_only``, directories never count as a match.
+    """
+    if max_depth is not None and max_depth <= 0:
+        return None
+    queue = deque([(top, 0)])
+    while queue:
+        directory, depth = queue.popleft()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if directory != top and entry.name in names and not (files_only and is_dir):
+                        return directory, entry.name
+                    if is_dir and entry.name not in PRUNE_DIRS and entry.path != skip:
+                        subdirs.append(entry.path)
+        except OSError:
+            continue
+        if max_depth is None or depth < max_depth:
+            queue.extend((sub, depth + 1) for sub in sorted(subdirs))
+    return None
+
+
+def find_app_root(start_dir=None, anchor_files=None, max_depth=DEFAULT_MAX_DEPTH):
+    """Find the app root directory by looking for known anchor files.
+
+    Walks up from ``start_dir`` (default: the current directory). At each level
+    the directory itself is checked first, then its subtree down to
+    ``max_depth`` levels. Returns the directory holding an anchor, or None.
+    """
+    override = _override_root()
+    if override:
+        return override
+
+    anchors = tuple(anchor_files or ("LICENSE",))
+    current_dir = os.path.abspath(start_dir or os.getcwd())
+    key = ("root", current_dir, anchors, max_depth)
+    if key in _cache:
+        return _cache[key]
+
+    found = None
+    previous = None
+    while current_dir != os.path.dirname(current_dir):
+        if any(os.path.exists(os.path.join(current_dir, anchor)) for anchor in anchors):
+            found = current_dir
+            break
+        match = _search_down(current_dir, anchors, max_depth, skip=previous)
+        if match:
+            found = match[0]
+            break
+        previous = current_dir
+        current_dir = os.path.dirname(current_dir)
+
+    _cache[key] = found
+    return found
+
+
+def find_file(start_dir=None, filename=None, max_depth=DEFAULT_MAX_DEPTH):
+    """Find the full path of ``filename`` searching up, then down, from ``start_dir``.
+
+    With ``NGARGPARSER_ANCHOR_ROOT`` set, only that root and its subtree are
+    searched. Returns the absolute file path, or None.
+    """
+    if filename is None:
+        raise ValueError("Filename must be provided")
+
+    start_dir = os.path.abspath(start_dir or os.getcwd())
+    override = _override_root()
+    key = ("file", start_dir, filename, max_depth, override)
+    if key in _cache:
+        return _cache[key]
+
+    found = None
+    if override:
+        candidate = os.path.join(override, filename)
+        if os.path.isfile(candidate):
+            found = candidate
+        else:
+            match = _search_down(override, {filename}, max_depth, files_only=True)
+            if match:
+                found = os.path.join(*match)
+    else:
+        # Check upwards
+        current_dir = start_dir
+        while current_dir != os.path.dirname(current_dir):
+            candidate = os.path.join(current_dir, filename)
+            if os.path.isfile(candidate):
+                found = candidate
+                break
+            current_dir = os.path.dirname(current_dir)
+        # Check downwards
+        if found is None:
+            match = _search_down(start_dir, {filename}, max_depth, files_only=True)
+            if match:
+                found = os.path.join(*match)
+
+    _cache[key] = found
+    return found
@@ -0,0 +1,1622 @@
+"""
+Build staging engine for ngargparser projects (framework-owned).
+
+This module is installed into each project as ``scripts/core/build.py`` and is
+refreshed by ``cli sync``. ``scripts/core/build.sh`` runs it; do not edit it in
+a project — edit it in the ngargparser framework and re-sync. It only uses the
+standard library, so any ``python3`` can run it.
+
+``stage`` fills ``build/<TOOL_DIR>`` from the project tree in one pass: most
+entries are symlinked, the names matching ``EXCLUDE_FROM_BUILD_SYMLINK`` are
+copied, and ``libs/*`` is copied (flattened into ``build/<TOOL_DIR>/libs``).
+The paths ``git check-ignore`` excluded (``exclusions``, run by
+``setup_exclusions`` in build.sh) are read into a set once, together with
+every directory holding an excluded path. "Is this path excluded?" and "is
+anything under this directory excluded?" are then set lookups, instead of a ``grep``/``awk`` over the whole
+list (and two processes) per staged entry.
+
+``exclusions`` evaluates the ``.distignore`` rules in a single walk of the
+project, talking to one ``git check-ignore`` process: a directory's entries
+are checked before its subdirectories are read, so an excluded directory
+(``data/``, a virtualenv) is never listed at all.
+
+Incremental builds (``build.sh --incremental``) keep the build dir between
+runs, with a manifest next to it (``build/.ngbuild/<TOOL_DIR>.json``). It maps
+every staged path to its source and, for copies, the source's mtime, size and
+sha256. Re-staging only touches entries whose source changed (an mtime bump
+with the same content is recognized by its hash) and removes the ones that no
+longer exist. ``step-check``/``step-record`` cache build.sh's other steps
+(requirements vendoring, hooks): a step whose input files and watched paths
+are unchanged is skipped and its previous outputs are kept. A step that does
+rerun starts from a clean slate: its previous outputs are deleted and the
+staged files it modified are restored first.
+
+Copied entries (``libs/``, ``run_*.py``) are cloned as cheaply as the file
+system allows (``STAGE_COPY_MODE``): ``auto`` reflinks them (a copy-on-write
+clone sharing the source's blocks, on btrfs, XFS and the like) and falls back
+to a plain copy; ``hardlink`` hard-links them, except the files matching
+``HOOK_MODIFIES``, which hooks patch in place and so get their own copy.
+``verify-links`` fails the build when a hook wrote through a hard link anyway.
+
+``package`` writes the tarball, reproducibly: members are added in sorted
+order with symlinks followed (like ``tar -h``) and with normalized mtimes,
+owners and permissions. It is compressed on every core: with
+``pigz`` when it is installed, ``zstd -T0`` when ``TARBALL_COMPRESSION=zstd``,
+and otherwise with :class:`ParallelGzipWriter`, which deflates blocks on a
+thread pool the way pigz does. Each produces the same bytes for the same tree
+whatever the number of threads. Tarballs are cached under the digest of the
+staged tree, so an unchanged tree reuses its tarball instead of compressing
+it again.
+
+``tree-stats``/``profile-write`` back ``build.sh --profile`` (``make
+build-profile``): each step's wall time, with file and byte counts, goes to
+``build/build-profile.json``.
+
+``hook-steps`` runs the hook steps declared in build.conf (``HOOK_STEPS``):
+each names its command, inputs, outputs and the steps it runs after.
+Independent steps run in parallel, and a step whose inputs are unchanged is
+not run at all: its outputs are copied back from the previous run's cache
+(``build/.ngbuild/hooks``), in full builds too. Every step's output is kept
+in ``build/.ngbuild/logs/<name>.log``.
+
+``init-files`` adds the ``__init__.py`` files ``libs/`` needs to be importable.
+"""
+
+import argparse
+import collections
+import fcntl
+import fnmatch
+import hashlib
+import json
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import tarfile
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Never staged from the project root, whatever the exclusion rules say
+ALWAYS_SKIPPED = ("build", ".git")
+
+# VCS metadata removed from every copied libs/ entry
+VCS_DIRS = (".git", ".github", ".gitlab")
+
+INIT_FILE_CONTENT = "# Auto-generated __init__.py file\n"
+
+# Paths sent to git check-ignore before waiting for the answers
+EXCLUSION_BATCH = 4096
+
+# STAGE_COPY_MODE values, see Stager
+LINK_MODES = ("auto", "copy", "hardlink")
+
+# ioctl from linux/fs.h: make the destination share the source's extents
+FICLONE = 0x40049409
+
+# Bump when the manifest layout changes; older manifests then mean a full build
+MANIFEST_VERSION = 1
+
+HASH_CHUNK = 1 << 20
+
+# Tarball compressors: TARBALL_COMPRESSION in build.conf -> file extension.
+# "gzip" uses pigz when installed, else ParallelGzipWriter ("python" forces it).
+COMPRESSIONS = {"gzip": ".tar.gz", "python": ".tar.gz", "zstd": ".tar.zst"}
+GZIP_LEVEL = 6  # gzip's (and tar -z's) default
+GZIP_BLOCK_SIZE = 1 << 20
+DEFLATE_WINDOW = 1 << 15
+# No file name, mtime 0, OS unknown: the same header on every machine
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+# Bump when the tarball layout changes, so older cached artifacts are not reused
+ARTIFACT_CACHE_VERSION = 1
+ARTIFACT_CACHE_KEEP = 10
+
+# Bump when the hook step cache layout changes, so older cached outputs are not reused
+HOOK_CACHE_VERSION = 1
+# Lines of a failed hook step's log shown when its output was not printed
+HOOK_LOG_TAIL = 20
+
+
+class Exclusions:
+    """The excluded paths from ``git check-ignore``, as sets.
+
+    Paths are PROJECT_ROOT-relative; directories carry a trailing ``/``.
+    """
+
+    def __init__(self, paths=()):
+        self.excluded = set()
+        # Directories (no trailing '/') with an excluded path at or below them
+        self.dirty = set()
+        for path in paths:
+            self.add(path)
+
+    def add(self, path):
+        self.excluded.add(path)
+        slash = path.find("/")
+        while slash != -1:
+            self.dirty.add(path[:slash])
+            slash = path.find("/", slash + 1)
+
+    @classmethod
+    def load(cls, list_file):
+        """Read a ``check-ignore`` output file, one path per line."""
+        with open(list_file, encoding="utf-8", errors="surrogateescape") as f:
+            return cls(line.rstrip("\n") for line in f if line.strip())
+
+    def is_excluded(self, rel):
+        """``rel`` is PROJECT_ROOT-relative; directories MUST carry a trailing ``/``."""
+        return rel in self.excluded
+
+    def subtree_has_exclusions(self, rel):
+        """Whether any excluded path lives under directory ``rel`` (no trailing ``/``)."""
+        return rel in self.dirty
+
+
+class IgnoreChecker:
+    """A long-running ``git check-ignore --stdin`` asked about batches of paths.
+
+    ``-z --verbose --non-matching`` makes git answer every path, in order, and
+    it flushes after each answer when writing to a pipe, so the caller can
+    wait for a batch's answers before deciding what to send next. A thread
+    drains git's output, so a large batch cannot fill both pipes at once.
+    """
+
+    def __init__(self, ignore_repo):
+        self.proc = subprocess.Popen(
+            ["git", "-C", ignore_repo, "-c", "core.excludesFile=/dev/null"]
+            + ["check-ignore", "--stdin", "-z", "--verbose", "--non-matching"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=dict(os.environ, GIT_FLUSH="1"),
+        )
+        self.answers = queue.SimpleQueue()
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def _read(self):
+        # One answer is four NUL-terminated fields: source, line, pattern, path
+        fields, pending = [], b""
+        for chunk in iter(lambda: self.proc.stdout.read1(HASH_CHUNK), b""):
+            *parts, pending = (pending + chunk).split(b"\0")
+            fields.extend(parts)
+            complete = len(fields) - len(fields) % 4
+            # A matching negated pattern ("!foo") means not ignored
+            self.answers.put([bool(pattern) and pattern[:1] != b"!" for pattern in fields[2:complete:4]])
+            del fields[:complete]
+        self.answers.put(None)
+
+    def ignored(self, paths):
+        """Whether each of ``paths`` is ignored, in order."""
+        self.proc.stdin.write(b"".join(os.fsencode(path) + b"\0" for path in paths))
+        self.proc.stdin.flush()
+        answers = []
+        while len(answers) < len(paths):
+            batch = self.answers.get()
+            if batch is None:
+                raise OSError(f"git check-ignore failed (exit {self.proc.wait()}) while evaluating distignore rules")
+            answers.extend(batch)
+        return answers
+
+    def close(self):
+        self.proc.stdin.close()
+        self.reader.join()
+        status = self.proc.wait()
+        # --non-matching: 0 = some path was ignored, 1 = none was, >1 = fatal
+        if status > 1:
+            raise OSError(f"git check-ignore failed (exit {status}) while evaluating distignore rules")
+
+
+def evaluate_exclusions(project_root, ignore_repo, batch=EXCLUSION_BATCH):
+    """Walk ``project_root`` once, asking ``git check-ignore`` about each entry.
+
+    Returns ``(candidates, excluded)``: PROJECT_ROOT-relative paths,
+    directories with a trailing ``/`` (dir-only patterns need it to match
+    paths that do not exist inside the throwaway repo). A directory's entries
+    are evaluated before any of its subdirectories is read, and an excluded
+    directory is not descended into: nothing below it can be re-included
+    (git does not look inside an excluded directory either), and staging
+    skips it whole. ``build`` and ``.git`` at the root are skipped; nested
+    ``.git`` directories are listed but not descended into, so the ``.*``
+    baseline excludes them whole.
+    """
+    checker = IgnoreChecker(ignore_repo)
+    candidates, excluded = [], []
+    try:
+        pending = [""]
+        while pending:
+            parent = pending.pop()
+            with os.scandir(os.path.join(project_root, parent)) as it:
+                entries = []
+                for entry in it:
+                    if not parent and entry.name in ALWAYS_SKIPPED:
+                        continue
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    entries.append((parent + entry.name + ("/" if is_dir else ""), is_dir and entry.name != ".git"))
+            entries.sort()
+            for start in range(0, len(entries), batch):
+                chunk = entries[start : start + batch]
+                for (path, descend), ignored in zip(chunk, checker.ignored([path for path, _ in chunk])):
+                    candidates.append(path)
+                    if ignored:
+                        excluded.append(path)
+                    elif descend:
+                        pending.append(path)
+    finally:
+        checker.close()
+    return candidates, excluded
+
+
+def _write_lines(path, lines):
+    with open(path, "w", encoding="utf-8", errors="surrogateescape") as f:
+        f.writelines(line + "\n" for line in lines)
+
+
+def should_copy(name, patterns):
+    """Whether ``name`` matches one of the ``EXCLUDE_FROM_BUILD_SYMLINK`` glob patterns."""
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def _listdir(path):
+    """Directory entries in the order bash's sorted glob would give them."""
+    return sorted(os.listdir(path))
+
+
+def _symlink(src, dst):
+    # ln -sf: replace whatever is at dst
+    if os.path.lexists(dst) and not os.path.isdir(dst):
+        os.unlink(dst)
+    os.symlink(src, dst)
+
+
+def _remove(path):
+    """Remove whatever is at ``path`` without following a symlink."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.unlink(path)
+
+
+def _under_link(root, rel):
+    """Whether a directory on the way from ``root`` to ``rel`` is a symlink."""
+    parent = os.path.dirname(rel)
+    while parent:
+        if os.path.islink(os.path.join(root, parent)):
+            return True
+        parent = os.path.dirname(parent)
+    return False
+
+
+def _stat_pair(path, follow=True):
+    """``[mtime_ns, size]`` of ``path``, or None when it does not exist."""
+    try:
+        st = os.stat(path) if follow else os.lstat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(src, dst):
+    """Clone ``src`` to ``dst`` copy-on-write (Linux ``FICLONE``); OSError where unsupported."""
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    except OSError:
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        raise
+    shutil.copymode(src, dst)
+
+
+def _copy_and_hash(src, dst):
+    """Copy ``src`` to ``dst`` (like ``shutil.copy``) and return its sha256, in one read."""
+    digest = hashlib.sha256()
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        for chunk in iter(lambda: fsrc.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+            fdst.write(chunk)
+    shutil.copymode(src, dst)
+    return digest.hexdigest()
+
+
+def inputs_key(paths, extra=""):
+    """sha256 over ``extra`` and the content of each of ``paths`` (missing files count too)."""
+    digest = hashlib.sha256(extra.encode())
+    for path in paths:
+        digest.update(b"\0" + os.fsencode(path) + b"\0")
+        if os.path.isfile(path):
+            digest.update(_sha256(path).encode())
+        else:
+            digest.update(b"-")
+    return digest.hexdigest()
+
+
+class Manifest:
+    """What an incremental build staged, and what its cached steps produced.
+
+    Attributes:
+        key (str): Hash of everything that invalidates the whole build dir
+            (TOOL_VERSION, the copy patterns, the build engine itself).
+        entries (dict): Build-dir-relative path -> how it was staged: ``mode``
+            (``symlink``, ``copy``, ``dir`` or ``tree``), ``src``, and for copies
+            the source's ``mtime_ns``/``size``/``sha256`` and the staged file's
+            ``dst`` ``[mtime_ns, size]``. Entries a build step modified carry
+            ``hooked``, the source and staged states after that step.
+        steps (dict): Step name -> ``key``, ``outputs`` (paths the step
+            created) and ``touched`` (staged entries it modified).
+        restaged (list): Entries (re)staged or removed by the latest ``stage``.
+    """
+
+    def __init__(self, path, key=""):
+        self.path = path
+        self.key = key
+        self.entries = {}
+        self.steps = {}
+        self.restaged = []
+
+    @classmethod
+    def load(cls, path):
+        """The manifest at ``path``; an empty one when it is missing, unreadable or outdated."""
+        manifest = cls(path)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return manifest
+        manifest.key = data.get("key", "")
+        manifest.entries = data.get("entries", {})
+        manifest.steps = data.get("steps", {})
+        manifest.restaged = data.get("restaged", [])
+        return manifest
+
+    def save(self):
+        """Write the manifest atomically, so an interrupted build never leaves half of one."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "key": self.key,
+            "entries": self.entries,
+            "steps": self.steps,
+            "restaged": self.restaged,
+        }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            # dumps: the one-shot C encoder, much faster than dump() on large manifests
+            f.write(json.dumps(data, sort_keys=True))
+        os.replace(tmp, self.path)
+
+    def snapshot_path(self, step):
+        return f"{self.path}.{step}.snapshot"
+
+
+class Stager:
+    """Stages project entries into the build tree, enforcing exclusions at every depth.
+
+    Args:
+        exclusions (Exclusions): The evaluated ``.distignore`` rules.
+        log (callable, optional): Prints one line per staged entry (verbose mode).
+        manifest (Manifest, optional): Stage incrementally against the build
+            dir ``manifest`` describes: unchanged entries are left alone. Without
+            one the build dir is assumed empty.
+        link_mode (str): How copied files are staged, one of :data:`LINK_MODES`:
+            ``copy``, ``auto`` (reflink when the file system supports it, else
+            copy) or ``hardlink`` (hard link, else as ``auto``).
+        hook_modifies (sequence): Glob patterns (against the path or the file
+            name) of files hooks modify in place; never hard-linked.
+    """
+
+    def __init__(self, exclusions, log=None, manifest=None, link_mode="copy", hook_modifies=()):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"unknown STAGE_COPY_MODE {link_mode!r} (choose from {', '.join(LINK_MODES)})")
+        self.exclusions = exclusions
+        self.log = log or (lambda message: None)
+        self.manifest = manifest
+        self.previous = manifest.entries if manifest is not None else {}
+        self.entries = {}
+        self.restaged = set()
+        self.link_mode = link_mode
+        self.hook_modifies = hook_modifies
+        self.reflink = link_mode != "copy"
+        # Staged path -> [inode, mtime_ns, size] of every hard-linked file, for verify_links()
+        self.linked = {}
+        # Per part of stage_project: wall time, entries staged, bytes copied (links count 0)
+        self.stats = {part: {"wall_s": 0.0, "files": 0, "bytes": 0} for part in ("staging", "libs_merge")}
+        self.part = "staging"
+
+    def _count(self, nbytes=0):
+        self.stats[self.part]["files"] += 1
+        self.stats[self.part]["bytes"] += nbytes
+
+    def _clone(self, src, dst, rel):
+        """Put a copy of file ``src`` at ``dst`` (an absent or replaceable path), as cheaply as allowed."""
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        self._count(os.path.getsize(src))
+        if self.link_mode == "hardlink" and not self._hook_modifies(rel):
+            try:
+                os.link(src, dst)
+            except OSError:
+                # Another device, or links not allowed: copy from now on
+                self.link_mode = "copy"
+            else:
+                self._record_link(dst)
+                return
+        if self.reflink:
+            try:
+                _reflink(src, dst)
+                return
+            except OSError:
+                self.reflink = False
+        shutil.copy(src, dst)
+
+    def _hook_modifies(self, rel):
+        return should_copy(rel, self.hook_modifies) or should_copy(os.path.basename(rel), self.hook_modifies)
+
+    def _record_link(self, dst):
+        st = os.lstat(dst)
+        if st.st_nlink > 1:
+            self.linked[dst] = [st.st_ino, st.st_mtime_ns, st.st_size]
+
+    def _copy_tree(self, src, dst, rel):
+        def clone(src_file, dst_file):
+            self._clone(src_file, dst_file, rel + dst_file[len(dst) :])
+
+        shutil.copytree(src, dst, symlinks=True, copy_function=clone, dirs_exist_ok=True)
+
+    def stage_entry(self, src, dstparent, rel, mode, fastpath=True):
+        """Stage one entry.
+
+        Args:
+            src (str): Absolute source path.
+            dstparent (str): Absolute directory the entry goes into.
+            rel (str): PROJECT_ROOT-relative path, no trailing ``/``.
+            mode (str): ``symlink`` or ``copy``.
+            fastpath (bool): Allow a whole-directory symlink/copy when nothing in
+                the subtree is excluded. False forces per-file staging (used for
+                src/, where hooks patch files under build/src/ and a whole-dir
+                symlink would leak those writes back into the source tree).
+        """
+        name = os.path.basename(src)
+        dst = os.path.join(dstparent, name)
+
+        if os.path.isdir(src) and not os.path.islink(src):
+            if self.exclusions.is_excluded(rel + "/"):
+                return
+            # Incremental builds copy file by file, so each file can be skipped on its own.
+            incremental_copy = mode == "copy" and self.manifest is not None
+            if fastpath and not incremental_copy and not self.exclusions.subtree_has_exclusions(rel):
+                os.makedirs(dstparent, exist_ok=True)
+                if mode == "copy":
+                    self.log(f"Copying directory: {rel}")
+                    self._copy_tree(src, dst, rel)
+                else:
+                    self._stage_symlink(src, dst, rel, "directory")
+                return
+            if os.path.islink(dst) or os.path.lexists(dst) and not os.path.isdir(dst):
+                # Never descend into a previous build's link: writes would land in the source tree.
+                os.unlink(dst)
+                self.restaged.add(rel)
+            children = _listdir(src)
+            for child in children:
+                self.stage_entry(os.path.join(src, child), dst, f"{rel}/{child}", mode, fastpath)
+            # Dirs emptied by exclusion are dropped; genuinely empty dirs ship.
+            if not children:
+                self._stage_dir(dst, rel)
+            return
+
+        if self.exclusions.is_excluded(rel):
+            return
+        os.makedirs(dstparent, exist_ok=True)
+        if mode == "copy":
+            if os.path.isdir(src):
+                # A symlink to a directory: copy what it points at
+                self._stage_tree(src, dst, rel)
+            else:
+                self._stage_copy(src, dst, rel)
+        else:
+            self._stage_symlink(src, dst, rel, "file")
+
+    def _track(self, rel, entry, changed):
+        self.entries[rel] = entry
+        if changed:
+            self.restaged.add(rel)
+
+    def _reusable(self, rel, mode, src, dst):
+        """The previous entry for ``rel`` when its staged copy can be kept as is, else None."""
+        old = self.previous.get(rel)
+        if old is None or old.get("mode") != mode or old.get("src") != src:
+            return None
+        hooked = old.get("hooked")
+        if hooked is not None:
+            # A build step rewrote it: keep the rewritten file while both sides are untouched.
+            same = _stat_pair(dst, follow=False) == hooked["dst"] and _stat_pair(src) == hooked["src"]
+            return old if same else None
+        if mode == "symlink":
+            return old if os.path.islink(dst) and os.readlink(dst) == src else None
+        if mode == "copy":
+            return old if not os.path.islink(dst) and _stat_pair(dst, follow=False) == old["dst"] else None
+        if mode == "dir":
+            return old if os.path.isdir(dst) and not os.path.islink(dst) else None
+        return None
+
+    def _stage_symlink(self, src, dst, rel, kind):
+        self._count()
+        if self.manifest is None:
+            self.log(f"Symlinking {kind}: {rel}")
+            _symlink(src, dst)
+            return
+        old = self._reusable(rel, "symlink", src, dst)
+        if old is not None:
+            self._track(rel, old, changed=False)
+            return
+        self.log(f"Symlinking {kind}: {rel}")
+        _remove(dst)
+        os.symlink(src, dst)
+        self._track(rel, {"mode": "symlink", "src": src}, changed=True)
+
+    def _stage_copy(self, src, dst, rel):
+        if self.manifest is None:
+            self.log(f"Copying file: {rel}")
+            self._clone(src, dst, rel)
+            return
+        src_state = _stat_pair(src)
+        old = self._reusable(rel, "copy", src, dst)
+        if old is not None and "hooked" in old:
+            self._track(rel, old, changed=False)
+            return
+        if old is not None:
+            if self.link_mode == "hardlink":
+                self._record_link(dst)
+            if [old["mtime_ns"], old["size"]] == src_state:
+                self._track(rel, old, changed=False)
+                return
+            if old["size"] == src_state[1] and _sha256(src) == old["sha256"]:
+                # Touched but identical: only the recorded mtime moves.
+                self._track(rel, dict(old, mtime_ns=src_state[0]), changed=False)
+                return
+        self.log(f"Copying file: {rel}")
+        _remove(dst)
+        if self.link_mode == "copy":
+            self._count(src_state[1])
+            digest = _copy_and_hash(src, dst)
+        else:
+            digest = _sha256(src)
+            self._clone(src, dst, rel)
+        entry = {
+            "mode": "copy",
+            "src": src,
+            "mtime_ns": src_state[0],
+            "size": src_state[1],
+            "sha256": digest,
+            "dst": _stat_pair(dst, follow=False),
+        }
+        self._track(rel, entry, changed=True)
+
+    def _stage_tree(self, src, dst, rel):
+        self.log(f"Copying file: {rel}")
+        if self.manifest is not None:
+            # Linked directories are rare: always copied afresh.
+            _remove(dst)
+            self._track(rel, {"mode": "tree", "src": src}, changed=True)
+        elif os.path.islink(dst):
+            os.unlink(dst)
+        self._copy_tree(src, dst, rel)
+
+    def _stage_dir(self, dst, rel):
+        if self.manifest is None:
+            if not os.path.lexists(dst):
+                os.makedirs(dst)
+            return
+        old = self._reusable(rel, "dir", "", dst)
+        if old is not None:
+            self._track(rel, old, changed=False)
+            return
+        if os.path.islink(dst) or os.path.lexists(dst) and not os.path.isdir(dst):
+            os.unlink(dst)
+        os.makedirs(dst, exist_ok=True)
+        self._track(rel, {"mode": "dir", "src": ""}, changed=True)
+
+    def remove_stale(self, build_dir):
+        """Remove the entries the previous build staged whose source is gone (or now excluded).
+
+        An entry is only removed while it is still what was staged there, so a
+        build step's output that took its place survives. Directories left
+        empty are pruned, up to (not including) the top-level ones.
+        """
+        for rel in sorted(set(self.previous) - set(self.entries), reverse=True):
+            old = self.previous[rel]
+            dst = os.path.join(build_dir, rel)
+            if _under_link(build_dir, rel):
+                # Its directory is a link into the source tree now; nothing to remove.
+                continue
+            if old["mode"] == "tree":
+                unchanged = os.path.isdir(dst)
+            else:
+                unchanged = self._reusable(rel, old["mode"], old["src"], dst) is not None
+                if old["mode"] == "dir":
+                    unchanged = unchanged and not os.listdir(dst)
+            if not unchanged:
+                continue
+            self.log(f"Removing: {rel}")
+            _remove(dst)
+            self.restaged.add(rel)
+            parent = os.path.dirname(rel)
+            while "/" in parent and parent not in self.entries:
+                try:
+                    os.rmdir(os.path.join(build_dir, parent))
+                except OSError:
+                    break
+                parent = os.path.dirname(parent)
+
+    def stage_project(self, project_root, build_dir, copy_patterns=()):
+        """Stage every top-level entry of ``project_root`` into ``build_dir``.
+
+        With a manifest, stale entries are removed afterwards and the manifest
+        is updated (the caller saves it). :attr:`stats` times the libs/ merge
+        apart from the rest.
+        """
+        start = time.perf_counter()
+        for name in _listdir(project_root):
+            item = os.path.join(project_root, name)
+            # Never distribute the build output dir or the git repo. These are also
+            # pruned from the candidate list, so a '!' rule cannot re-include them.
+            if name in ALWAYS_SKIPPED:
+                continue
+            is_dir = os.path.isdir(item) and not os.path.islink(item)
+            if self.exclusions.is_excluded(name + "/" if is_dir else name):
+                continue
+
+            if name == "src":
+                self.stage_src(item, os.path.join(build_dir, "src"), copy_patterns)
+            elif name == "libs":
+                merge_start = time.perf_counter()
+                self.part = "libs_merge"
+                self.stage_libs(item, os.path.join(build_dir, "libs"))
+                self.part = "staging"
+                self.stats["libs_merge"]["wall_s"] += time.perf_counter() - merge_start
+            elif name == "scripts":
+                for child in _listdir(item):
+                    self.stage_entry(
+                        os.path.join(item, child), os.path.join(build_dir, "scripts"), f"scripts/{child}", "symlink"
+                    )
+            elif name == "requirements.txt":
+                # Only symlink if not already processed as a filtered file (with git deps stripped out).
+                dst = os.path.join(build_dir, name)
+                if not os.path.isfile(dst) or os.path.islink(dst):
+                    self._stage_symlink(item, dst, name, "file")
+            else:
+                # Default: symlink. To copy a top-level item instead, list it (or a glob)
+                # in EXCLUDE_FROM_BUILD_SYMLINK in scripts/build.conf.
+                mode = "copy" if should_copy(name, copy_patterns) else "symlink"
+                self.stage_entry(item, build_dir, name, mode)
+
+        if self.manifest is not None:
+            self.remove_stale(build_dir)
+            self.manifest.entries = self.entries
+            self.manifest.restaged = sorted(self.restaged)
+        self.stats["staging"]["wall_s"] = time.perf_counter() - start - self.stats["libs_merge"]["wall_s"]
+
+    def stage_src(self, src_dir, build_src_dir, copy_patterns=()):
+        os.makedirs(build_src_dir, exist_ok=True)
+        for name in _listdir(src_dir):
+            mode = "copy" if should_copy(name, copy_patterns) else "symlink"
+            self.stage_entry(os.path.join(src_dir, name), build_src_dir, f"src/{name}", mode, fastpath=False)
+
+    def stage_libs(self, libs_dir, build_libs_dir):
+        # Merge project-level libs/* into build/libs (flattened) to avoid build/libs/libs
+        self.log(f"Merging project libs/* into {build_libs_dir}")
+        os.makedirs(build_libs_dir, exist_ok=True)
+        for name in _listdir(libs_dir):
+            self.stage_entry(os.path.join(libs_dir, name), build_libs_dir, f"libs/{name}", "copy")
+            staged = os.path.join(build_libs_dir, name)
+            if os.path.isdir(staged):
+                # remove VCS metadata if present (the '.*' baseline already
+                # filters these on the per-file path; this covers fast-path copies)
+                for vcs in VCS_DIRS:
+                    shutil.rmtree(os.path.join(staged, vcs), ignore_errors=True)
+                ensure_init_files(staged, self.log)
+
+
+def save_linked(linked, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(linked, f)
+
+
+def verify_links(path):
+    """The hard-linked staged files (listed in ``path``) something wrote through since staging.
+
+    Writing through a hard link also changes the project's own file. A file a
+    hook replaced (``sed -i``, ``mv``) is a new inode and is not reported.
+    """
+    with open(path, encoding="utf-8") as f:
+        linked = json.load(f)
+    modified = []
+    for dst, (inode, mtime_ns, size) in sorted(linked.items()):
+        try:
+            st = os.lstat(dst)
+        except OSError:
+            continue
+        if st.st_ino == inode and [st.st_mtime_ns, st.st_size] != [mtime_ns, size]:
+            modified.append(dst)
+    return modified
+
+
+def prepare_incremental(manifest_path, build_dir, key, log=None):
+    """Load the manifest for an incremental build, or start over when it cannot be trusted.
+
+    The build dir is wiped when the manifest is missing or was written for a
+    different ``key``, and when the build dir itself is gone.
+
+    Returns:
+        Manifest: The manifest to stage against, with ``restaged`` cleared.
+    """
+    manifest = Manifest.load(manifest_path)
+    if manifest.key != key or not manifest.entries or not os.path.isdir(build_dir):
+        if log:
+            log(f"Incremental build: starting from an empty {build_dir}")
+        shutil.rmtree(build_dir, ignore_errors=True)
+        manifest = Manifest(manifest_path, key)
+    elif log:
+        log(f"Incremental build: reusing {build_dir} ({len(manifest.entries)} staged entries)")
+    manifest.restaged = []
+    manifest.save()
+    return manifest
+
+
+def snapshot(build_dir):
+    """Build-dir-relative path -> ``[mtime_ns, size]`` of everything under ``build_dir`` (links not followed)."""
+    found = {}
+    for dirpath, dirnames, filenames in os.walk(build_dir):
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            found[os.path.relpath(path, build_dir)] = _stat_pair(path, follow=False)
+    return found
+
+
+def check_step(manifest, build_dir, name, key, watch=(), log=None):
+    """Whether step ``name`` can be skipped, its previous outputs reused.
+
+    A step reruns when its key (its inputs) changed, one of its outputs is
+    missing, a staged entry it modified was restaged, or anything under one of
+    the ``watch`` prefixes was restaged. Before a rerun its previous outputs are
+    removed, the entries it modified are restored, and the build dir is
+    snapshotted for :func:`record_step`.
+    """
+    step = manifest.steps.get(name)
+    restaged = manifest.restaged
+    prefixes = tuple(prefix.rstrip("/") + "/" for prefix in watch)
+    if (
+        step is not None
+        and step.get("key") == key
+        and all(os.path.lexists(os.path.join(build_dir, rel)) for rel in step["outputs"])
+        and not set(restaged) & set(step["touched"])
+        and not any(rel.startswith(prefixes) for rel in restaged)
+    ):
+        return True
+
+    if step is not None:
+        # Children before parents; a directory still holding staged entries stays.
+        for rel in sorted(step["outputs"], reverse=True):
+            path = os.path.join(build_dir, rel)
+            if rel in manifest.entries:
+                # A staged entry took an output's place: staging owns it now.
+                continue
+            if os.path.isdir(path) and not os.path.islink(path):
+                try:
+                    os.rmdir(path)
+                except OSError:
+                    pass
+            elif os.path.lexists(path):
+                os.unlink(path)
+        for rel in step["touched"]:
+            entry = manifest.entries.get(rel)
+            if entry is not None and "hooked" in entry:
+                restore_entry(build_dir, rel, entry)
+    if log:
+        log(f"Running step '{name}'")
+    manifest.steps[name] = {"key": key, "outputs": [], "touched": [], "pending": True}
+    manifest.save()
+    with open(manifest.snapshot_path(name), "w", encoding="utf-8") as f:
+        f.write(json.dumps(snapshot(build_dir)))
+    return False
+
+
+def restore_entry(build_dir, rel, entry):
+    """Stage ``entry`` again as it was before a build step modified it."""
+    dst = os.path.join(build_dir, rel)
+    _remove(dst)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if entry["mode"] == "symlink":
+        os.symlink(entry["src"], dst)
+    elif entry["mode"] == "copy":
+        entry["sha256"] = _copy_and_hash(entry["src"], dst)
+        entry["mtime_ns"], entry["size"] = _stat_pair(entry["src"])
+        entry["dst"] = _stat_pair(dst, follow=False)
+    else:
+        os.makedirs(dst, exist_ok=True)
+    del entry["hooked"]
+
+
+def record_step(manifest, build_dir, name):
+    """Record what step ``name`` created and which staged entries it modified.
+
+    Modified entries are marked ``hooked``, so the next staging keeps the
+    step's version until the source or the staged file changes.
+    """
+    snapshot_path = manifest.snapshot_path(name)
+    with open(snapshot_path, encoding="utf-8") as f:
+        before = json.load(f)
+    after = snapshot(build_dir)
+    outputs = sorted(rel for rel in after if rel not in before)
+    touched = []
+    for rel, state in after.items():
+        entry = manifest.entries.get(rel)
+        if entry is None or rel not in before or state == before[rel] or entry["mode"] == "dir":
+            continue
+        entry["hooked"] = {"dst": state, "src": _stat_pair(entry["src"])}
+        touched.append(rel)
+    manifest.steps[name] = {"key": manifest.steps[name]["key"], "outputs": outputs, "touched": sorted(touched)}
+    manifest.save()
+    os.unlink(snapshot_path)
+
+
+class HookStepError(Exception):
+    """A declared hook step failed, or its declaration is invalid."""
+
+
+def order_hook_steps(steps):
+    """The ``HOOK_STEPS`` declarations in dependency order.
+
+    Args:
+        steps (list): Dicts with ``name``, ``cmd`` and the lists ``inputs``,
+            ``outputs`` and ``deps`` (names of steps that must finish first).
+
+    Raises:
+        HookStepError: A name is declared twice, a dependency is not declared,
+            or the dependencies form a cycle.
+    """
+    by_name = {}
+    for step in steps:
+        if step["name"] in by_name:
+            raise HookStepError(f"hook step '{step['name']}' is declared twice")
+        by_name[step["name"]] = step
+    ordered, state = [], {}
+
+    def visit(step, chain):
+        if state.get(step["name"]) == "done":
+            return
+        if state.get(step["name"]) == "visiting":
+            raise HookStepError(f"hook steps depend on each other: {' -> '.join(chain + [step['name']])}")
+        state[step["name"]] = "visiting"
+        for dep in step["deps"]:
+            if dep not in by_name:
+                raise HookStepError(f"hook step '{step['name']}' depends on '{dep}', which is not in HOOK_STEPS")
+            visit(by_name[dep], chain + [step["name"]])
+        state[step["name"]] = "done"
+        ordered.append(step)
+
+    for step in steps:
+        visit(step, [])
+    return ordered
+
+
+def hook_step_keys(steps, project_root):
+    """Step name -> sha256 over its command, its inputs' content and its dependencies' keys.
+
+    ``steps`` must be in dependency order. Inputs are PROJECT_ROOT-relative
+    files or directories (hashed file by file, symlinks followed); a missing
+    input counts too. Names, not absolute paths, are hashed, so the keys
+    survive moving the project.
+    """
+    keys = {}
+    for step in steps:
+        digest = hashlib.sha256(f"{HOOK_CACHE_VERSION}\0{step['cmd']}".encode())
+        for dep in sorted(step["deps"]):
+            digest.update(f"\0dep {dep} {keys[dep]}".encode())
+        for rel in step["inputs"]:
+            top = os.path.join(project_root, rel)
+            files = [top]
+            if os.path.isdir(top):
+                files = []
+                for dirpath, dirnames, filenames in os.walk(top, followlinks=True):
+                    dirnames.sort()
+                    files.extend(os.path.join(dirpath, name) for name in sorted(filenames))
+            for path in files:
+                digest.update(b"\0" + os.fsencode(os.path.relpath(path, project_root)) + b"\0")
+                digest.update(_sha256(path).encode() if os.path.isfile(path) else b"-")
+        keys[step["name"]] = digest.hexdigest()
+    return keys
+
+
+def _clone_or_copy(src, dst):
+    try:
+        _reflink(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _copy_output(src, dst):
+    """Copy a hook step output (file, symlink or tree) from ``src`` to ``dst``."""
+    _remove(dst)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.islink(src):
+        os.symlink(os.readlink(src), dst)
+    elif os.path.isdir(src):
+        shutil.copytree(src, dst, symlinks=True, copy_function=_clone_or_copy)
+    else:
+        _clone_or_copy(src, dst)
+
+
+class HookRunner:
+    """Runs the ``HOOK_STEPS`` declared in build.conf, in parallel where their dependencies allow.
+
+    Each step runs ``bash -c <cmd>`` in ``build_dir/libs`` (like hooks.sh),
+    after the steps it depends on succeeded. Its output goes to
+    ``<log_dir>/<name>.log`` and, when ``log`` is set, to the console with a
+    ``[name]`` prefix. A step whose key (see :func:`hook_step_keys`) matches
+    its cached run is not run: its outputs (build-dir-relative paths) are
+    copied back from ``<cache_dir>/<name>/`` instead. Only the latest run of
+    each step is cached.
+    """
+
+    def __init__(self, steps, project_root, build_dir, cache_dir, log_dir, jobs=None, log=None):
+        self.steps = order_hook_steps(steps)
+        self.project_root = project_root
+        self.build_dir = build_dir
+        self.cache_dir = cache_dir
+        self.log_dir = log_dir
+        self.jobs = jobs or os.cpu_count() or 1
+        self.log = log
+        self.keys = {}
+        # Step name -> "ran", "cached", "failed" or "skipped" (a dependency failed)
+        self.results = {}
+        self._print_lock = threading.Lock()
+
+    def _say(self, message):
+        if self.log:
+            with self._print_lock:
+                self.log(message)
+
+    def _cached(self, step):
+        cached = os.path.join(self.cache_dir, step["name"])
+        try:
+            with open(os.path.join(cached, "key"), encoding="utf-8") as f:
+                key = f.read().strip()
+        except OSError:
+            return None
+        outputs = [os.path.join(cached, "outputs", rel) for rel in step["outputs"]]
+        if key != self.keys[step["name"]] or not all(os.path.lexists(path) for path in outputs):
+            return None
+        return cached
+
+    def _store(self, step):
+        cached = os.path.join(self.cache_dir, step["name"])
+        tmp = f"{cached}.tmp{os.getpid()}"
+        _remove(tmp)
+        for rel in step["outputs"]:
+            _copy_output(os.path.join(self.build_dir, rel), os.path.join(tmp, "outputs", rel))
+        os.makedirs(tmp, exist_ok=True)
+        with open(os.path.join(tmp, "key"), "w", encoding="utf-8") as f:
+            f.write(self.keys[step["name"]] + "\n")
+        _remove(cached)
+        os.replace(tmp, cached)
+
+    def _run(self, step):
+        name = step["name"]
+        cached = self._cached(step)
+        if cached is not None:
+            for rel in step["outputs"]:
+                _copy_output(os.path.join(cached, "outputs", rel), os.path.join(self.build_dir, rel))
+            self._say(f"✓ Hook step '{name}' is up to date, reusing its cached outputs")
+            return "cached"
+
+        # Start from a clean slate, so a stale output cannot pass for a new one
+        for rel in step["outputs"]:
+            _remove(os.path.join(self.build_dir, rel))
+        self._say(f"Running hook step '{name}'")
+        start = time.monotonic()
+        log_path = os.path.join(self.log_dir, f"{name}.log")
+        with open(log_path, "wb") as log_file:
+            proc = subprocess.Popen(
+                ["bash", "-c", step["cmd"]],
+                cwd=os.path.join(self.build_dir, "libs"),
+                env=dict(os.environ, HOOK_STEP=name),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+            for line in proc.stdout:
+                log_file.write(line)
+                if self.log:
+                    self._say(f"[{name}] " + line.decode(errors="replace").rstrip("\n"))
+            status = proc.wait()
+        if status != 0:
+            raise HookStepError(self._failure(name, f"failed (exit {status})", log_path))
+        missing = [rel for rel in step["outputs"] if not os.path.lexists(os.path.join(self.build_dir, rel))]
+        if missing:
+            raise HookStepError(self._failure(name, f"did not create its outputs: {' '.join(missing)}", log_path))
+        self._store(step)
+        self._say(f"✓ Hook step '{name}' finished in {time.monotonic() - start:.1f}s")
+        return "ran"
+
+    def _failure(self, name, what, log_path):
+        message = f"hook step '{name}' {what}; its output is in {log_path}"
+        if self.log is None:
+            # The output was not printed as it ran: show how it ended
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                tail = collections.deque(f, maxlen=HOOK_LOG_TAIL)
+            message += "".join(["\n", *(f"  {line}" for line in tail)]).rstrip("\n")
+        return message
+
+    def run(self):
+        """Run every step; returns the error messages of the steps that failed."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.keys = hook_step_keys(self.steps, self.project_root)
+        waiting = list(self.steps)
+        errors = []
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            running = {}
+            while waiting or running:
+                for step in list(waiting):
+                    deps = [self.results.get(dep) for dep in step["deps"]]
+                    if any(result in ("failed", "skipped") for result in deps) or (errors and not running):
+                        self.results[step["name"]] = "skipped"
+                        waiting.remove(step)
+                    elif not errors and all(result in ("ran", "cached") for result in deps):
+                        running[pool.submit(self._run, step)] = step
+                        waiting.remove(step)
+                if not running:
+                    continue
+                done, _pending = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        self.results[step["name"]] = future.result()
+                    except (HookStepError, OSError) as e:
+                        self.results[step["name"]] = "failed"
+                        errors.append(str(e))
+        return errors
+
+
+def ensure_init_files(target_dir, log=None):
+    """Create ``__init__.py`` in every directory under ``target_dir`` lacking one.
+
+    Symlinked directories are not descended into, like ``find -type d``.
+
+    Returns:
+        int: The number of files created.
+    """
+    created = 0
+    for dirpath, _dirnames, filenames in os.walk(target_dir):
+        if "__init__.py" in filenames and os.path.isfile(os.path.join(dirpath, "__init__.py")):
+            continue
+        if log:
+            log(f"  Creating __init__.py in: {dirpath}")
+        with open(os.path.join(dirpath, "__init__.py"), "w") as f:
+            f.write(INIT_FILE_CONTENT)
+        created += 1
+    return created
+
+
+def _deflate_block(block, dictionary, level, last):
+    # Raw deflate; the previous block's tail primes the window, as in pigz.
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelGzipWriter:
+    """A write-only gzip stream whose blocks are deflated on a thread pool.
+
+    The input is cut into fixed-size blocks, each compressed independently
+    (zlib releases the GIL) and written in order as one standard gzip member.
+    Block boundaries do not depend on ``jobs``, so neither does the output.
+
+    Args:
+        fileobj: Binary file the compressed stream is written to.
+        level (int): zlib compression level.
+        jobs (int, optional): Worker threads; defaults to the number of CPUs.
+        block_size (int): Uncompressed bytes per block.
+    """
+
+    def __init__(self, fileobj, level=GZIP_LEVEL, jobs=None, block_size=GZIP_BLOCK_SIZE):
+        self.fileobj = fileobj
+        self.level = level
+        self.block_size = block_size
+        jobs = jobs or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=jobs)
+        # Bounds memory: at most this many compressed blocks wait to be written
+        self.max_pending = 2 * jobs
+        self.pending = collections.deque()
+        self.buffer = bytearray()
+        self.dictionary = b""
+        self.crc = 0
+        self.size = 0
+        self.closed = False
+        fileobj.write(GZIP_HEADER)
+
+    def write(self, data):
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        self.buffer += data
+        while len(self.buffer) >= self.block_size:
+            block = bytes(self.buffer[: self.block_size])
+            del self.buffer[: self.block_size]
+            self._submit(block, last=False)
+        return len(data)
+
+    def _submit(self, block, last):
+        self.pending.append(self.executor.submit(_deflate_block, block, self.dictionary, self.level, last))
+        self.dictionary = block[-DEFLATE_WINDOW:]
+        while len(self.pending) > self.max_pending:
+            self.fileobj.write(self.pending.popleft().result())
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._submit(bytes(self.buffer), last=True)
+            while self.pending:
+                self.fileobj.write(self.pending.popleft().result())
+            self.fileobj.write(struct.pack("<II", self.crc & 0xFFFFFFFF, self.size & 0xFFFFFFFF))
+        finally:
+            self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _compressor_command(compression, jobs):
+    """The external compressor for ``compression``, or None to compress in-process."""
+    if compression == "zstd":
+        if not shutil.which("zstd"):
+            raise OSError("TARBALL_COMPRESSION=zstd needs the 'zstd' command")
+        return ["zstd", "-q", "-c", f"-T{jobs or 0}"]
+    if compression == "gzip" and shutil.which("pigz"):
+        # -n: no name or mtime in the header
+        return ["pigz", "-n", "-c", f"-{GZIP_LEVEL}"] + ([f"-p{jobs}"] if jobs else [])
+    return None
+
+
+def _walk_members(build_root, tool_dir):
+    """``(path, arcname)`` of every tarball member, sorted, following symlinks like ``tar -h``."""
+    stack = [(os.path.join(build_root, tool_dir), tool_dir)]
+    while stack:
+        path, arcname = stack.pop()
+        yield path, arcname
+        if os.path.isdir(path):
+            children = _listdir(path)
+            stack.extend((os.path.join(path, name), f"{arcname}/{name}") for name in reversed(children))
+
+
+def _normalized(info, mtime):
+    """``info`` with nothing left that depends on the machine, the user or the checkout time."""
+    info.mtime = mtime
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    # Only the executable bit survives: umasks differ between machines
+    info.mode = 0o755 if info.isdir() or info.mode & 0o111 else 0o644
+    return info
+
+
+def tree_digest(members, extra=""):
+    """sha256 over the members' names, types, normalized modes and contents (and ``extra``).
+
+    Equal digests mean equal tarballs, for the same compressor and mtime.
+    """
+    digest = hashlib.sha256(extra.encode())
+    for path, arcname in members:
+        st = os.stat(path)
+        is_dir = os.path.isdir(path)
+        mode = 0o755 if is_dir or st.st_mode & 0o111 else 0o644
+        digest.update(f"\0{arcname}\0{'d' if is_dir else 'f'}{mode:o}\0".encode())
+        if not is_dir:
+            digest.update(_sha256(path).encode())
+    return digest.hexdigest()
+
+
+def _add_members(tar, members, mtime):
+    for path, arcname in members:
+        info = tar.gettarinfo(path, arcname)
+        if info is None:
+            # Sockets and the like; tar skips them too
+            continue
+        _normalized(info, mtime)
+        if info.isreg():
+            with open(path, "rb") as f:
+                tar.addfile(info, f)
+        else:
+            tar.addfile(info)
+
+
+def _place(src, dst):
+    """Atomically put a copy of ``src`` at ``dst``: a hard link when possible."""
+    tmp = f"{dst}.tmp"
+    if os.path.lexists(tmp):
+        os.unlink(tmp)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def prune_cache(cache_dir, keep=ARTIFACT_CACHE_KEEP):
+    """Delete all but the ``keep`` most recently used artifacts in ``cache_dir``."""
+    artifacts = [entry for entry in os.scandir(cache_dir) if entry.is_file() and not entry.name.endswith(".tmp")]
+    artifacts.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+    for entry in artifacts[keep:]:
+        os.unlink(entry.path)
+
+
+def write_tarball(build_root, tool_dir, output, compression="gzip", jobs=None, mtime=0, cache_dir=None, cache_key=""):
+    """Write ``build_root/tool_dir`` to the tarball ``output``, reproducibly.
+
+    Equivalent to ``tar -chzf`` (symlinks followed), but with compression on
+    all cores, and byte-for-byte reproducible: members in sorted order, every
+    mtime set to ``mtime``, owner root (numeric), permissions reduced to
+    644/755, and a gzip header without name or timestamp. The file appears
+    atomically.
+
+    With ``cache_dir``, the tarball is also stored there under the digest of
+    the staged tree (plus ``cache_key``, ``mtime`` and the compressor); when
+    that digest is already cached, the cached tarball is reused instead of
+    compressing again.
+
+    Args:
+        compression (str): A key of :data:`COMPRESSIONS`.
+        jobs (int, optional): Compression threads; defaults to every CPU.
+        mtime (int): The mtime of every member (build.sh passes SOURCE_DATE_EPOCH).
+        cache_dir (str, optional): The artifact cache.
+        cache_key (str): Anything else the tarball depends on (build.sh passes TOOL_VERSION).
+
+    Returns:
+        str: The compressor used, or ``"cache"`` for a cache hit.
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"unknown TARBALL_COMPRESSION {compression!r} (choose from {', '.join(COMPRESSIONS)})")
+    command = _compressor_command(compression, jobs)
+    used = "python" if command is None else command[0]
+    members = list(_walk_members(build_root, tool_dir))
+
+    cached = None
+    if cache_dir:
+        key = tree_digest(members, f"{ARTIFACT_CACHE_VERSION} {used} {mtime} {cache_key}")
+        cached = os.path.join(cache_dir, f"{key[:32]}-{os.path.basename(output)}")
+        if os.path.isfile(cached):
+            _place(cached, output)
+            os.utime(cached)
+            return "cache"
+
+    tmp = f"{output}.tmp"
+    try:
+        with open(tmp, "wb") as out:
+            if command is None:
+                with ParallelGzipWriter(out, jobs=jobs) as gz:
+                    with tarfile.open(fileobj=gz, mode="w|", format=tarfile.GNU_FORMAT, dereference=True) as tar:
+                        _add_members(tar, members, mtime)
+            else:
+                proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=out)
+                try:
+                    with tarfile.open(
+                        fileobj=proc.stdin, mode="w|", format=tarfile.GNU_FORMAT, dereference=True
+                    ) as tar:
+                        _add_members(tar, members, mtime)
+                finally:
+                    proc.stdin.close()
+                    returncode = proc.wait()
+                if returncode:
+                    raise OSError(f"{command[0]} failed (exit {returncode})")
+        os.replace(tmp, output)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+    if cached is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        _place(output, cached)
+        prune_cache(cache_dir)
+    return used
+
+
+def tree_stats(root):
+    """``(files, bytes)`` of the non-directories under ``root``, symlinks not followed."""
+    files = nbytes = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in filenames + [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]:
+            files += 1
+            nbytes += os.lstat(os.path.join(dirpath, name)).st_size
+    return files, nbytes
+
+
+def log_tree_stats(log_file, name, tree):
+    """Append the file and byte counts of ``tree`` as step ``name`` starts to the profile log."""
+    files, nbytes = tree_stats(tree)
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"name": name, "files": files, "bytes": nbytes}) + "\n")
+
+
+def _count_lines(path):
+    with open(path, "rb") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def build_profile(log_file, stage_stats=None, candidates=None, excluded=None, tarball=None, tree=None, meta=None):
+    """Assemble ``build-profile.json`` from the step marks and what each step reports.
+
+    ``log_file`` holds one JSON object per line: a mark (``name``, ``time``)
+    when a step starts, and optionally before it the build dir's size at that
+    point (``name``, ``files``, ``bytes``). Each step runs from its mark to the
+    next one's ``start``: the time spent counting is no step's. ``staging`` is split into
+    staging and ``libs_merge`` from ``stage --stats``. ``files``/``bytes`` are:
+    paths evaluated (exclusions), entries staged and bytes copied (staging,
+    libs_merge), the growth of the build dir (hooks), and the members and
+    their bytes (packaging, plus ``output_bytes``).
+
+    Args:
+        tree (tuple): ``(build_root, tool_dir)``, the packaged tree.
+    """
+    marks, sizes = [], {}
+    with open(log_file, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "time" in record:
+                marks.append(record)
+            else:
+                sizes[record["name"]] = record
+    marks = [dict(sizes.get(mark["name"], {}), **mark) for mark in marks]
+    stats = {}
+    if stage_stats and os.path.exists(stage_stats):
+        with open(stage_stats, encoding="utf-8") as f:
+            stats = json.load(f)
+
+    steps = []
+    for mark, following in zip(marks, marks[1:]):
+        step = {"name": mark["name"], "wall_s": round(following.get("start", following["time"]) - mark["time"], 3)}
+        if mark["name"] == "exclusions" and candidates and excluded:
+            step["files"] = _count_lines(candidates)
+            step["excluded"] = _count_lines(excluded)
+        elif mark["name"] == "staging" and stats:
+            # The stage call also starts python and loads the exclusions: that goes to staging.
+            merge = dict(stats["libs_merge"], name="libs_merge")
+            merge["wall_s"] = round(merge["wall_s"], 3)
+            step.update(files=stats["staging"]["files"], bytes=stats["staging"]["bytes"])
+            step["wall_s"] = round(step["wall_s"] - merge["wall_s"], 3)
+            steps.append(step)
+            step = {"name": "libs_merge", "wall_s": merge["wall_s"], "files": merge["files"], "bytes": merge["bytes"]}
+        elif "files" in mark and "files" in following:
+            step["files"] = following["files"] - mark["files"]
+            step["bytes"] = following["bytes"] - mark["bytes"]
+        elif mark["name"] == "packaging" and tree:
+            files = nbytes = 0
+            for path, _arcname in _walk_members(*tree):
+                if not os.path.isdir(path):
+                    files += 1
+                    nbytes += os.path.getsize(path)
+            step.update(files=files, bytes=nbytes)
+            if tarball and os.path.exists(tarball):
+                step["output_bytes"] = os.path.getsize(tarball)
+        steps.append(step)
+
+    profile = dict(meta or {})
+    profile["wall_s"] = round(sum(step["wall_s"] for step in steps), 3)
+    profile["steps"] = steps
+    return profile
+
+
+def format_profile(profile):
+    """Render a :func:`build_profile` result as printable lines, slowest step first."""
+    lines = [f"Build profile ({profile['wall_s']:.3f}s):"]
+    lines.append(f"  {'wall_s':>10} {'share':>6} {'files':>9} {'MB':>10}  step")
+    for step in sorted(profile["steps"], key=lambda step: step["wall_s"], reverse=True):
+        share = step["wall_s"] / profile["wall_s"] * 100 if profile["wall_s"] else 0.0
+        files = step.get("files", "-")
+        mb = f"{step['bytes'] / 1e6:.1f}" if "bytes" in step else "-"
+        lines.append(f"  {step['wall_s']:>10.3f} {share:>5.1f}% {files:>9} {mb:>10}  {step['name']}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="build.py", description="Build staging engine used by build.sh.")
+    parser.add_argument("--verbose", "-v", action="store_true", help="print each staged entry")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    stage = commands.add_parser("stage", help="stage the project tree into the build dir")
+    stage.add_argument("--project-root", required=True)
+    stage.add_argument("--build-dir", required=True)
+    stage.add_argument("--excluded", required=True, help="git check-ignore output (one path per line)")
+    stage.add_argument("--copy", default="", help="EXCLUDE_FROM_BUILD_SYMLINK: space-separated glob patterns")
+    stage.add_argument("--manifest", help="stage incrementally against this manifest (see 'prepare')")
+    stage.add_argument("--link-mode", default="auto", choices=LINK_MODES, help="STAGE_COPY_MODE")
+    stage.add_argument("--hook-modifies", default="", help="HOOK_MODIFIES: space-separated glob patterns")
+    stage.add_argument("--linked-list", help="where to list hard-linked files for 'verify-links'")
+    stage.add_argument("--stats", help="write per-part wall time and counts here (JSON)")
+
+    exclusions = commands.add_parser("exclusions", help="evaluate the distignore rules over the project, in one walk")
+    exclusions.add_argument("--project-root", required=True)
+    exclusions.add_argument("--ignore-repo", required=True, help="the throwaway repo holding the rules as .gitignore")
+    exclusions.add_argument("--candidates", required=True, help="where to list every path evaluated")
+    exclusions.add_argument("--excluded", required=True, help="where to list the excluded paths")
+
+    verify = commands.add_parser("verify-links", help="fail if a hard-linked staged file was modified in place")
+    verify.add_argument("--linked-list", required=True)
+
+    prepare = commands.add_parser("prepare", help="start an incremental build, or a full one when it cannot be")
+    prepare.add_argument("--manifest", required=True)
+    prepare.add_argument("--build-dir", required=True)
+    prepare.add_argument("--key", default="", help="anything that invalidates the whole build dir")
+    prepare.add_argument("--inputs", nargs="*", default=[], help="files hashed into the key")
+
+    step_check = commands.add_parser("step-check", help="exit 0 when a build step can be skipped, 1 to run it")
+    step_check.add_argument("name")
+    step_check.add_argument("--manifest", required=True)
+    step_check.add_argument("--build-dir", required=True)
+    step_check.add_argument("--key", default="", help="anything besides --inputs the step depends on")
+    step_check.add_argument("--inputs", nargs="*", default=[], help="files the step reads")
+    step_check.add_argument("--watch", nargs="*", default=[], help="build-dir paths the step reads")
+
+    step_record = commands.add_parser("step-record", help="record what a build step produced")
+    step_record.add_argument("name")
+    step_record.add_argument("--manifest", required=True)
+    step_record.add_argument("--build-dir", required=True)
+
+    package = commands.add_parser("package", help="write the tarball, compressed on every core")
+    package.add_argument("--build-root", required=True, help="the directory holding TOOL_DIR")
+    package.add_argument("--tool-dir", required=True)
+    package.add_argument("--output", required=True)
+    package.add_argument("--compression", default="gzip", choices=sorted(COMPRESSIONS))
+    package.add_argument("--jobs", type=int, help="compression threads (default: every CPU)")
+    package.add_argument("--mtime", type=int, default=0, help="mtime of every member (SOURCE_DATE_EPOCH)")
+    package.add_argument("--cache-dir", help="reuse and store tarballs keyed on the staged tree's digest")
+    package.add_argument("--cache-key", default="", help="anything else the tarball depends on (TOOL_VERSION)")
+
+    stats = commands.add_parser("tree-stats", help="log a directory's file and byte counts as a build step starts")
+    stats.add_argument("name")
+    stats.add_argument("tree")
+    stats.add_argument("--log", required=True)
+
+    profile = commands.add_parser("profile-write", help="write and print build-profile.json from the step marks")
+    profile.add_argument("--log", required=True)
+    profile.add_argument("--output", required=True)
+    profile.add_argument("--stage-stats")
+    profile.add_argument("--candidates", help="the paths the exclusion rules were evaluated on")
+    profile.add_argument("--excluded")
+    profile.add_argument("--tarball")
+    profile.add_argument("--build-root")
+    profile.add_argument("--tool-dir")
+    profile.add_argument("--meta", nargs="*", default=[], metavar="KEY=VALUE")
+
+    hooks = commands.add_parser("hook-steps", help="run build.conf's HOOK_STEPS, in parallel and cached")
+    hooks.add_argument("--project-root", required=True)
+    hooks.add_argument("--build-dir", required=True)
+    hooks.add_argument("--cache-dir", required=True, help="each step's latest outputs, keyed on its inputs")
+    hooks.add_argument("--log-dir", required=True, help="where each step's output is written (<name>.log)")
+    hooks.add_argument("--jobs", type=int, help="steps run at once (default: every CPU)")
+    hooks.add_argument(
+        "--step",
+        nargs=5,
+        action="append",
+        default=[],
+        metavar=("NAME", "CMD", "INPUTS", "OUTPUTS", "DEPS"),
+        help="one declared step; INPUTS, OUTPUTS and DEPS are space-separated",
+    )
+
+    init_files = commands.add_parser("init-files", help="ensure __init__.py files under a directory")
+    init_files.add_argument("target_dir")
+
+    args = parser.parse_args(argv)
+    log = print if args.verbose else None
+    try:
+        if args.command == "stage":
+            manifest = Manifest.load(args.manifest) if args.manifest else None
+            stager = Stager(Exclusions.load(args.excluded), log, manifest, args.link_mode, args.hook_modifies.split())
+            stager.stage_project(args.project_root, args.build_dir, args.copy.split())
+            if args.linked_list:
+                save_linked(stager.linked, args.linked_list)
+            if args.stats:
+                with open(args.stats, "w", encoding="utf-8") as f:
+                    json.dump(stager.stats, f)
+            if manifest is not None:
+                manifest.save()
+                if log:
+                    log(f"Restaged {len(manifest.restaged)} of {len(manifest.entries)} entries")
+        elif args.command == "exclusions":
+            candidates, excluded = evaluate_exclusions(args.project_root, args.ignore_repo)
+            _write_lines(args.candidates, candidates)
+            _write_lines(args.excluded, excluded)
+            if log:
+                log(f"Excluded {len(excluded)} of {len(candidates)} paths evaluated")
+        elif args.command == "verify-links":
+            modified = verify_links(args.linked_list)
+            if modified:
+                print("ERROR: these hard-linked files were modified in place, which also changed the", file=sys.stderr)
+                print("project's copies. Add them to HOOK_MODIFIES in scripts/build.conf:", file=sys.stderr)
+                for path in modified:
+                    print(f"  {path}", file=sys.stderr)
+                return 1
+        elif args.command == "prepare":
+            prepare_incremental(args.manifest, args.build_dir, inputs_key(args.inputs, args.key), log)
+        elif args.command == "step-check":
+            manifest = Manifest.load(args.manifest)
+            key = inputs_key(args.inputs, args.key)
+            return 0 if check_step(manifest, args.build_dir, args.name, key, args.watch, log) else 1
+        elif args.command == "step-record":
+            record_step(Manifest.load(args.manifest), args.build_dir, args.name)
+        elif args.command == "package":
+            used = write_tarball(
+                args.build_root,
+                args.tool_dir,
+                args.output,
+                args.compression,
+                args.jobs,
+                args.mtime,
+                args.cache_dir,
+                args.cache_key,
+            )
+            if used == "cache":
+                print(f"Reused cached {args.output} (staged tree unchanged)")
+            elif log:
+                log(f"Packaged {args.output} ({used})")
+        elif args.command == "tree-stats":
+            log_tree_stats(args.log, args.name, args.tree)
+        elif args.command == "profile-write":
+            tree = (args.build_root, args.tool_dir) if args.build_root and args.tool_dir else None
+            meta = dict(item.split("=", 1) for item in args.meta)
+            profile = build_profile(
+                args.log, args.stage_stats, args.candidates, args.excluded, args.tarball, tree, meta
+            )
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(profile, f, indent=2)
+                f.write("\n")
+            print("\n".join(format_profile(profile)))
+            print(f"Wrote {args.output}")
+        elif args.command == "hook-steps":
+            steps = [
+                {"name": name, "cmd": cmd, "inputs": inputs.split(), "outputs": outputs.split(), "deps": deps.split()}
+                for name, cmd, inputs, outputs, deps in args.step
+            ]
+            runner = HookRunner(steps, args.project_root, args.build_dir, args.cache_dir, args.log_dir, args.jobs, log)
+            errors = runner.run()
+            for error in errors:
+                print(f"ERROR: {error}", file=sys.stderr)
+            skipped = sorted(name for name, result in runner.results.items() if result == "skipped")
+            if skipped:
+                print(f"Not run, after the failure: {' '.join(skipped)}", file=sys.stderr)
+            if errors:
+                return 1
+            if log:
+                ran = sum(result == "ran" for result in runner.results.values())
+                log(f"Hook steps: {ran} run, {len(runner.results) - ran} reused from the cache")
+        elif args.command == "init-files":
+            ensure_init_files(args.target_dir, log)
+    except (OSError, HookStepError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -244,10 +244,16 @@ def create_example_structure():
         os.chmod(f"{project_name}/src/core/configure.py", 0o755)
 
         # Copy core files to protected core/ directory
-        shutil.copy(f"{EXAMPLE_DIR}/NGArgumentParser.py", f"{project_name}/src/core/NGArgumentParser.py")
+        shutil.copy(f"{NGPARSER_DIR}/NGArgumentParser.py", f"{project_name}/src/core/NGArgumentParser.py")
         shutil.copy(f"{NGPARSER_DIR}/core_validators.py", f"{project_name}/src/core/core_validators.py")
         shutil.copy(f"{TEMPLATE_DIR}/set_pythonpath.py", f"{project_name}/src/core/set_pythonpath.py")
         shutil.copy(f"{NGPARSER_DIR}/result_writer.py", f"{project_name}/src/core/result_writer.py")
+        shutil.copy(f"{NGPARSER_DIR}/anchors.py", f"{project_name}/src/core/anchors.py")
+        shutil.copy(f"{NGPARSER_DIR}/job_descriptions.py", f"{project_name}/src/core/job_descriptions.py")
+        shutil.copy(f"{NGPARSER_DIR}/job_export.py", f"{project_name}/src/core/job_export.py")
+        shutil.copy(f"{NGPARSER_DIR}/job_runner.py", f"{project_name}/src/core/job_runner.py")
+        shutil.copy(f"{NGPARSER_DIR}/timing.py", f"{project_name}/src/core/timing.py")
+        shutil.copy(f"{NGPARSER_DIR}/parser_cache.py", f"{project_name}/src/core/parser_cache.py")
 
         # Create __init__.py for core package
         with open(f"{project_name}/src/core/__init__.py", "w") as f:
@@ -256,9 +262,10 @@ def create_example_structure():
         # Copy user-modifiable files to src/
         shutil.copy(f"{NGPARSER_DIR}/validators.py", f"{project_name}/src/validators.py")
 
-        # Framework-owned: scripts/core/build.sh (cli sync overwrites this)
+        # Framework-owned: scripts/core/build.sh + build.py (cli sync overwrites these)
         shutil.copy(f"{TEMPLATE_DIR}/build.sh", f"{project_name}/scripts/core/build.sh")
         os.chmod(f"{project_name}/scripts/core/build.sh", 0o755)
+        shutil.copy(f"{NGPARSER_DIR}/build.py", f"{project_name}/scripts/core/build.py")
         # Framework-owned: root Makefile (cli sync overwrites this)
         shutil.copy(f"{TEMPLATE_DIR}/Makefile", f"{project_name}/Makefile")
         # User-owned: scripts/build.conf, .distignore (root)
@@ -325,6 +332,12 @@ def create_project_structure(project_name):
         shutil.copy(f"{NGPARSER_DIR}/core_validators.py", f"{project_name}/src/core/core_validators.py")
         shutil.copy(f"{TEMPLATE_DIR}/set_pythonpath.py", f"{project_name}/src/core/set_pythonpath.py")
         shutil.copy(f"{NGPARSER_DIR}/result_writer.py", f"{project_name}/src/core/result_writer.py")
+        shutil.copy(f"{NGPARSER_DIR}/anchors.py", f"{project_name}/src/core/anchors.py")
+        shutil.copy(f"{NGPARSER_DIR}/job_descriptions.py", f"{project_name}/src/core/job_descriptions.py")
+        shutil.copy(f"{NGPARSER_DIR}/job_export.py", f"{project_name}/src/core/job_export.py")
+        shutil.copy(f"{NGPARSER_DIR}/job_runner.py", f"{project_name}/src/core/job_runner.py")
+        shutil.copy(f"{NGPARSER_DIR}/timing.py", f"{project_name}/src/core/timing.py")
+        shutil.copy(f"{NGPARSER_DIR}/parser_cache.py", f"{project_name}/src/core/parser_cache.py")
 
         # Create __init__.py for core package
         with open(f"{project_name}/src/core/__init__.py", "w") as f:
@@ -333,9 +346,10 @@ def create_project_structure(project_name):
         # Copy user-modifiable files to src/
         shutil.copy(f"{NGPARSER_DIR}/validators.py", f"{project_name}/src/validators.py")
 
-        # Framework-owned: scripts/core/build.sh + root Makefile (cli sync overwrites these)
+        # Framework-owned: scripts/core/build.sh + build.py + root Makefile (cli sync overwrites these)
         shutil.copy(f"{TEMPLATE_DIR}/build.sh", f"{project_name}/scripts/core/build.sh")
         os.chmod(f"{project_name}/scripts/core/build.sh", 0o755)
+        shutil.copy(f"{NGPARSER_DIR}/build.py", f"{project_name}/scripts/core/build.py")
         shutil.copy(f"{TEMPLATE_DIR}/Makefile", f"{project_name}/Makefile")
         # User-owned: scripts/build.conf, hooks.sh, .distignore (root) (sync leaves alone)
         shutil.copy(f"{TEMPLATE_DIR}/build.conf", f"{project_name}/scripts/build.conf")
@@ -1664,9 +1678,16 @@ def sync_command(args):
             (f"{NGPARSER_DIR}/NGArgumentParser.py", "src/core/NGArgumentParser.py", False),
             (f"{NGPARSER_DIR}/core_validators.py", "src/core/core_validators.py", False),
             (f"{NGPARSER_DIR}/result_writer.py", "src/core/result_writer.py", False),
+            (f"{NGPARSER_DIR}/anchors.py", "src/core/anchors.py", False),
+            (f"{NGPARSER_DIR}/job_descriptions.py", "src/core/job_descriptions.py", False),
+            (f"{NGPARSER_DIR}/job_export.py", "src/core/job_export.py", False),
+            (f"{NGPARSER_DIR}/job_runner.py", "src/core/job_runner.py", False),
+            (f"{NGPARSER_DIR}/timing.py", "src/core/timing.py", False),
+            (f"{NGPARSER_DIR}/parser_cache.py", "src/core/parser_cache.py", False),
             (f"{TEMPLATE_DIR}/set_pythonpath.py", "src/core/set_pythonpath.py", False),
             (f"{TEMPLATE_DIR}/configure.py", "src/core/configure.py", True),
             (f"{TEMPLATE_DIR}/build.sh", "scripts/core/build.sh", True),
+            (f"{NGPARSER_DIR}/build.py", "scripts/core/build.py", False),
             (f"{TEMPLATE_DIR}/Makefile", "Makefile", False),
         ]
 
@@ -1766,6 +1787,88 @@ def sync_command(args):
         return 1
 
 
+def export_jobs_command(args):
+    """Export a job descriptions file to scheduler backends (Slurm / make / GNU parallel)."""
+    from ngargparser import job_export
+
+    jd_file = Path(args.job_desc_file)
+    if not jd_file.is_file():
+        print(f"\033[91m✗\033[0m Job descriptions file not found: {jd_file}")
+        return 1
+
+    out_root = Path(args.output_dir) if args.output_dir else jd_file.parent / "export"
+    formats = job_export.EXPORT_FORMATS if args.format == "all" else (args.format,)
+    try:
+        for fmt in formats:
+            entry = job_export.export_jobs(
+                jd_file,
+                fmt,
+                out_root / fmt,
+                name=args.name,
+                command_prefix=args.command_prefix,
+                max_array_size=args.max_array_size,
+            )
+            print(f"\033[92m✓\033[0m {fmt}: \033[92m{entry}\033[0m")
+    except (ValueError, KeyError, OSError) as e:
+        print(f"\033[91m✗\033[0m Could not export {jd_file}: {e}")
+        return 1
+    return 0
+
+
+def run_jobs_command(args):
+    """Run a job descriptions file locally with timeouts, retries and a retry summary."""
+    from ngargparser import job_runner
+
+    jd_file = Path(args.job_desc_file)
+    if not jd_file.is_file():
+        print(f"\033[91m✗\033[0m Job descriptions file not found: {jd_file}")
+        return 1
+    try:
+        summary = job_runner.run_jobs(
+            jd_file,
+            max_cpus=args.jobs,
+            log_dir=args.log_dir,
+            command_prefix=args.command_prefix,
+            walltime_as_timeout=args.walltime_as_timeout,
+        )
+    except ValueError as e:
+        print(f"\033[91m✗\033[0m Could not run {jd_file}: {e}")
+        return 1
+
+    ok = not summary["failed"] and not summary["skipped"]
+    mark = "\033[92m✓\033[0m" if ok else "\033[91m✗\033[0m"
+    lines = job_runner.format_summary(summary)
+    print(f"{mark} {lines[0]}")
+    for line in lines[1:]:
+        print(f"  {line}")
+    return 0 if ok else 1
+
+
+def report_command(args):
+    """Summarize the timing sidecars under a run directory: slowest jobs and stages."""
+    import json
+
+    from ngargparser import timing
+
+    output_dir = Path(args.output_dir)
+    if not output_dir.is_dir():
+        print(f"\033[91m✗\033[0m Output directory not found: {output_dir}")
+        return 1
+    report = timing.load_report(output_dir, top=args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    if not report["sidecars"]:
+        print(
+            f"\033[91m✗\033[0m No timing sidecars (*{timing.SIDECAR_SUFFIX}) under {output_dir}. "
+            f"Re-run the jobs with {timing.TIMING_ENV_VAR}=1 to record them."
+        )
+        return 1
+    for line in timing.format_report(report):
+        print(line)
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description="NG Argument Parser Framework")
 
@@ -1855,6 +1958,75 @@ def main():
         help="Upgrade to the bleeding-edge tip of 'master' instead of the latest semver tag. Shortcut for --ref master.",
     )
 
+    # Create 'export-jobs' sub-command (job_descriptions.json -> scheduler backends)
+    export_parser = subparsers.add_parser(
+        "export-jobs",
+        aliases=["x"],
+        allow_abbrev=True,
+        help="Export job_descriptions.json as a Slurm job array, a make -j Makefile, or GNU parallel input.",
+    )
+    export_parser.add_argument("job_desc_file", help="Path to job_descriptions.json")
+    export_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["slurm", "make", "parallel", "all"],
+        default="all",
+        help="Backend to export (default: all). Each is written to <output-dir>/<format>/.",
+    )
+    export_parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="Where to write the exports (default: an 'export' directory next to the job descriptions file).",
+    )
+    export_parser.add_argument("--name", default="jobs", help="Job-name prefix for Slurm arrays (default: jobs).")
+    export_parser.add_argument(
+        "--command-prefix",
+        help="Prepended to every shell_cmd, e.g. 'python' or 'uv run python' when run_<tool>.py isn't executable.",
+    )
+    export_parser.add_argument(
+        "--max-array-size",
+        type=int,
+        default=1000,
+        help="Largest Slurm array to submit at once; bigger dependency levels are split (default: 1000).",
+    )
+
+    # Create 'run-jobs' sub-command (local DAG runner with timeouts/retries)
+    run_jobs_parser = subparsers.add_parser(
+        "run-jobs",
+        aliases=["r"],
+        allow_abbrev=True,
+        help="Run job_descriptions.json locally, honoring dependencies, timeouts and retries.",
+    )
+    run_jobs_parser.add_argument("job_desc_file", help="Path to job_descriptions.json")
+    run_jobs_parser.add_argument(
+        "-j", "--jobs", type=int, help="CPU slots to fill; jobs use their 'cpus' hint (default: all cores)."
+    )
+    run_jobs_parser.add_argument(
+        "--log-dir", help="Where per-attempt job logs go (default: job-logs/ next to the job descriptions file)."
+    )
+    run_jobs_parser.add_argument(
+        "--command-prefix",
+        help="Prepended to every shell_cmd, e.g. 'python' when run_<tool>.py isn't executable.",
+    )
+    run_jobs_parser.add_argument(
+        "--walltime-as-timeout",
+        action="store_true",
+        help="Kill jobs that outlive their walltime_s hint when they have no timeout_s.",
+    )
+
+    # Create 'report' sub-command (aggregate timing sidecars)
+    report_parser = subparsers.add_parser(
+        "report",
+        aliases=["t"],
+        allow_abbrev=True,
+        help="Summarize timing sidecars (NGARGPARSER_TIMING=1) under a run directory: slowest jobs and stages.",
+    )
+    report_parser.add_argument("output_dir", help="Run directory to scan for *.timing.json sidecars")
+    report_parser.add_argument(
+        "-n", "--top", type=int, default=10, help="How many of the slowest jobs to list (default: 10)."
+    )
+    report_parser.add_argument("--json", action="store_true", help="Print the aggregated report as JSON.")
+
     # Register the update notifier via atexit so it fires no matter how we exit —
     # including argparse's early exit on `--version` / `--help`, not just after a
     # full command. Registered before parse_args() so those early exits are covered.
@@ -1880,6 +2052,12 @@ def main():
         rc = sync_command(args) or 0
     elif args.command == "upgrade" or args.command == "u":
         rc = upgrade_command(args) or 0
+    elif args.command == "export-jobs" or args.command == "x":
+        rc = export_jobs_command(args) or 0
+    elif args.command == "run-jobs" or args.command == "r":
+        rc = run_jobs_command(args) or 0
+    elif args.command == "report" or args.command == "t":
+        rc = report_command(args) or 0
     else:
         parser.print_help()  # Print help message if no command is specified
         rc = 0
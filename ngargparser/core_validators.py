@@ -3,6 +3,7 @@
 # This file contains system-level validators that should not be changed by users
 
 import argparse
+import functools
 import os
 import re
 from pathlib import Path
@@ -16,6 +17,62 @@ dotenv.load_dotenv()
 APP_ROOT = os.getenv("APP_ROOT")
 APP_NAME = os.getenv("APP_NAME")
 
+# --assume-valid: trusted, machine-generated inputs (e.g. the predict units a
+# job DAG runs by the thousand) skip filesystem and schema checks.
+ASSUME_VALID_FLAG = "--assume-valid"
+ASSUME_VALID_ENV_VAR = "NGARGPARSER_ASSUME_VALID"
+_assume_valid = False
+
+
+def set_assume_valid(flag):
+    """Turn validation skipping on or off for this process (``NGArgumentParser.parse_args`` does this)."""
+    global _assume_valid
+    _assume_valid = bool(flag)
+
+
+def assume_valid():
+    """Whether validation is skipped: ``--assume-valid`` was given or ``NGARGPARSER_ASSUME_VALID`` is set."""
+    if _assume_valid:
+        return True
+    return os.environ.get(ASSUME_VALID_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def assume_valid_in_argv(argv):
+    """Whether ``argv`` passes ``--assume-valid``, or an abbreviation argparse accepts (``--assume``)."""
+    for arg in argv:
+        if arg == "--":
+            break
+        if len(arg) > 2 and ASSUME_VALID_FLAG.startswith(arg):
+            return True
+    return False
+
+
+def skip_if_assume_valid(validator=None, *, convert=Path):
+    """Decorator for ``type=`` validators: under ``--assume-valid`` return ``convert(value)`` unchecked.
+
+    Use it on tool validators in ``validators.py`` that stat files or parse
+    schemas::
+
+        @skip_if_assume_valid
+        def validate_input_tsv(path_str):
+            ...
+
+        @skip_if_assume_valid(convert=str)
+        def validate_allele(name):
+            ...
+    """
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(value):
+            if assume_valid():
+                return convert(value)
+            return func(value)
+
+        return wrapper
+
+    return decorate if validator is None else decorate(validator)
+
 
 def get_dependencies_from_paths(file_path="paths.py"):
     """
@@ -60,50 +117,29 @@ def get_dependencies_from_paths(file_path="paths.py"):
     return dependencies
 
 
-def create_directory_structure_for_dependencies(output_path, paths_file_path=None):
-    """
-    Read paths.py file, identify dependencies, and create the required directory
-    structure for each dependency tool under the specified output directory.
-    If no dependencies are found, create a default directory structure.
-
-    NEW LOGIC:
-    - If there are dependencies: Create structure inside each dependency folder + main tool folder
-    - If no dependencies: Create structure directly in output directory
-
-    Args:
-        output_path (str or Path): The output directory where tool structures will be created
-        paths_file_path (str or Path, optional): Path to the paths.py file. If None,
-                                               looks for paths.py in the same directory as this script
-
-    Returns:
-        dict: Dictionary with tool names as keys and their created directories as values
-    """
-    # Handle paths.py file location
-    if paths_file_path is None:
-        # Look for paths.py in the project root (2 levels up from core_validators.py)
-        paths_file = Path(APP_ROOT) / "paths.py"
-    else:
-        paths_file = Path(paths_file_path)
+# Directories preprocess lays out for each tool, relative to the tool's folder
+TOOL_SUBDIRS = ("predict-inputs/data", "predict-inputs/params", "predict-outputs", "aggregate")
+# The main tool (or the output directory itself) also gets a results folder
+MAIN_TOOL_SUBDIRS = TOOL_SUBDIRS + ("results",)
+# Defining alias for tool names
+TOOL_DIR_ALIASES = {"t_cell_class_i": "mhci", "t_cell_class_ii": "mhcii"}
 
-    # Output directory location
-    output_dir = Path(output_path)
+# Leaf directories this process has already created or found, so repeated
+# materialize_layout calls don't touch the filesystem again
+_materialized: set = set()
+# Layouts validate_preprocess_dir planned during the current parse, waiting to
+# be created once parsing has succeeded
+_planned_layouts: list = []
 
-    try:
-        with open(paths_file, "r") as file:
-            content = file.read()
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Could not find {paths_file}")
 
-    created_structures = {}
+def _dependency_tools(content):
+    """Tool names in paths.py ``content`` whose ``*_path`` is set, in file order."""
+    dependency_tools = []
 
     # More robust pattern to match tool sections
     # Split by triple quotes and process each section
     sections = re.split(r"'''\s*\[\s*([^\]]+)\s*\]\s*'''", content)[1:]  # Skip first empty part
 
-    # Check if we have any dependencies
-    has_dependencies = False
-    dependency_tools = []
-
     # Process sections in pairs (name, content)
     for i in range(0, len(sections), 2):
         if i + 1 < len(sections):
@@ -118,10 +154,14 @@ def create_directory_structure_for_dependencies(output_path, paths_file_path=Non
                 cleaned_value = value.strip().strip("'\"")
 
                 if cleaned_value and cleaned_value.lower() != "none":
-                    has_dependencies = True
                     dependency_tools.append(tool_name)
                     break  # Only need one valid path per tool
 
+    return dependency_tools
+
+
+def _current_app_name(paths_file_path=None):
+    """The app's name: APP_NAME from .env, else guessed from the cwd or file locations."""
     # Get the current app name - prefer APP_NAME from environment (.env),
     # then fall back to existing detection methods.
     curr_app_name = APP_NAME
@@ -156,93 +196,138 @@ def create_directory_structure_for_dependencies(output_path, paths_file_path=Non
     if not curr_app_name or curr_app_name == "src":
         curr_app_name = "app"  # Generic fallback
 
-    if has_dependencies:
-        # NEW LOGIC: Create structure inside each dependency folder + main tool folder
-        print(f"Found {len(dependency_tools)} dependencies: {', '.join(dependency_tools)}")
+    return curr_app_name
+
+
+def plan_output_layout(output_path, paths_file_path=None):
+    """
+    Work out the directory structure preprocess needs under ``output_path``
+    without creating anything. ``materialize_layout`` creates it.
+
+    - If there are dependencies: a structure inside each dependency folder + the main tool folder
+    - If no dependencies: the structure directly in the output directory
 
-        # Create structure for each dependency tool
-        for tool_name in dependency_tools:
-            # Convert tool name to lowercase and replace spaces with underscores for directory name
-            tool_dir_name = tool_name.lower().replace(" ", "_")
-
-            # Defining alias for tool names
-            if tool_dir_name == "t_cell_class_i":
-                tool_dir_name = "mhci"
-            elif tool_dir_name == "t_cell_class_ii":
-                tool_dir_name = "mhcii"
-
-            tool_path = output_dir / tool_dir_name
-
-            # Create the dependency tool directory
-            try:
-                tool_path.mkdir(parents=True, exist_ok=True)
-
-                # Create the standard structure inside each dependency folder
-                dep_directories = [
-                    tool_path / "predict-inputs" / "data",
-                    tool_path / "predict-inputs" / "params",
-                    tool_path / "predict-outputs",
-                    tool_path / "aggregate",
-                ]
-
-                created_dirs = []
-                for directory in dep_directories:
-                    try:
-                        directory.mkdir(parents=True, exist_ok=True)
-                        created_dirs.append(str(directory))
-                    except Exception as e:
-                        print(f"Error creating directory {directory}: {e}")
-
-                created_structures[tool_name] = created_dirs
-
-            except Exception as e:
-                print(f"Error creating directory {tool_path}: {e}")
-
-        # Create structure for the main tool (phbr in your example)
-        main_tool_directories = [
-            output_dir / curr_app_name / "predict-inputs" / "data",
-            output_dir / curr_app_name / "predict-inputs" / "params",
-            output_dir / curr_app_name / "predict-outputs",
-            output_dir / curr_app_name / "aggregate",
-            output_dir / curr_app_name / "results",  # Added results folder for main tool
-        ]
-
-        created_dirs = []
-        for directory in main_tool_directories:
-            try:
-                directory.mkdir(parents=True, exist_ok=True)
-                created_dirs.append(str(directory))
-            except Exception as e:
-                print(f"Error creating directory {directory}: {e}")
-
-        created_structures[curr_app_name] = created_dirs
+    Args:
+        output_path (str or Path): The output directory the structure goes under
+        paths_file_path (str or Path, optional): Path to the paths.py file. If None,
+                                               uses paths.py in APP_ROOT
 
+    Returns:
+        tuple: ``(layout, main_dir)``. ``layout`` maps tool names (``"default"`` without
+        dependencies) to their directories; ``main_dir`` is the folder whose
+        ``predict-inputs`` preprocess writes to.
+
+    Raises:
+        FileNotFoundError: If the paths.py file doesn't exist
+    """
+    # Handle paths.py file location
+    if paths_file_path is None:
+        # Look for paths.py in the project root (2 levels up from core_validators.py)
+        paths_file = Path(APP_ROOT) / "paths.py"
     else:
-        # If no dependencies were found, create default directory structure directly in output directory
-        print("No dependencies found, creating default structure")
+        paths_file = Path(paths_file_path)
+
+    # Output directory location
+    output_dir = Path(output_path)
+
+    try:
+        with open(paths_file, "r") as file:
+            content = file.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Could not find {paths_file}")
+
+    dependency_tools = _dependency_tools(content)
+    if not dependency_tools:
+        return {"default": [output_dir / sub for sub in MAIN_TOOL_SUBDIRS]}, output_dir
+
+    layout = {}
+    for tool_name in dependency_tools:
+        # Convert tool name to lowercase and replace spaces with underscores for directory name
+        tool_dir_name = tool_name.lower().replace(" ", "_")
+        tool_path = output_dir / TOOL_DIR_ALIASES.get(tool_dir_name, tool_dir_name)
+        layout[tool_name] = [tool_path / sub for sub in TOOL_SUBDIRS]
+
+    main_dir = output_dir / _current_app_name(paths_file_path)
+    layout[main_dir.name] = [main_dir / sub for sub in MAIN_TOOL_SUBDIRS]
+    return layout, main_dir
+
+
+def leaf_directories(layout):
+    """The directories in ``layout`` that aren't a parent of another one, sorted and deduplicated."""
+    dirs = sorted({os.path.normpath(d) for dirs in layout.values() for d in dirs})
+    ancestors: set = set()
+    for d in dirs:
+        parent = os.path.dirname(d)
+        while parent not in ancestors and parent != os.path.dirname(parent):
+            ancestors.add(parent)
+            parent = os.path.dirname(parent)
+    return [d for d in dirs if d not in ancestors]
+
+
+def layout_exists(layout):
+    """Whether every directory in ``layout`` already exists."""
+    return all(d in _materialized or os.path.isdir(d) for d in leaf_directories(layout))
+
+
+def materialize_layout(layout):
+    """Create the directories in ``layout`` in one pass.
+
+    Only leaf directories are passed to ``os.makedirs``, which creates their
+    parents; leaves created or found earlier in this process are skipped.
+
+    Args:
+        layout (dict): A layout from ``plan_output_layout``.
+
+    Returns:
+        list: The directories this call created (empty when the layout already existed).
 
-        directories = [
-            output_dir / "predict-inputs" / "data",
-            output_dir / "predict-inputs" / "params",
-            output_dir / "predict-outputs",
-            output_dir / "aggregate",
-            output_dir / "results",  # Added results folder for no-dependencies case
-        ]
+    Raises:
+        OSError: If a directory can't be created.
+    """
+    created = []
+    for leaf in leaf_directories(layout):
+        if leaf in _materialized:
+            continue
+        if not os.path.isdir(leaf):
+            os.makedirs(leaf, exist_ok=True)
+            created.append(leaf)
+        _materialized.add(leaf)
+    return created
 
-        # Create the directories
-        created_dirs = []
-        for directory in directories:
-            try:
-                directory.mkdir(parents=True, exist_ok=True)
-                created_dirs.append(str(directory))
-            except Exception as e:
-                print(f"Error creating directory {directory}: {e}")
 
-        created_structures["default"] = created_dirs
+def create_directory_structure_for_dependencies(output_path, paths_file_path=None):
+    """
+    Read paths.py file, identify dependencies, and create the required directory
+    structure for each dependency tool under the specified output directory.
+    If no dependencies are found, create a default directory structure.
 
-    return created_structures
+    This is ``plan_output_layout`` followed by ``materialize_layout``.
 
+    Args:
+        output_path (str or Path): The output directory where tool structures will be created
+        paths_file_path (str or Path, optional): Path to the paths.py file. If None,
+                                               looks for paths.py in APP_ROOT
 
+    Returns:
+        dict: Dictionary with tool names as keys and their created directories as values
+    """
+    layout, _ = plan_output_layout(output_path, paths_file_path)
+
+    if "default" in layout:
+        print("No dependencies found, creating default structure")
+    else:
+        dependency_tools = list(layout)[:-1]
+        print(f"Found {len(dependency_tools)} dependencies: {', '.join(dependency_tools)}")
+
+    try:
+        materialize_layout(layout)
+    except OSError as e:
+        print(f"Error creating directory {e.filename}: {e}")
+
+    return {tool_name: [str(d) for d in dirs] for tool_name, dirs in layout.items()}
+
+
+@skip_if_assume_valid
 def validate_file(path_str):
     """Validate that the given path is a file."""
     path = Path(path_str)
@@ -253,6 +338,7 @@ def validate_file(path_str):
     return path
 
 
+@skip_if_assume_valid
 def validate_directory(path_str):
     """Validate that the given path is a directory."""
     path = Path(path_str)
@@ -261,6 +347,7 @@ def validate_directory(path_str):
     return path
 
 
+@skip_if_assume_valid
 def validate_directory_given_filename(path_str):
     """Validate that the parent directory of the given path exists."""
     path = Path(path_str)
@@ -272,36 +359,30 @@ def validate_directory_given_filename(path_str):
 
 
 def validate_preprocess_dir(path_str):
-    """Validate preprocessing directory and create necessary structure."""
+    """Validate preprocessing directory and plan the structure preprocess needs under it.
+
+    Nothing is created here: argparse calls this while parsing, possibly before
+    another argument fails. ``NGArgumentParser.parse_args`` creates the planned
+    layout afterwards (see ``take_planned_layouts``). ``--assume-valid`` skips
+    the ``is_dir`` check, not the creation.
+    """
     path = Path(path_str)
-    if not path.is_dir():
+    if not assume_valid() and not path.is_dir():
         raise argparse.ArgumentTypeError(f"'{path_str}' is not a valid directory.")
 
-    # paths.py file
-    # paths_file = Path(__file__).resolve().parent / "paths.py"
     paths_file = path.resolve().parent / "paths.py"
-
     try:
-        # Get list of dependencies
-        deps = get_dependencies_from_paths(paths_file)
-        print(f"Found {len(deps)} dependencies:")
-        if deps:
-            for dep in deps:
-                print(f"- {dep}")
-        else:
-            print("- No dependencies found, creating default structure")
-
-        print(f"\nCreating directory structures under: {path}")
-        # Create directory structures for all dependencies under output directory
-        created = create_directory_structure_for_dependencies(path, paths_file)
-
-        print(f"\nSuccessfully created directory structures for {len(created)} tools:")
-        for tool_name, dirs in created.items():
-            print(f"\n{tool_name}:")
-            for dir_path in dirs:
-                print(f"  - {dir_path}")
-
+        layout, _ = plan_output_layout(path, paths_file)
     except FileNotFoundError as e:
         print(f"Error: {e}")
+    else:
+        _planned_layouts.append(layout)
 
     return path
+
+
+def take_planned_layouts():
+    """Return the layouts ``validate_preprocess_dir`` planned since the last call, and forget them."""
+    layouts = list(_planned_layouts)
+    _planned_layouts.clear()
+    return layouts
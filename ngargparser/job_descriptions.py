@@ -0,0 +1,496 @@
+"""
+Run manifests and job descriptions for ngargparser tools (framework-owned).
+
+This module is installed into each project as ``src/core/job_descriptions.py``
+and is refreshed by ``cli sync``. Do not edit it in a project — edit it in the
+ngargparser framework and re-sync.
+
+Preprocess splits the input into *units* (one parameter file per prediction
+job) and records every unit it writes in a ``RunManifest``::
+
+    from core.job_descriptions import RunManifest
+
+    manifest = RunManifest(output_dir)
+    for unit in units:
+        ...write param_file...
+        manifest.add_unit(param_file)
+    manifest.save()
+
+``NGArgumentParser.create_job_descriptions_file`` then builds
+``job_descriptions.json`` straight from ``<output_dir>/run_manifest.json``: one
+``prediction`` job per unit plus a final ``postprocess`` job depending on all
+of them. Prediction jobs are ordered longest-processing-time first (by
+``walltime_s`` hint, else record count, else size). Each job also gets a
+``priority`` (higher runs first), so the biggest units start early instead of
+becoming stragglers when slots are limited. Leftover files from earlier runs in the params
+directory are simply not in the manifest, so no ``stat()``/ctime grouping of
+the params directory is needed.
+
+Projects whose preprocess does not write a manifest yet keep working: the
+params directory is then grouped by file ctime, as before, and the newest group
+is used.
+
+``job_descriptions.json`` stays a JSON array, so ``json.load`` still reads it,
+but it is written as a stream with one compact job per line. A sidecar
+``job_descriptions.json.idx`` holds each job's byte offset (little-endian
+uint64, indexed by ``job_id``). For 100k-job runs, nothing holds the whole job
+list in memory:
+
+* ``iter_job_descriptions(path)`` yields jobs one line at a time.
+* ``get_job_description(path, job_id)`` seeks straight to one job.
+
+Both readers also accept older indented files, which they parse whole.
+
+Prediction jobs may carry optional resource hints (``RESOURCE_KEYS``:
+``cpus``, ``memory_mb``, ``walltime_s``). Preprocess supplies them per unit,
+either directly or through an estimator that sees the unit's size and record
+count::
+
+    def estimate(unit):
+        return {"cpus": 1, "memory_mb": 512 if unit["records"] < 10_000 else 2048}
+
+    manifest = RunManifest(output_dir, estimator=estimate)
+    manifest.add_unit(param_file, records=len(peptides))
+
+Scheduler exports (``core.job_export``) turn the hints into per-array Slurm
+requests. Estimators should return coarse buckets, since every distinct
+combination becomes its own array.
+
+A run-wide retry policy (``RETRY_POLICY_KEYS``: ``timeout_s``,
+``max_retries``, ``retry_backoff_s``) is stamped onto every job. Pass it as
+``RunManifest(output_dir, retry_policy={"timeout_s": 600, "max_retries": 2})``.
+The local runner (``core.job_runner``) enforces it.
+"""
+
+import json
+import os
+import struct
+import sys
+import uuid
+from array import array
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, TypedDict
+
+MANIFEST_FILENAME = "run_manifest.json"
+JOB_DESCRIPTIONS_FILENAME = "job_descriptions.json"
+INDEX_SUFFIX = ".idx"
+
+# Legacy (manifest-less) grouping: files created within this gap are one run.
+CTIME_GROUP_SECONDS = 0.1
+
+
+# Optional per-job resource hints, in the order schedulers are asked for them.
+RESOURCE_KEYS = ("cpus", "memory_mb", "walltime_s")
+
+
+class _RequiredJobDescriptionParams(TypedDict):
+    shell_cmd: str
+    job_id: int
+    job_type: str
+    depends_on_job_ids: List[int]
+    expected_outputs: List[str]
+
+
+# Optional per-job execution policy: kill after timeout_s, retry up to max_retries
+# times, waiting retry_backoff_s * 2**(attempt - 1) seconds before each retry.
+RETRY_POLICY_KEYS = ("timeout_s", "max_retries", "retry_backoff_s")
+
+
+class JobDescriptionParams(_RequiredJobDescriptionParams, total=False):
+    # Blueprint for creating job description file; resource hints, priority and
+    # retry policy are optional
+    cpus: int
+    memory_mb: int
+    walltime_s: int
+    priority: int
+    timeout_s: float
+    max_retries: int
+    retry_backoff_s: float
+
+
+def validate_resources(resources):
+    """Check a resource-hint dict: only ``RESOURCE_KEYS``, each a positive int.
+
+    Returns:
+        dict: The hints, minus keys whose value is None.
+
+    Raises:
+        ValueError: On an unknown key or a non-positive / non-integer value.
+    """
+    checked = {}
+    for key, value in (resources or {}).items():
+        if key not in RESOURCE_KEYS:
+            raise ValueError(f"Unknown resource hint '{key}'. Expected one of: {', '.join(RESOURCE_KEYS)}")
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+            raise ValueError(f"Resource hint '{key}' must be a positive integer, got {value!r}")
+        checked[key] = value
+    return checked
+
+
+def validate_retry_policy(policy):
+    """Check a retry policy: only ``RETRY_POLICY_KEYS``, with sane values.
+
+    ``timeout_s`` must be a positive number, ``max_retries`` a non-negative int
+    and ``retry_backoff_s`` a non-negative number.
+
+    Returns:
+        dict: The policy, minus keys whose value is None.
+
+    Raises:
+        ValueError: On an unknown key or an invalid value.
+    """
+    checked = {}
+    for key, value in (policy or {}).items():
+        if key not in RETRY_POLICY_KEYS:
+            raise ValueError(f"Unknown retry policy key '{key}'. Expected one of: {', '.join(RETRY_POLICY_KEYS)}")
+        if value is None:
+            continue
+        is_int = isinstance(value, int) and not isinstance(value, bool)
+        is_number = is_int or isinstance(value, float)
+        if (
+            (key == "timeout_s" and not (is_number and value > 0))
+            or (key == "max_retries" and not (is_int and value >= 0))
+            or (key == "retry_backoff_s" and not (is_number and value >= 0))
+        ):
+            raise ValueError(f"Invalid retry policy value for '{key}': {value!r}")
+        checked[key] = value
+    return checked
+
+
+def new_run_id():
+    """Return a unique, time-sortable id for one preprocess run."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"{stamp}-{uuid.uuid4().hex[:8]}"
+
+
+class RunManifest:
+    """The units written by one preprocess run.
+
+    Attributes:
+        output_dir (Path): Run output directory; the manifest is saved here.
+        run_id (str): Unique id of the run.
+        units (list): One ``{"param_file": <abs path>, "size": <bytes>}`` per unit,
+            in the order they were added, plus ``records`` and ``resources`` when known.
+        estimator (callable, optional): ``estimator(unit) -> dict`` of resource
+            hints, called for each unit as it is added.
+        retry_policy (dict): Run-wide timeout/retry policy stamped onto every job
+            (see ``validate_retry_policy``).
+    """
+
+    def __init__(self, output_dir, run_id=None, units=None, estimator=None, retry_policy=None):
+        self.output_dir = Path(output_dir)
+        self.run_id = run_id or new_run_id()
+        self.units = list(units or [])
+        self.estimator = estimator
+        self.retry_policy = validate_retry_policy(retry_policy)
+
+    @property
+    def path(self):
+        return self.output_dir / MANIFEST_FILENAME
+
+    def add_unit(self, param_file, size=None, records=None, resources=None):
+        """Record one parameter file written by preprocess.
+
+        Args:
+            param_file (str | Path): The unit's parameter file.
+            size (int, optional): Unit size in bytes. Defaults to the file's size,
+                read once while it is still hot in the page cache.
+            records (int, optional): Number of input records (sequences, rows, ...)
+                in the unit.
+            resources (dict, optional): Resource hints for this unit; they override
+                the estimator's.
+
+        Raises:
+            ValueError: If the resource hints are invalid (see ``validate_resources``).
+        """
+        param_file = os.path.abspath(param_file)
+        if size is None:
+            size = os.path.getsize(param_file)
+        unit = {"param_file": param_file, "size": size}
+        if records is not None:
+            unit["records"] = records
+        hints = dict(self.estimator(unit)) if self.estimator else {}
+        hints.update(resources or {})
+        hints = validate_resources(hints)
+        if hints:
+            unit["resources"] = hints
+        self.units.append(unit)
+
+    def save(self):
+        """Atomically write the manifest to ``<output_dir>/run_manifest.json``.
+
+        Returns:
+            Path: The manifest path.
+        """
+        data = {
+            "run_id": self.run_id,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "retry_policy": self.retry_policy,
+            "units": self.units,
+        }
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{MANIFEST_FILENAME}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+    @classmethod
+    def load(cls, output_dir):
+        """Read the manifest saved in ``output_dir``.
+
+        Returns:
+            RunManifest | None: The manifest, or None when the directory has none.
+        """
+        path = Path(output_dir) / MANIFEST_FILENAME
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        return cls(
+            output_dir,
+            run_id=data.get("run_id"),
+            units=data.get("units", []),
+            retry_policy=data.get("retry_policy"),
+        )
+
+
+def _units_from_ctime(params_dir):
+    """Legacy unit discovery: the newest ctime-group of files in ``params_dir``."""
+    files_with_ctime = []
+    for entry in os.scandir(params_dir):
+        if entry.is_file():
+            files_with_ctime.append((entry.path, entry.stat().st_ctime))
+    files_with_ctime.sort(key=lambda x: x[1])
+
+    newest_group: List[str] = []
+    previous_ctime = None
+    for path, ctime in files_with_ctime:
+        if previous_ctime is not None and ctime - previous_ctime > CTIME_GROUP_SECONDS:
+            newest_group = []
+        newest_group.append(path)
+        previous_ctime = ctime
+    return [{"param_file": path} for path in newest_group]
+
+
+def unit_cost(unit):
+    """Estimated processing cost of a unit, for longest-first ordering.
+
+    Compared as ``(walltime_s hint, records, size)``, so the best available
+    estimate decides and the rest only break ties.
+    """
+    return ((unit.get("resources") or {}).get("walltime_s", 0), unit.get("records", 0), unit.get("size", 0))
+
+
+def order_longest_first(units):
+    """Return ``units`` sorted by ``unit_cost``, largest first (stable for equal costs)."""
+    return sorted(units, key=unit_cost, reverse=True)
+
+
+def generate_job_descriptions(units, output_dir, exec_file_path, jd_path, retry_policy=None, assume_valid=True):
+    """Yield the jobs for ``units``: one prediction job each, then postprocess.
+
+    Args:
+        units (list): Unit dicts holding at least ``param_file``; their
+            ``resources`` hints are copied onto the prediction jobs.
+        output_dir (str | Path): Run output directory.
+        exec_file_path (str): The tool's ``run_<tool>.py``.
+        jd_path (str | Path): Where the job descriptions file will be written
+            (referenced by the postprocess command).
+        retry_policy (dict, optional): Timeout/retry policy copied onto every job.
+        assume_valid (bool): Pass ``--assume-valid`` to the prediction jobs; their
+            units were just written by preprocess, so predict needn't re-check them.
+
+    Yields:
+        JobDescriptionParams: The jobs, in ``job_id`` order. Prediction jobs get
+        descending priorities (the first unit the highest); postprocess, the
+        sink of the critical path, gets the highest of all.
+    """
+    n_units = len(units)
+    trusted = " --assume-valid" if assume_valid else ""
+    postprocess_id = 0
+    for i, unit in enumerate(units):
+        job: JobDescriptionParams = {
+            "shell_cmd": f"{exec_file_path} predict -j {unit['param_file']} -o {output_dir}/predict-outputs/result.{i} -f json{trusted}",
+            "job_id": i,
+            "job_type": "prediction",
+            "depends_on_job_ids": [],
+            "expected_outputs": [f"{output_dir}/predict-outputs/result.{i}.json"],
+        }
+        job.update(unit.get("resources") or {})
+        job["priority"] = n_units - i
+        job.update(retry_policy or {})
+        yield job
+        postprocess_id = i + 1
+
+    # Add command for postprocessing
+    postprocess_job: JobDescriptionParams = {
+        "shell_cmd": f"{exec_file_path} postprocess --job-desc-file={jd_path} -o {output_dir}/aggregate/final-result -f json",
+        "job_id": postprocess_id,
+        "job_type": "postprocess",
+        "depends_on_job_ids": list(range(postprocess_id)),
+        "expected_outputs": [f"{output_dir}/aggregate/final-result.json"],
+        "priority": n_units + 1,
+    }
+    postprocess_job.update(retry_policy or {})
+    yield postprocess_job
+
+
+def _index_path(jd_path):
+    return Path(f"{jd_path}{INDEX_SUFFIX}")
+
+
+def write_job_descriptions(jd_path, jobs):
+    """Stream ``jobs`` to ``jd_path`` and write its ``job_id`` offset index.
+
+    The file is a JSON array with one compact job per line; jobs are written
+    as they are produced, so ``jobs`` may be a generator.
+
+    Args:
+        jd_path (str | Path): Job descriptions file to write.
+        jobs (Iterable[JobDescriptionParams]): Jobs in ``job_id`` order (0, 1, ...).
+
+    Returns:
+        int: The number of jobs written.
+    """
+    offsets = array("Q")
+    with open(jd_path, "wb") as f:
+        f.write(b"[\n")
+        for job in jobs:
+            if offsets:
+                f.write(b",\n")
+            offsets.append(f.tell())
+            f.write(json.dumps(job, separators=(",", ":")).encode())
+        f.write(b"\n]\n")
+
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    with open(_index_path(jd_path), "wb") as f:
+        offsets.tofile(f)
+    return len(offsets)
+
+
+def _open_source(source):
+    """Open a path, or wrap an already-open file (e.g. ``argparse.FileType``) without closing it."""
+    if hasattr(source, "read"):
+        return nullcontext(source)
+    return open(source)
+
+
+def iter_job_descriptions(source):
+    """Yield the jobs of a job descriptions file one at a time.
+
+    Args:
+        source (str | Path | file): The file, as a path or an open text file.
+
+    Yields:
+        JobDescriptionParams: Each job, in file order.
+    """
+    with _open_source(source) as f:
+        streamed = f.readline().strip() == "["
+        if streamed:
+            line = f.readline().rstrip().rstrip(",")
+            try:
+                first_job = json.loads(line) if line != "]" else None
+            except json.JSONDecodeError:
+                streamed = False
+        if not streamed:
+            # Not one job per line (e.g. an older indented file): parse it whole
+            f.seek(0)
+            yield from json.load(f)
+            return
+
+        if first_job is not None:
+            yield first_job
+        for line in f:
+            line = line.rstrip().rstrip(",")
+            if line and line != "]":
+                yield json.loads(line)
+
+
+def get_job_description(source, job_id):
+    """Return one job by ``job_id``, seeking via the offset index when it is present.
+
+    Falls back to scanning the file when the index is missing or stale. An open
+    file is scanned from its current position unless it is a named file on
+    disk, whose index is used as for a path.
+
+    Args:
+        source (str | Path | file): The job descriptions file, as a path or an open file.
+        job_id (int): The job to fetch.
+
+    Returns:
+        JobDescriptionParams: The job.
+
+    Raises:
+        KeyError: If no job has that ``job_id``.
+    """
+    jd_path = source
+    if hasattr(source, "read"):
+        # <stdin>, a pipe or an in-memory file has no path to find an index next to
+        name = getattr(source, "name", None)
+        jd_path = name if isinstance(name, (str, os.PathLike)) and os.path.isfile(name) else None
+    if jd_path is not None and job_id >= 0:
+        try:
+            with open(_index_path(jd_path), "rb") as ix:
+                ix.seek(8 * job_id)
+                raw = ix.read(8)
+            if len(raw) == 8:
+                (offset,) = struct.unpack("<Q", raw)
+                with open(jd_path, "rb") as f:
+                    f.seek(offset)
+                    job = json.loads(f.readline().rstrip().rstrip(b","))
+                if isinstance(job, dict) and job.get("job_id") == job_id:
+                    return job
+        except (OSError, ValueError):
+            pass
+
+    for job in iter_job_descriptions(source):
+        if job["job_id"] == job_id:
+            return job
+    raise KeyError(job_id)
+
+
+def create_job_descriptions_file(output_dir, exec_file_path, params_dir=None, longest_first=True, assume_valid=True):
+    """Write ``<output_dir>/job_descriptions.json`` for the latest preprocess run.
+
+    Units come from ``<output_dir>/run_manifest.json``; without a manifest the
+    newest ctime-group of files in ``params_dir`` is used.
+
+    Args:
+        output_dir (str | Path): Run output directory.
+        exec_file_path (str): The tool's ``run_<tool>.py``.
+        params_dir (str | Path, optional): Parameter-unit directory, used only
+            when no manifest exists.
+        longest_first (bool): Order prediction jobs by ``unit_cost``, largest
+            first. False keeps manifest order.
+        assume_valid (bool): Pass ``--assume-valid`` to the prediction jobs.
+
+    Returns:
+        tuple[Path, int]: The file written and its number of jobs.
+
+    Raises:
+        FileNotFoundError: If there is neither a manifest nor a ``params_dir``.
+    """
+    manifest = RunManifest.load(output_dir)
+    retry_policy = None
+    if manifest is not None:
+        units = manifest.units
+        retry_policy = manifest.retry_policy
+    elif params_dir is not None:
+        units = _units_from_ctime(params_dir)
+    else:
+        raise FileNotFoundError(f"No {MANIFEST_FILENAME} in {output_dir} and no params directory given")
+
+    if longest_first:
+        units = order_longest_first(units)
+
+    jd_path = Path(output_dir) / JOB_DESCRIPTIONS_FILENAME
+    jobs = generate_job_descriptions(units, output_dir, exec_file_path, jd_path, retry_policy, assume_valid)
+    n_jobs = write_job_descriptions(jd_path, jobs)
+    return jd_path, n_jobs
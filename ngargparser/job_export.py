@@ -0,0 +1,250 @@
+"""
+Scheduler exports for job descriptions (framework-owned).
+
+This module is installed into each project as ``src/core/job_export.py`` and is
+refreshed by ``cli sync``. Do not edit it in a project — edit it in the
+ngargparser framework and re-sync.
+
+``export_jobs`` turns a ``job_descriptions.json`` into a ready-to-run backend,
+so the job DAG runs at full cluster or node parallelism without custom glue:
+
+* ``slurm``: one job array per dependency level and resource request
+  (``cpus``/``memory_mb``/``walltime_s`` hints), chunked to
+  ``max_array_size``, plus ``submit.sh``. It submits the arrays with
+  ``sbatch --parsable`` and chains each level on the previous one with
+  ``--dependency=afterok``.
+* ``make``: a ``Makefile`` whose targets are each job's first
+  ``expected_outputs`` entry, with prerequisites taken from
+  ``depends_on_job_ids``. Run it with ``make -j N``; re-running only redoes
+  missing outputs.
+* ``parallel``: one GNU parallel command file per dependency level, plus
+  ``run.sh``. It runs the levels in order with a ``--joblog`` per level, so
+  re-running resumes and retries only the failed jobs.
+
+Jobs are streamed from the file. Every job must come after the jobs it depends
+on, which is how ``create_job_descriptions_file`` writes them.
+"""
+
+import os
+import stat
+from pathlib import Path
+
+from .job_descriptions import RESOURCE_KEYS, iter_job_descriptions
+
+EXPORT_FORMATS = ("slurm", "make", "parallel")
+
+# Common Slurm MaxArraySize is 1001; larger levels are split into several arrays.
+DEFAULT_MAX_ARRAY_SIZE = 1000
+
+
+def _leveled_jobs(jobs):
+    """Yield ``(level, job)``: level 0 for jobs without dependencies, else 1 + the deepest dependency."""
+    levels = {}
+    for job in jobs:
+        try:
+            level = 1 + max((levels[dep] for dep in job.get("depends_on_job_ids") or []), default=-1)
+        except KeyError as e:
+            raise ValueError(f"Job {job['job_id']} depends on job {e.args[0]}, which is not listed before it") from e
+        levels[job["job_id"]] = level
+        yield level, job
+
+
+def _command(job, command_prefix):
+    cmd = job["shell_cmd"]
+    if "\n" in cmd:
+        raise ValueError(f"Job {job['job_id']} has a multi-line shell_cmd; scheduler exports need one line per job")
+    return f"{command_prefix} {cmd}" if command_prefix else cmd
+
+
+def _write_level_command_files(jobs, out_dir, command_prefix, group_key=None):
+    """Write ``<stem>.cmds`` files (one command per line) per dependency level and group.
+
+    Jobs in a level are split by ``group_key(job)``. The first group of level
+    ``n`` is named ``level-<n>``, and later groups ``level-<n>-<g>``.
+
+    Returns:
+        list: One ``[[stem, key, count], ...]`` list per level.
+    """
+    handles = {}
+    levels = []
+    try:
+        for level, job in _leveled_jobs(jobs):
+            key = group_key(job) if group_key else None
+            while len(levels) <= level:
+                levels.append([])
+            if (level, key) not in handles:
+                group = len(levels[level])
+                stem = f"level-{level}" if group == 0 else f"level-{level}-{group}"
+                handles[(level, key)] = (open(out_dir / f"{stem}.cmds", "w"), group)
+                levels[level].append([stem, key, 0])
+            handle, group = handles[(level, key)]
+            handle.write(_command(job, command_prefix) + "\n")
+            levels[level][group][2] += 1
+    finally:
+        for handle, _ in handles.values():
+            handle.close()
+    return levels
+
+
+def _resource_key(job):
+    return tuple(job.get(key) for key in RESOURCE_KEYS)
+
+
+def _slurm_resource_directives(key):
+    """``#SBATCH`` lines for a ``(cpus, memory_mb, walltime_s)`` resource key."""
+    cpus, memory_mb, walltime_s = key
+    directives = []
+    if cpus:
+        directives.append(f"#SBATCH --cpus-per-task={cpus}")
+    if memory_mb:
+        directives.append(f"#SBATCH --mem={memory_mb}M")
+    if walltime_s:
+        minutes, seconds = divmod(walltime_s, 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        directives.append(f"#SBATCH --time={days}-{hours:02d}:{minutes:02d}:{seconds:02d}")
+    return directives
+
+
+def _write_script(path, lines):
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def export_slurm(jobs, out_dir, name="jobs", command_prefix=None, max_array_size=DEFAULT_MAX_ARRAY_SIZE):
+    """Write Slurm job-array scripts and a dependency-chained ``submit.sh``.
+
+    Returns:
+        Path: The ``submit.sh`` to run on the submit host.
+    """
+    levels = _write_level_command_files(jobs, out_dir, command_prefix, group_key=_resource_key)
+    (out_dir / "logs").mkdir(exist_ok=True)
+
+    lines = [
+        "#!/bin/bash",
+        "# Submit the job DAG as Slurm job arrays, one dependency level at a time.",
+        "set -euo pipefail",
+        'cd "$(dirname "$0")"',
+        'dep=""',
+    ]
+    for level, groups in enumerate(levels):
+        lines.append('ids=""')
+        for stem, key, count in groups:
+            _write_script(
+                out_dir / f"{stem}.sbatch",
+                [
+                    "#!/bin/bash",
+                    f"#SBATCH --job-name={name}-L{level}",
+                    "#SBATCH --output=logs/%x-%A_%a.out",
+                    *_slurm_resource_directives(key),
+                    "set -euo pipefail",
+                    "line=$(( ${JOB_OFFSET:-0} + SLURM_ARRAY_TASK_ID + 1 ))",
+                    f'cmd=$(sed -n "${{line}}p" {stem}.cmds)',
+                    'eval "$cmd"',
+                ],
+            )
+            for start in range(0, count, max_array_size):
+                size = min(max_array_size, count - start)
+                lines.append(
+                    f"id=$(sbatch --parsable ${{dep:+--dependency=afterok:$dep}} --array=0-{size - 1} "
+                    f"--export=ALL,JOB_OFFSET={start} {stem}.sbatch)"
+                )
+                lines.append('ids="${ids:+$ids:}${id%%;*}"')
+        lines.append('dep="$ids"')
+        lines.append(f'echo "level {level}: {sum(group[2] for group in groups)} job(s) -> $ids"')
+
+    submit = out_dir / "submit.sh"
+    _write_script(submit, lines)
+    return submit
+
+
+def export_parallel(jobs, out_dir, command_prefix=None):
+    """Write GNU parallel command files and a level-by-level, resumable ``run.sh``.
+
+    Returns:
+        Path: The ``run.sh`` to run (``JOBS=N ./run.sh`` caps concurrency).
+    """
+    levels = _write_level_command_files(jobs, out_dir, command_prefix)
+    lines = [
+        "#!/bin/bash",
+        "# Run the job DAG with GNU parallel, one dependency level at a time.",
+        "# Re-running resumes: jobs that succeeded in a level's joblog are skipped.",
+        "set -euo pipefail",
+        'cd "$(dirname "$0")"',
+    ]
+    for level in range(len(levels)):
+        lines.append(
+            f'parallel --jobs "${{JOBS:-100%}}" --joblog level-{level}.joblog --resume-failed '
+            f"--halt soon,fail=1 :::: level-{level}.cmds"
+        )
+    run = out_dir / "run.sh"
+    _write_script(run, lines)
+    return run
+
+
+def _make_escape(text):
+    return text.replace("$", "$$")
+
+
+def export_make(jobs, out_dir, command_prefix=None):
+    """Write a ``Makefile`` with one rule per job, targeting its first expected output.
+
+    Jobs without ``expected_outputs`` get a ``.jobs/<job_id>.done`` stamp target.
+
+    Returns:
+        Path: The ``Makefile`` (run with ``make -f <path> -j N``).
+    """
+    targets = {}
+    depended_on = set()
+    makefile = out_dir / "Makefile"
+    with open(makefile, "w") as f:
+        f.write("# Generated by ngargparser from job_descriptions.json. Run with: make -j N\n")
+        f.write("SHELL := /bin/bash\n.DEFAULT_GOAL := all\n.DELETE_ON_ERROR:\n")
+        for _, job in _leveled_jobs(jobs):
+            job_id = job["job_id"]
+            outputs = job.get("expected_outputs") or []
+            target = outputs[0] if outputs else f"{out_dir}/.jobs/{job_id}.done"
+            deps = job.get("depends_on_job_ids") or []
+            depended_on.update(deps)
+            targets[job_id] = target
+            prerequisites = "".join(f" {targets[dep]}" for dep in deps)
+            f.write(f"\n{target}:{prerequisites}\n")
+            f.write("\t@mkdir -p $(@D)\n")
+            f.write(f"\t{_make_escape(_command(job, command_prefix))}\n")
+            if not outputs:
+                f.write("\t@touch $@\n")
+        sinks = [target for job_id, target in targets.items() if job_id not in depended_on]
+        f.write(f"\n.PHONY: all\nall: {' '.join(sinks)}\n")
+    return makefile
+
+
+def export_jobs(jd_file, fmt, out_dir, name="jobs", command_prefix=None, max_array_size=DEFAULT_MAX_ARRAY_SIZE):
+    """Export a job descriptions file to one scheduler backend.
+
+    Args:
+        jd_file (str | Path): The ``job_descriptions.json`` to export.
+        fmt (str): One of ``EXPORT_FORMATS``.
+        out_dir (str | Path): Directory to write the backend into (created if needed).
+        name (str): Job-name prefix (Slurm).
+        command_prefix (str, optional): Prepended to every ``shell_cmd``, e.g.
+            ``"python"`` when ``run_<tool>.py`` is not executable.
+        max_array_size (int): Largest Slurm array to submit at once.
+
+    Returns:
+        Path: The entry point to run (``submit.sh``, ``Makefile`` or ``run.sh``).
+
+    Raises:
+        ValueError: On an unknown format, a job listed before its dependencies,
+            or a multi-line ``shell_cmd``.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(EXPORT_FORMATS)}")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = iter_job_descriptions(jd_file)
+    if fmt == "slurm":
+        return export_slurm(jobs, out_dir, name, command_prefix, max_array_size)
+    if fmt == "parallel":
+        return export_parallel(jobs, out_dir, command_prefix)
+    return export_make(jobs, out_dir, command_prefix)
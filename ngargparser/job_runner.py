@@ -0,0 +1,237 @@
+"""
+Local job runner for job descriptions (framework-owned).
+
+This module is installed into each project as ``src/core/job_runner.py`` and is
+refreshed by ``cli sync``. Do not edit it in a project — edit it in the
+ngargparser framework and re-sync.
+
+``run_jobs`` executes a ``job_descriptions.json`` on the local machine:
+
+* A job starts once every job in its ``depends_on_job_ids`` has succeeded.
+  Ready jobs start highest ``priority`` first, and each job takes ``cpus``
+  slots (default 1) out of ``max_cpus``.
+* A job running longer than ``timeout_s`` has its whole process group killed
+  (SIGTERM, then SIGKILL after ``KILL_GRACE_S``). A ``walltime_s`` hint is
+  only a scheduling hint; pass ``walltime_as_timeout=True``
+  (``cli run-jobs --walltime-as-timeout``) to enforce it when ``timeout_s``
+  is unset.
+* A failed or timed-out job is re-queued up to ``max_retries`` times, waiting
+  ``retry_backoff_s * 2**(attempt - 1)`` seconds before each retry.
+* If the runner itself stops (an exception or Ctrl-C), every job still
+  running has its process group killed the same way before the error
+  propagates.
+* A job that exhausts its retries fails. Its dependents are skipped instead
+  of waiting forever, so one hung predict can't block postprocess indefinitely.
+
+Each attempt's output goes to ``<log_dir>/job-<id>.<attempt>.log``. The
+returned summary counts successes, failures, skips, retries and timeouts;
+``format_summary`` renders it for the end of a run.
+"""
+
+import heapq
+import os
+import signal
+import subprocess
+import time
+from pathlib import Path
+
+from .job_descriptions import iter_job_descriptions
+
+# Seconds between SIGTERM and SIGKILL for a timed-out job.
+KILL_GRACE_S = 5.0
+
+# Seconds between polls of running jobs.
+POLL_INTERVAL_S = 0.05
+
+
+def _kill_group(proc, sig):
+    try:
+        os.killpg(proc.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def _blocked_by_cycle(waiting_on, dependents):
+    """Sorted ids of the jobs that never become ready: those in a dependency cycle and their dependents."""
+    remaining = {job_id: len(deps) for job_id, deps in waiting_on.items()}
+    stack = [job_id for job_id, count in remaining.items() if not count]
+    while stack:
+        for dependent in dependents[stack.pop()]:
+            remaining[dependent] -= 1
+            if not remaining[dependent]:
+                stack.append(dependent)
+    return sorted(job_id for job_id, count in remaining.items() if count)
+
+
+def _stop_all(running):
+    """Kill the process group of every job in ``running`` and close its log."""
+    procs = [state[0] for state in running.values()]
+    for proc in procs:
+        _kill_group(proc, signal.SIGTERM)
+    kill_at = time.monotonic() + KILL_GRACE_S
+    for proc in procs:
+        try:
+            proc.wait(max(0.0, kill_at - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            _kill_group(proc, signal.SIGKILL)
+            proc.wait()
+    for state in running.values():
+        state[1].close()
+    running.clear()
+
+
+def run_jobs(jd_file, max_cpus=None, log_dir=None, command_prefix=None, walltime_as_timeout=False, echo=print):
+    """Run every job in ``jd_file`` locally, honoring dependencies and retry policy.
+
+    Args:
+        jd_file (str | Path): The ``job_descriptions.json`` to run.
+        max_cpus (int, optional): CPU slots to fill (default: ``os.cpu_count()``).
+        log_dir (str | Path, optional): Where attempt logs go (default: a
+            ``job-logs`` directory next to ``jd_file``).
+        command_prefix (str, optional): Prepended to every ``shell_cmd``, e.g. ``"python"``.
+        walltime_as_timeout (bool): Enforce a job's ``walltime_s`` hint as its
+            timeout when it has no ``timeout_s``.
+        echo (callable): Progress printer; pass ``lambda *_: None`` to silence.
+
+    Returns:
+        dict: Run summary with ``succeeded``/``failed``/``skipped`` job-id lists,
+        ``retries`` (``{job_id: extra attempts}``), ``timeouts`` (count),
+        ``attempts`` (total) and ``elapsed_s``.
+
+    Raises:
+        ValueError: If a job depends on an unknown job id, or on a dependency cycle.
+    """
+    started = time.monotonic()
+    max_cpus = max(1, max_cpus or os.cpu_count() or 1)
+    log_dir = Path(log_dir) if log_dir else Path(jd_file).parent / "job-logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = {job["job_id"]: job for job in iter_job_descriptions(jd_file)}
+    waiting_on = {}
+    dependents = {job_id: [] for job_id in jobs}
+    for job_id, job in jobs.items():
+        deps = set(job.get("depends_on_job_ids") or [])
+        unknown = deps - jobs.keys()
+        if unknown:
+            raise ValueError(f"Job {job_id} depends on unknown job(s): {sorted(unknown)}")
+        waiting_on[job_id] = deps
+        for dep in deps:
+            dependents[dep].append(job_id)
+    blocked = _blocked_by_cycle(waiting_on, dependents)
+    if blocked:
+        raise ValueError(f"Job(s) in or behind a dependency cycle can never start: {blocked}")
+
+    ready = []  # heap of (-priority, job_id)
+    delayed = []  # heap of (ready_at, job_id) for jobs backing off before a retry
+    running = {}  # job_id -> [proc, log handle, deadline, kill_at, cpus]
+    attempts = {job_id: 0 for job_id in jobs}
+    summary = {"succeeded": [], "failed": [], "skipped": [], "retries": {}, "timeouts": 0}
+    skipped = set()
+    free_cpus = max_cpus
+
+    def timeout_of(job):
+        return job.get("timeout_s") or (job.get("walltime_s") if walltime_as_timeout else None)
+
+    def push_ready(job_id):
+        heapq.heappush(ready, (-jobs[job_id].get("priority", 0), job_id))
+
+    def skip_dependents(job_id):
+        stack = list(dependents[job_id])
+        while stack:
+            dependent = stack.pop()
+            if dependent in skipped:
+                continue
+            skipped.add(dependent)
+            stack.extend(dependents[dependent])
+
+    def finish(job_id, ok, reason):
+        job = jobs[job_id]
+        if ok:
+            summary["succeeded"].append(job_id)
+            for dependent in dependents[job_id]:
+                waiting_on[dependent].discard(job_id)
+                if not waiting_on[dependent]:
+                    push_ready(dependent)
+            return
+        max_retries = job.get("max_retries", 0)
+        if attempts[job_id] <= max_retries:
+            delay = job.get("retry_backoff_s", 0) * 2 ** (attempts[job_id] - 1)
+            summary["retries"][job_id] = summary["retries"].get(job_id, 0) + 1
+            echo(f"  job {job_id}: {reason}; retrying in {delay:g}s ({attempts[job_id]}/{max_retries + 1})")
+            heapq.heappush(delayed, (time.monotonic() + delay, job_id))
+            return
+        echo(f"  job {job_id}: {reason}; giving up after {attempts[job_id]} attempt(s)")
+        summary["failed"].append(job_id)
+        skip_dependents(job_id)
+
+    for job_id, deps in waiting_on.items():
+        if not deps:
+            push_ready(job_id)
+
+    try:
+        while ready or delayed or running:
+            now = time.monotonic()
+            while delayed and delayed[0][0] <= now:
+                push_ready(heapq.heappop(delayed)[1])
+
+            # Start ready jobs, highest priority first, while their cpus fit. When the
+            # next job doesn't fit, nothing behind it starts either, so lower-priority
+            # jobs can't keep taking the slots it waits for. A job asking for more
+            # than max_cpus runs alone.
+            while ready and free_cpus > 0:
+                job_id = ready[0][1]
+                job = jobs[job_id]
+                cpus = min(job.get("cpus") or 1, max_cpus)
+                if cpus > free_cpus:
+                    break
+                heapq.heappop(ready)
+                attempts[job_id] += 1
+                cmd = f"{command_prefix} {job['shell_cmd']}" if command_prefix else job["shell_cmd"]
+                log = open(log_dir / f"job-{job_id}.{attempts[job_id]}.log", "w")
+                proc = subprocess.Popen(cmd, shell=True, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+                timeout = timeout_of(job)
+                running[job_id] = [proc, log, now + timeout if timeout else None, None, cpus]
+                free_cpus -= cpus
+
+            for job_id, state in list(running.items()):
+                proc, log, deadline, kill_at, cpus = state
+                returncode = proc.poll()
+                if returncode is None:
+                    if kill_at is not None and now >= kill_at:
+                        _kill_group(proc, signal.SIGKILL)
+                    elif kill_at is None and deadline is not None and now >= deadline:
+                        _kill_group(proc, signal.SIGTERM)
+                        state[3] = now + KILL_GRACE_S
+                    continue
+                log.close()
+                del running[job_id]
+                free_cpus += cpus
+                if kill_at is not None:
+                    summary["timeouts"] += 1
+                    finish(job_id, False, f"timed out after {timeout_of(jobs[job_id])}s")
+                else:
+                    finish(job_id, returncode == 0, f"exited with status {returncode}")
+
+            if running or delayed:
+                time.sleep(POLL_INTERVAL_S)
+    finally:
+        _stop_all(running)
+
+    summary["skipped"] = sorted(skipped)
+    summary["attempts"] = sum(attempts.values())
+    summary["elapsed_s"] = time.monotonic() - started
+    return summary
+
+
+def format_summary(summary):
+    """Render a ``run_jobs`` summary as printable lines."""
+    total = len(summary["succeeded"]) + len(summary["failed"]) + len(summary["skipped"])
+    lines = [
+        f"Ran {total} job(s) in {summary['elapsed_s']:.1f}s: {len(summary['succeeded'])} succeeded, "
+        f"{len(summary['failed'])} failed, {len(summary['skipped'])} skipped",
+        f"Retries: {len(summary['retries'])} job(s) retried ({sum(summary['retries'].values())} extra attempt(s)), "
+        f"{summary['timeouts']} timeout(s)",
+    ]
+    if summary["failed"]:
+        lines.append(f"Failed jobs: {', '.join(str(job_id) for job_id in sorted(summary['failed']))}")
+    return lines
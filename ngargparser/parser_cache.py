@@ -0,0 +1,170 @@
+"""
+Parser spec cache for ngargparser tools (framework-owned).
+
+This module is installed into each project as ``src/core/parser_cache.py`` and is
+refreshed by ``cli sync``. Do not edit it in a project — edit it in the
+ngargparser framework and re-sync.
+
+Building an ``NGArgumentParser`` subclass runs every ``add_argument``,
+``update_arguments`` and ``set_subcommand_order`` call on each invocation, and
+each predict job in a run pays for it. ``load_or_build`` pickles the finished
+parser the first time and unpickles it on later runs, which takes a fraction of
+the time::
+
+    parser = MyAppArgumentParser.cached()   # instead of MyAppArgumentParser()
+
+The pickle lives in ``__pycache__`` next to the parser's module. Its name
+includes a key built from the name, size and mtime of every ``.py`` file in
+the directories that define the parser's classes, plus the Python version and
+the script name. Editing the parser, ``validators.py`` or any ``core`` file
+therefore builds a fresh parser. ``--help`` always builds from scratch, and an
+unreadable or stale cache silently falls back to a full build.
+
+Caching is opt-in: generated entry points call the plain constructor. Only
+switch to ``cached()`` when the parser's ``__init__`` is deterministic, i.e. it
+doesn't read environment variables, ``.env``/config files or the clock — a
+stale pickle would otherwise silently keep an old parser. Set
+``NGARGPARSER_PARSER_CACHE=0`` to turn the cache off.
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import pickle
+import sys
+import types
+from pathlib import Path
+
+CACHE_ENV_VAR = "NGARGPARSER_PARSER_CACHE"
+CACHE_DIRNAME = "__pycache__"
+HELP_FLAGS = ("-h", "--help")
+
+
+def enabled():
+    """Whether ``NGARGPARSER_PARSER_CACHE`` leaves the cache on (the default)."""
+    return os.environ.get(CACHE_ENV_VAR, "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _argparse_identity(string):
+    """Stands in for argparse's default ``type`` converter, a local (unpicklable) function."""
+    return string
+
+
+class _Pickler(pickle.Pickler):
+    # argparse compares SUPPRESS by identity, so it must unpickle as the same object.
+    def persistent_id(self, obj):
+        if obj is argparse.SUPPRESS:
+            return "SUPPRESS"
+        if isinstance(obj, types.FunctionType) and obj.__module__ == "argparse" and obj.__name__ == "identity":
+            return "identity"
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        if pid == "SUPPRESS":
+            return argparse.SUPPRESS
+        if pid == "identity":
+            return _argparse_identity
+        raise pickle.UnpicklingError(f"unknown persistent id {pid!r}")
+
+
+def dumps(parser):
+    """Pickle a fully built parser."""
+    buffer = io.BytesIO()
+    _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(parser)
+    return buffer.getvalue()
+
+
+def loads(data):
+    """Unpickle a parser written by ``dumps``."""
+    return _Unpickler(io.BytesIO(data)).load()
+
+
+def _source_dirs(cls):
+    dirs = []
+    for klass in cls.__mro__:
+        module = sys.modules.get(klass.__module__)
+        path = getattr(module, "__file__", None)
+        if not path or klass.__module__ == "argparse":
+            continue
+        parent = os.path.dirname(os.path.abspath(path))
+        if parent not in dirs:
+            dirs.append(parent)
+    return dirs
+
+
+def cache_key(cls):
+    """Key for ``cls``'s cached parser; it changes when any source file next to its classes changes."""
+    digest = hashlib.sha256()
+    digest.update(f"{cls.__module__}.{cls.__qualname__}\0{sys.version}\0{argparse.__file__}\0".encode())
+    digest.update(os.path.basename(sys.argv[0] if sys.argv else "").encode())
+    for directory in _source_dirs(cls):
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.name.endswith(".py"):
+                    st = entry.stat()
+                    digest.update(f"\0{directory}/{entry.name}:{st.st_size}:{st.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def cache_path(cls, cache_dir=None):
+    """Where ``cls``'s cached parser lives for the current sources."""
+    if cache_dir is None:
+        cache_dir = Path(_source_dirs(cls)[0]) / CACHE_DIRNAME
+    return Path(cache_dir) / f"{cls.__name__}.parser-{cache_key(cls)}.pickle"
+
+
+def _save(parser, path):
+    """Write the pickle atomically and drop this class's older caches. Failures are ignored."""
+    # A read-only install would pay for pickling on every run, only to fail writing
+    writable = path.parent if path.parent.is_dir() else path.parent.parent
+    if not os.access(writable, os.W_OK):
+        return
+    try:
+        data = dumps(parser)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        for stale in path.parent.glob(f"{type(parser).__name__}.parser-*.pickle"):
+            if stale != path:
+                stale.unlink()
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        # Read-only install or an unpicklable argument (e.g. a lambda type): just don't cache.
+        pass
+
+
+def load_or_build(cls, argv=None, cache_dir=None):
+    """Return a ``cls`` parser, unpickled from the cache when possible.
+
+    Args:
+        cls (type): The parser class; ``cls()`` must take no arguments.
+        argv (list, optional): Arguments about to be parsed (default:
+            ``sys.argv[1:]``). Asking for ``--help`` always builds from scratch.
+        cache_dir (str | Path, optional): Cache directory (default: ``__pycache__``
+            next to ``cls``'s module).
+
+    Returns:
+        argparse.ArgumentParser: A ready ``cls`` instance.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not enabled() or any(arg in HELP_FLAGS for arg in argv):
+        return cls()
+    try:
+        path = cache_path(cls, cache_dir)
+    except OSError:
+        return cls()
+    try:
+        parser = loads(path.read_bytes())
+        if type(parser) is cls:
+            return parser
+    except FileNotFoundError:
+        pass
+    except Exception:
+        # A truncated or stale pickle (e.g. a renamed validator): rebuild it below.
+        pass
+    parser = cls()
+    _save(parser, path)
+    return parser
@@ -44,6 +44,8 @@ import json
 import sys
 from pathlib import Path
 
+from .timing import stage
+
 
 def _tables(result):
     """Yield ``(table_type, columns, rows)`` for each table in the envelope."""
@@ -76,6 +78,7 @@ def _write_text(path, text):
     path.write_text(text)
 
 
+@stage("write_results")
 def write_results(result, output_prefix=None, output_format="tsv"):
     """Serialize a standard result envelope to stdout or file(s).
 
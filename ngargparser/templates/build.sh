@@ -9,12 +9,22 @@
 
 # Parse command line arguments
 PROGRESS_MODE=false
+INCREMENTAL=false
+PROFILE_MODE=false
 for arg in "$@"; do
     case $arg in
         --progress|-p)
             PROGRESS_MODE=true
             shift
             ;;
+        --incremental|-i)
+            INCREMENTAL=true
+            shift
+            ;;
+        --profile)
+            PROFILE_MODE=true
+            shift
+            ;;
     esac
 done
 
@@ -23,8 +33,10 @@ TOTAL_STEPS=8
 CURRENT_STEP=0
 PROGRESS_BAR_WIDTH=40
 
-# Function to show progress bar
+# Function to show progress bar. $2 names the step that starts here in
+# build-profile.json (--profile); the step runs until the next one starts.
 show_progress() {
+    [ -n "${2:-}" ] && profile_mark "$2" "${3:-}"
     if [ "$PROGRESS_MODE" = true ]; then
         local message="$1"
         CURRENT_STEP=$((CURRENT_STEP + 1))
@@ -47,6 +59,28 @@ show_progress() {
     fi
 }
 
+# --profile: record that build step $1 starts now, after counting the files
+# and bytes in directory $2 if given (build.py profile-write turns the marks
+# into build-profile.json; the counting time is left out of every step).
+# bash 5 has a clock built in; older bashes ask python, which adds its startup
+# time to the steps.
+PROFILE_LOG=""
+profile_now() {
+    local now="${EPOCHREALTIME:-}"
+    [ -z "$now" ] && now="$("$PYTHON" -c 'import time; print(time.time())')"
+    echo "${now/,/.}"
+}
+profile_mark() {
+    if [ "$PROFILE_MODE" = true ]; then
+        local start
+        start="$(profile_now)"
+        if [ -n "${2:-}" ]; then
+            "$PYTHON" "$BUILD_PY" tree-stats --log "$PROFILE_LOG" "$1" "$2"
+        fi
+        printf '{"name": "%s", "start": %s, "time": %s}\n' "$1" "$start" "$(profile_now)" >> "$PROFILE_LOG"
+    fi
+}
+
 # Function for verbose logging (only prints in non-progress mode)
 log_verbose() {
     if [ "$PROGRESS_MODE" != true ]; then
@@ -88,12 +122,33 @@ fi
 # The caller's environment must not redirect our git calls into another repo.
 unset GIT_DIR GIT_WORK_TREE GIT_INDEX_FILE
 
+# The staging engine (scripts/core/build.py, framework-owned) only needs the
+# standard library of any python3. Set PYTHON to pick a different interpreter.
+PYTHON="${PYTHON:-python3}"
+BUILD_PY="$BUILD_SH_DIR/build.py"
+if ! command -v "$PYTHON" >/dev/null 2>&1; then
+    echo "ERROR: '$PYTHON' is required to build (scripts/core/build.py stages the tree). Install python3 or set PYTHON and retry." >&2
+    exit 1
+fi
+BUILD_PY_ARGS=()
+[ "$PROGRESS_MODE" != true ] && BUILD_PY_ARGS+=(--verbose)
+if [ "$PROFILE_MODE" = true ]; then
+    PROFILE_LOG="$(mktemp "${TMPDIR:-/tmp}/ngbuild-profile.XXXXXX")"
+fi
+
 # Initialize all build.conf-overridable variables to empty, source build.conf if present,
 # then apply defaults. This lets per-project build.conf override anything below without
 # touching build.sh (which is framework-owned and gets overwritten by `cli sync`).
 TOOL_NAME=""
 EXCLUDE_FROM_BUILD_SYMLINK=""
 TARBALL_PREFIX=""
+TARBALL_COMPRESSION=""
+STAGE_COPY_MODE=""
+HOOK_MODIFIES=""
+HOOK_STEPS=""
+HOOK_JOBS=""
+# May also come from the environment (e.g. a CI cache path shared across jobs)
+ARTIFACT_CACHE_DIR="${ARTIFACT_CACHE_DIR:-}"
 if [ -f "$SRC_DIR/build.conf" ]; then
     # shellcheck source=build.conf
     source "$SRC_DIR/build.conf"
@@ -102,6 +157,9 @@ fi
 # Apply defaults when not set by build.conf
 [ -z "$TOOL_NAME" ] && TOOL_NAME="ng_${APP_NAME}"
 [ -z "$EXCLUDE_FROM_BUILD_SYMLINK" ] && EXCLUDE_FROM_BUILD_SYMLINK="libs run_*.py"
+# How those copies are made: auto (reflink where the file system supports it,
+# else copy), copy, or hardlink (files matching HOOK_MODIFIES are copied)
+[ -z "$STAGE_COPY_MODE" ] && STAGE_COPY_MODE="auto"
 # pull the tool version from the environment, otherwise set it to 'local'
 TOOL_VERSION="${TOOL_VERSION:-local}"
 # Replace '/' with '-': CI often passes the git ref name as TOOL_VERSION, and a
@@ -112,19 +170,37 @@ TOOL_DIR=$TOOL_NAME-$TOOL_VERSION
 BUILD_DIR=$PROJECT_ROOT/build/$TOOL_DIR
 
 [ -z "$TARBALL_PREFIX" ] && TARBALL_PREFIX="IEDB_"
+[ -z "$TARBALL_COMPRESSION" ] && TARBALL_COMPRESSION="gzip"
+case "$TARBALL_COMPRESSION" in
+    gzip|python) TARBALL_EXT=".tar.gz" ;;
+    zstd) TARBALL_EXT=".tar.zst" ;;
+    *)
+        echo "ERROR: TARBALL_COMPRESSION must be gzip, python or zstd (got '$TARBALL_COMPRESSION')" >&2
+        exit 1
+        ;;
+esac
+
+# Reproducible builds: every tarball member (and the date in VERSION) gets
+# SOURCE_DATE_EPOCH, defaulting to the project's last commit, so rebuilding
+# the same tree gives a byte-identical tarball. Outside git, the build time.
+if [ -z "${SOURCE_DATE_EPOCH:-}" ]; then
+    SOURCE_DATE_EPOCH="$(git -C "$PROJECT_ROOT" log -1 --format=%ct 2>/dev/null || true)"
+    [ -z "$SOURCE_DATE_EPOCH" ] && SOURCE_DATE_EPOCH="$(date +%s)"
+fi
 
-# Returns 0 if $1 matches any glob pattern in $EXCLUDE_FROM_BUILD_SYMLINK (space-separated).
-# Used by handle_src_dir and handle_item *) to decide copy-vs-symlink for each file/dir.
-should_copy_not_symlink() {
-    local item="$1"
-    for pattern in $EXCLUDE_FROM_BUILD_SYMLINK; do
-        # shellcheck disable=SC2053  # intentional glob match (RHS is a pattern, not a string)
-        if [[ "$item" == $pattern ]]; then
-            return 0
-        fi
-    done
-    return 1
-}
+# Tarballs are cached under the hash of the staged tree plus TOOL_VERSION: an
+# unchanged tree reuses its tarball instead of compressing it again. Set
+# ARTIFACT_CACHE_DIR=off to disable.
+[ -z "$ARTIFACT_CACHE_DIR" ] && ARTIFACT_CACHE_DIR="$PROJECT_ROOT/build/.ngbuild/artifacts"
+PACKAGE_ARGS=()
+[ "$ARTIFACT_CACHE_DIR" != off ] && PACKAGE_ARGS+=(--cache-dir "$ARTIFACT_CACHE_DIR" --cache-key "$TOOL_VERSION")
+
+# Incremental builds (--incremental) keep $BUILD_DIR between runs. The manifest
+# records what was staged from where, and what each cached step (requirements
+# vendoring, hooks) produced; it lives outside $TOOL_DIR so it never ships.
+MANIFEST="$PROJECT_ROOT/build/.ngbuild/$TOOL_DIR.json"
+# Output of the build hooks (hooks.sh, HOOK_STEPS), kept after the build
+HOOK_LOG_DIR="$PROJECT_ROOT/build/.ngbuild/logs"
 
 # ---------------------------------------------------------------------------
 # distignore engine.
@@ -139,8 +215,12 @@ should_copy_not_symlink() {
 #                                tarball contract: the deploy orchestrator
 #                                requires these at the tarball top level
 #                                (highest precedence — not overridable)
+#   4. '/scripts/core/'          framework build tooling never ships
+#                                (not overridable either)
 # The project-root build/ and .git/ dirs are hard-pruned from the candidate
 # list, so no rule (not even '!') can bring them back.
+# The excluded paths are then loaded once into build.py's hash sets, which
+# stage the tree (see scripts/core/build.py).
 # ---------------------------------------------------------------------------
 setup_exclusions() {
     TMPWORK="$(mktemp -d "${TMPDIR:-/tmp}/ngbuild-exclude.XXXXXX")"
@@ -174,111 +254,50 @@ setup_exclusions() {
             # line here is inert — .gitignore ignores blank lines).
             printf '\n'
         fi
-        printf '!README\n!deploy/\n!deploy/install.sh\n'
+        printf '!README\n!deploy/\n!deploy/install.sh\n/scripts/core/\n'
     } > "$IGNORE_REPO/.gitignore"
 
-    # Candidate paths: everything in the project, PROJECT_ROOT-relative,
-    # directories suffixed with '/' (required for dir-only patterns to match
-    # paths that do not exist inside the throwaway repo). Nested .git dirs are
-    # listed but not descended into, so the '.*' baseline excludes them whole.
-    (
-        cd "$PROJECT_ROOT" && {
-            find . -mindepth 1 \( -path ./build -o -path ./.git \) -prune -o \
-                -type d -name .git -prune -print -o -type d -print \
-                | sed -e 's|^\./||' -e 's|$|/|'
-            find . -mindepth 1 \( -path ./build -o -path ./.git \) -prune -o \
-                -type d -name .git -prune -o ! -type d -print \
-                | sed 's|^\./||'
-        }
-    ) > "$candidates"
-
-    # Batch evaluation. Exit 0 = some paths ignored, 1 = none ignored (not an
-    # error), >1 = fatal.
-    local status=0
-    git -C "$IGNORE_REPO" -c core.quotePath=off -c core.excludesFile=/dev/null \
-        check-ignore --stdin < "$candidates" > "$EXCLUDED_LIST" || status=$?
-    if [ "$status" -gt 1 ]; then
-        echo "ERROR: git check-ignore failed (exit $status) while evaluating distignore rules" >&2
-        exit 1
-    fi
-}
-
-# $1 = PROJECT_ROOT-relative path; directories MUST carry a trailing '/'.
-is_excluded() {
-    grep -qxF -- "$1" "$EXCLUDED_LIST"
-}
-
-# $1 = PROJECT_ROOT-relative dir path, no trailing '/'. True when any excluded
-# path lives under it (descendants of an ignored dir are individually listed,
-# so this is a complete test).
-subtree_has_exclusions() {
-    P="$1/" awk 'index($0, ENVIRON["P"]) == 1 { found = 1; exit } END { exit !found }' "$EXCLUDED_LIST"
-}
-
-# Stage one entry into the build tree, enforcing exclusions at every depth.
-#   $1 src (absolute)   $2 dstparent (absolute)
-#   $3 rel (PROJECT_ROOT-relative, no trailing '/')
-#   $4 mode: symlink|copy
-#   $5 fastpath: yes|no — 'yes' allows a whole-dir symlink/copy when nothing
-#      inside the subtree is excluded; 'no' forces per-file staging (used for
-#      src/, where hooks patch files under build/src/ and a whole-dir symlink
-#      would leak those writes back into the source tree).
-stage_entry() {
-    local src="$1" dstparent="$2" rel="$3" mode="$4" fastpath="${5:-yes}"
-    local name
-    name=$(basename "$src")
-
-    if [ -d "$src" ] && [ ! -L "$src" ]; then
-        is_excluded "$rel/" && return 0
-        if [ "$fastpath" = yes ] && ! subtree_has_exclusions "$rel"; then
-            mkdir -p "$dstparent"
-            if [ "$mode" = copy ]; then
-                log_verbose "Copying directory: $rel"
-                cp -r "$src" "$dstparent/$name"
-            else
-                log_verbose "Symlinking directory: $rel"
-                ln -sf "$src" "$dstparent/$name"
-            fi
-            return 0
-        fi
-        local child
-        for child in "$src"/*; do
-            { [ -e "$child" ] || [ -L "$child" ]; } || continue
-            stage_entry "$child" "$dstparent/$name" "$rel/$(basename "$child")" "$mode" "$fastpath"
-        done
-        # Dirs emptied by exclusion are dropped; genuinely empty dirs ship.
-        if [ ! -e "$dstparent/$name" ] && [ -z "$(ls -A "$src")" ]; then
-            mkdir -p "$dstparent/$name"
-        fi
-    else
-        is_excluded "$rel" && return 0
-        mkdir -p "$dstparent"
-        if [ "$mode" = copy ]; then
-            log_verbose "Copying file: $rel"
-            cp "$src" "$dstparent/$name"
-        else
-            log_verbose "Symlinking file: $rel"
-            ln -sf "$src" "$dstparent/$name"
-        fi
-    fi
+    # One walk of the project, with one `git check-ignore` process: every
+    # path evaluated goes to $candidates, the excluded ones to $EXCLUDED_LIST.
+    # Directories carry a trailing '/' (required for dir-only patterns to match
+    # paths that do not exist inside the throwaway repo). An excluded directory
+    # is not descended into, and nested .git dirs are listed but not descended
+    # into, so the '.*' baseline excludes them whole.
+    "$PYTHON" "$BUILD_PY" "${BUILD_PY_ARGS[@]}" exclusions --project-root "$PROJECT_ROOT" \
+        --ignore-repo "$IGNORE_REPO" --candidates "$candidates" --excluded "$EXCLUDED_LIST"
 }
 
 # Ensure we clean up temp state always, and the build directory on failure
 TMPWORK=""
 trap 'status=$?; \
   [ -n "$TMPWORK" ] && rm -rf "$TMPWORK"; \
+  [ -n "$PROFILE_LOG" ] && rm -f "$PROFILE_LOG"; \
   if [ $status -ne 0 ]; then \
   echo "Build failed; removing $BUILD_DIR"; \
   [ -n "$BUILD_DIR" ] && rm -rf "$BUILD_DIR"; \
+  rm -f "$MANIFEST" "$MANIFEST".*; \
+  rmdir "$PROJECT_ROOT/build/.ngbuild" 2>/dev/null; \
   # Remove top-level build dir if empty
   if [ -d "$PROJECT_ROOT/build" ] && [ -z "$(ls -A "$PROJECT_ROOT/build")" ]; then \
     rmdir "$PROJECT_ROOT/build"; \
   fi; \
 fi; exit $status' EXIT
 
-# Clean and recreate build directory
-show_progress "Setting up build directory"
-rm -rf $BUILD_DIR
+# Clean and recreate build directory (incremental builds only start over when
+# the manifest is missing or TOOL_VERSION, the copy patterns or the build
+# engine changed)
+show_progress "Setting up build directory" setup
+if [ "$INCREMENTAL" = true ]; then
+    "$PYTHON" "$BUILD_PY" "${BUILD_PY_ARGS[@]}" prepare \
+        --manifest "$MANIFEST" \
+        --build-dir "$BUILD_DIR" \
+        --key "$TOOL_VERSION $EXCLUDE_FROM_BUILD_SYMLINK $STAGE_COPY_MODE $HOOK_MODIFIES" \
+        --inputs "$BUILD_SH_DIR/build.sh" "$BUILD_PY"
+else
+    rm -rf $BUILD_DIR
+    rm -f "$MANIFEST" "$MANIFEST".*
+    rmdir "$PROJECT_ROOT/build/.ngbuild" 2>/dev/null || true
+fi
 mkdir -p $BUILD_DIR
 
 # Create libs directory (this will be a real directory, not a symlink)
@@ -286,238 +305,186 @@ mkdir -p $BUILD_DIR/libs
 
 # Function to ensure __init__.py files exist in a directory tree
 ensure_init_files() {
-    local target_dir="$1"
-    
-    if [ -d "$target_dir" ]; then
-        find "$target_dir" -type d | while read -r subdir; do
-            if [ ! -f "$subdir/__init__.py" ]; then
-                log_verbose "  Creating __init__.py in: $subdir"
-                echo "# Auto-generated __init__.py file" > "$subdir/__init__.py"
-            fi
-        done
-    fi
+    "$PYTHON" "$BUILD_PY" "${BUILD_PY_ARGS[@]}" init-files "$1"
 }
 
-# Process requirements.txt if it exists
-show_progress "Processing requirements.txt"
-if [ -f "$PROJECT_ROOT/requirements.txt" ]; then
-    log_verbose "Processing requirements.txt..."
-
-    # Check if there are any git repositories in requirements.txt
-    has_git_repos=false
-    while IFS= read -r line || [ -n "$line" ]; do
-        # Skip empty lines and comments
-        if [[ -z "$line" || "$line" =~ ^[[:space:]]*# ]]; then
-            continue
-        fi
-        # Check if line contains a Git repository
-        if [[ "$line" =~ ^git\+ || "$line" =~ github\.com || "$line" =~ gitlab\.com || "$line" =~ gitlab\. ]]; then
-            has_git_repos=true
-            break
+# Run build step $1 (the shell function $2). Full builds always run it.
+# Incremental builds skip it when the files and build-dir paths it reads are
+# unchanged (remaining args: build.py step-check's --inputs/--watch/--key),
+# keeping its previous outputs; otherwise build.py clears those first and
+# records the new ones afterwards.
+cached_step() {
+    local name="$1" step="$2"
+    shift 2
+    if [ "$INCREMENTAL" = true ]; then
+        if "$PYTHON" "$BUILD_PY" "${BUILD_PY_ARGS[@]}" step-check "$name" \
+            --manifest "$MANIFEST" --build-dir "$BUILD_DIR" "$@"; then
+            log_verbose "✓ Step '$name' is up to date, reusing its outputs"
+            return 0
         fi
-    done < "$PROJECT_ROOT/requirements.txt"
+        "$step"
+        "$PYTHON" "$BUILD_PY" step-record "$name" --manifest "$MANIFEST" --build-dir "$BUILD_DIR"
+    else
+        "$step"
+    fi
+}
 
-    if [ "$has_git_repos" = true ]; then
-        log_verbose "Git repositories detected, creating filtered requirements.txt..."
-        
-        # Create filtered requirements.txt for build directory (Python packages only)
-        > "$BUILD_DIR/requirements.txt"
+# Process requirements.txt if it exists
+process_requirements() {
+    if [ -f "$PROJECT_ROOT/requirements.txt" ]; then
+        log_verbose "Processing requirements.txt..."
 
-        # Process each line in requirements.txt
+        # Check if there are any git repositories in requirements.txt
+        has_git_repos=false
         while IFS= read -r line || [ -n "$line" ]; do
             # Skip empty lines and comments
             if [[ -z "$line" || "$line" =~ ^[[:space:]]*# ]]; then
                 continue
             fi
             # Check if line contains a Git repository
-            if [[ "$line" =~ ^git\+ || "$line" =~ ^git[[:space:]]+clone || "$line" =~ github\.com || "$line" =~ gitlab\.com || "$line" =~ gitlab\. ]]; then
-                log_verbose "Installing Git repository: $line"
+            if [[ "$line" =~ ^git\+ || "$line" =~ github\.com || "$line" =~ gitlab\.com || "$line" =~ gitlab\. ]]; then
+                has_git_repos=true
+                break
+            fi
+        done < "$PROJECT_ROOT/requirements.txt"
+
+        if [ "$has_git_repos" = true ]; then
+            log_verbose "Git repositories detected, creating filtered requirements.txt..."
+        
+            # Create filtered requirements.txt for build directory (Python packages only).
+            # Remove first: an incremental build dir may hold a link to the source file.
+            rm -f "$BUILD_DIR/requirements.txt"
+            > "$BUILD_DIR/requirements.txt"
+
+            # Process each line in requirements.txt
+            while IFS= read -r line || [ -n "$line" ]; do
+                # Skip empty lines and comments
+                if [[ -z "$line" || "$line" =~ ^[[:space:]]*# ]]; then
+                    continue
+                fi
+                # Check if line contains a Git repository
+                if [[ "$line" =~ ^git\+ || "$line" =~ ^git[[:space:]]+clone || "$line" =~ github\.com || "$line" =~ gitlab\.com || "$line" =~ gitlab\. ]]; then
+                    log_verbose "Installing Git repository: $line"
                 
-                # Parse repository name and clone
-                repo_name=""
-                # Case 1: pip-style VCS URL (git+https://...@branch)
-                if [[ "$line" =~ ^git\+ ]]; then
-                    # Parse git+ URL format
-                    base_url=$(echo "$line" | sed 's/^git+//' | sed 's/@[^@]*#.*$//' | sed 's/#.*$//')
-                    branch=""
-                    if [[ "$line" =~ @ ]]; then
-                        branch=$(echo "$line" | sed -n 's/.*@\([^#]*\).*/\1/p')
-                    fi
-                    repo_name=$(echo "$base_url" | sed 's/.*\///' | sed 's/\.git.*//')
+                    # Parse repository name and clone
+                    repo_name=""
+                    # Case 1: pip-style VCS URL (git+https://...@branch)
+                    if [[ "$line" =~ ^git\+ ]]; then
+                        # Parse git+ URL format
+                        base_url=$(echo "$line" | sed 's/^git+//' | sed 's/@[^@]*#.*$//' | sed 's/#.*$//')
+                        branch=""
+                        if [[ "$line" =~ @ ]]; then
+                            branch=$(echo "$line" | sed -n 's/.*@\([^#]*\).*/\1/p')
+                        fi
+                        repo_name=$(echo "$base_url" | sed 's/.*\///' | sed 's/\.git.*//')
                     
-                    cd "$BUILD_DIR/libs"
-                    if [[ -n "$branch" ]]; then
-                        git clone -b "$branch" --single-branch --depth 1 "$base_url" "$repo_name" 2>/dev/null && rm -rf "$repo_name/.git"
-                    else
-                        git clone --single-branch --depth 1 "$base_url" "$repo_name" 2>/dev/null && rm -rf "$repo_name/.git"
-                    fi
+                        cd "$BUILD_DIR/libs"
+                        if [[ -n "$branch" ]]; then
+                            git clone -b "$branch" --single-branch --depth 1 "$base_url" "$repo_name" 2>/dev/null && rm -rf "$repo_name/.git"
+                        else
+                            git clone --single-branch --depth 1 "$base_url" "$repo_name" 2>/dev/null && rm -rf "$repo_name/.git"
+                        fi
                     
-                    # Ensure __init__.py files exist in the cloned repository
-                    ensure_init_files "$BUILD_DIR/libs/$repo_name"
+                        # Ensure __init__.py files exist in the cloned repository
+                        ensure_init_files "$BUILD_DIR/libs/$repo_name"
                     
-                    cd "$BUILD_DIR"
-                # Case 2: shell-style 'git clone ... URL' line
-                elif [[ "$line" =~ ^git[[:space:]]+clone ]]; then
-                    # Extract URL (last http/https or git@ token)
-                    url=$(echo "$line" | grep -Eo '(https?://[^ ]+|git@[^ ]+)' | tail -n1)
-                    # Extract branch by tokenizing and taking the arg after -b
-                    branch=""
-                    read -r -a parts <<< "$line"
-                    for i in "${!parts[@]}"; do
-                        if [[ "${parts[$i]}" == "-b" && $((i+1)) -lt ${#parts[@]} ]]; then
-                            branch="${parts[$((i+1))]}"
-                            # Strip single quotes if present
-                            branch="${branch%\'}"
-                            branch="${branch#\'}"
-                        fi
-                    done
-                    repo_name=$(echo "$url" | sed 's/.*\///' | sed 's/\.git.*//')
-                    cd "$BUILD_DIR/libs"
-                    if [[ -n "$branch" ]]; then
-                        if git clone -b "$branch" --single-branch --depth 1 "$url" "$repo_name"; then
-                            rm -rf "$repo_name/.git"
+                        cd "$BUILD_DIR"
+                    # Case 2: shell-style 'git clone ... URL' line
+                    elif [[ "$line" =~ ^git[[:space:]]+clone ]]; then
+                        # Extract URL (last http/https or git@ token)
+                        url=$(echo "$line" | grep -Eo '(https?://[^ ]+|git@[^ ]+)' | tail -n1)
+                        # Extract branch by tokenizing and taking the arg after -b
+                        branch=""
+                        read -r -a parts <<< "$line"
+                        for i in "${!parts[@]}"; do
+                            if [[ "${parts[$i]}" == "-b" && $((i+1)) -lt ${#parts[@]} ]]; then
+                                branch="${parts[$((i+1))]}"
+                                # Strip single quotes if present
+                                branch="${branch%\'}"
+                                branch="${branch#\'}"
+                            fi
+                        done
+                        repo_name=$(echo "$url" | sed 's/.*\///' | sed 's/\.git.*//')
+                        cd "$BUILD_DIR/libs"
+                        if [[ -n "$branch" ]]; then
+                            if git clone -b "$branch" --single-branch --depth 1 "$url" "$repo_name"; then
+                                rm -rf "$repo_name/.git"
+                            else
+                                echo "ERROR: git clone failed for $url (branch: $branch)" >&2
+                            fi
                         else
-                            echo "ERROR: git clone failed for $url (branch: $branch)" >&2
+                            if git clone --single-branch --depth 1 "$url" "$repo_name"; then
+                                rm -rf "$repo_name/.git"
+                            else
+                                echo "ERROR: git clone failed for $url" >&2
+                            fi
                         fi
+                        ensure_init_files "$repo_name"
+                        cd "$BUILD_DIR"
                     else
-                        if git clone --single-branch --depth 1 "$url" "$repo_name"; then
-                            rm -rf "$repo_name/.git"
+                        # Handle regular GitHub/GitLab URLs
+                        if [[ "$line" =~ github\.com ]]; then
+                            repo_name=$(echo "$line" | sed -n 's/.*github\.com\/[^\/]*\/\([^\/@]*\).*/\1/p')
+                        elif [[ "$line" =~ gitlab\.com ]]; then
+                            repo_name=$(echo "$line" | sed -n 's/.*gitlab\.com\/[^\/]*\/\([^\/@]*\).*/\1/p')
+                        elif [[ "$line" =~ gitlab\. ]]; then
+                            repo_name=$(echo "$line" | sed -n 's/.*gitlab\.[^\/]*\/[^\/]*\/\([^\/@]*\).*/\1/p')
                         else
-                            echo "ERROR: git clone failed for $url" >&2
+                            repo_name=$(echo "$line" | sed 's/.*\///' | sed 's/\.git.*//' | sed 's/@.*//' | sed 's/#.*//')
                         fi
-                    fi
-                    ensure_init_files "$repo_name"
-                    cd "$BUILD_DIR"
-                else
-                    # Handle regular GitHub/GitLab URLs
-                    if [[ "$line" =~ github\.com ]]; then
-                        repo_name=$(echo "$line" | sed -n 's/.*github\.com\/[^\/]*\/\([^\/@]*\).*/\1/p')
-                    elif [[ "$line" =~ gitlab\.com ]]; then
-                        repo_name=$(echo "$line" | sed -n 's/.*gitlab\.com\/[^\/]*\/\([^\/@]*\).*/\1/p')
-                    elif [[ "$line" =~ gitlab\. ]]; then
-                        repo_name=$(echo "$line" | sed -n 's/.*gitlab\.[^\/]*\/[^\/]*\/\([^\/@]*\).*/\1/p')
-                    else
-                        repo_name=$(echo "$line" | sed 's/.*\///' | sed 's/\.git.*//' | sed 's/@.*//' | sed 's/#.*//')
-                    fi
                     
-                    if [[ -z "$repo_name" ]]; then
-                        repo_name="repo_$(date +%s)"
-                    fi
+                        if [[ -z "$repo_name" ]]; then
+                            repo_name="repo_$(date +%s)"
+                        fi
                     
-                    cd "$BUILD_DIR/libs"
-                    git clone "$line" "$repo_name" 2>/dev/null && rm -rf "$repo_name/.git"
+                        cd "$BUILD_DIR/libs"
+                        git clone "$line" "$repo_name" 2>/dev/null && rm -rf "$repo_name/.git"
                     
-                    # Ensure __init__.py files exist in the cloned repository
-                    ensure_init_files "$BUILD_DIR/libs/$repo_name"
+                        # Ensure __init__.py files exist in the cloned repository
+                        ensure_init_files "$BUILD_DIR/libs/$repo_name"
                     
-                    cd "$BUILD_DIR"
+                        cd "$BUILD_DIR"
+                    fi
+                else
+                    # This is a Python package, add to filtered requirements.txt
+                    echo "$line" >> "$BUILD_DIR/requirements.txt"
                 fi
-            else
-                # This is a Python package, add to filtered requirements.txt
-                echo "$line" >> "$BUILD_DIR/requirements.txt"
-            fi
-        done < "$PROJECT_ROOT/requirements.txt"
+            done < "$PROJECT_ROOT/requirements.txt"
 
-        log_verbose "✓ Processed requirements.txt with Git repository filtering"
-    else
-        log_verbose "No Git repositories detected, symlinking requirements.txt..."
-        # No git repos found, just symlink the original file (will be handled in the main loop)
+            log_verbose "✓ Processed requirements.txt with Git repository filtering"
+        else
+            log_verbose "No Git repositories detected, symlinking requirements.txt..."
+            # No git repos found, just symlink the original file (will be handled in the main loop)
+        fi
     fi
-fi
+}
+show_progress "Processing requirements.txt" requirements
+cached_step requirements process_requirements --inputs "$PROJECT_ROOT/requirements.txt"
 
 # Evaluate the .distignore exclusion file (exact .gitignore semantics) up front
-show_progress "Evaluating distignore rules"
+show_progress "Evaluating distignore rules" exclusions
 setup_exclusions
 
-# Copy only the libs directory and create symlinks for everything else
-show_progress "Copying source files"
-
-# Function to handle src directory
-handle_src_dir() {
-    local src_dir="$1"
-    local build_src_dir="$2"
-    mkdir -p "$build_src_dir"
-
-    for src_file in "$src_dir"/*; do
-        { [ -e "$src_file" ] || [ -L "$src_file" ]; } || continue
-        local src_file_name
-        src_file_name=$(basename "$src_file")
-        local mode=symlink
-        should_copy_not_symlink "$src_file_name" && mode=copy
-        stage_entry "$src_file" "$build_src_dir" "src/$src_file_name" "$mode" no
-    done
-}
-
-# Function to handle a single item
-handle_item() {
-    local item="$1"
-    local build_dir="$2"
-
-    { [ -e "$item" ] || [ -L "$item" ]; } || return 0
-
-    local item_name
-    item_name=$(basename "$item")
-
-    # Never distribute the build output dir or the git repo. These are also
-    # pruned from the candidate list, so a '!' rule cannot re-include them.
-    [[ "$item_name" == "build" || "$item_name" == ".git" ]] && return 0
-
-    # .distignore check (exact .gitignore semantics)
-    if [ -d "$item" ] && [ ! -L "$item" ]; then
-        is_excluded "$item_name/" && return 0
-    else
-        is_excluded "$item_name" && return 0
-    fi
-
-    case "$item_name" in
-        "src")
-            handle_src_dir "$item" "$build_dir/src"
-            ;;
-        "libs")
-            # Merge project-level libs/* into build/libs (flattened) to avoid build/libs/libs
-            log_verbose "Merging project libs/* into $build_dir/libs"
-            mkdir -p "$build_dir/libs"
-            for libentry in "$item"/*; do
-                { [ -e "$libentry" ] || [ -L "$libentry" ]; } || continue
-                name=$(basename "$libentry")
-                stage_entry "$libentry" "$build_dir/libs" "libs/$name" copy
-                if [ -d "$build_dir/libs/$name" ]; then
-                    # remove VCS metadata if present (the '.*' baseline already
-                    # filters these on the per-file path; this covers fast-path copies)
-                    rm -rf "$build_dir/libs/$name/.git" "$build_dir/libs/$name/.github" "$build_dir/libs/$name/.gitlab"
-                    ensure_init_files "$build_dir/libs/$name"
-                fi
-            done
-            ;;
-        "scripts")
-            for scripts_file in "$item"/*; do
-                { [ -e "$scripts_file" ] || [ -L "$scripts_file" ]; } || continue
-                stage_entry "$scripts_file" "$build_dir/scripts" "scripts/$(basename "$scripts_file")" symlink
-            done
-            ;;
-        "requirements.txt")
-            # Only symlink if not already processed as a filtered file (with git deps stripped out).
-            if [ ! -f "$build_dir/requirements.txt" ]; then
-                ln -sf "$item" "$build_dir/$item_name"
-            fi
-            ;;
-        *)
-            # Default: symlink. To copy a top-level item instead, list it (or a glob)
-            # in EXCLUDE_FROM_BUILD_SYMLINK in scripts/build.conf.
-            local mode=symlink
-            should_copy_not_symlink "$item_name" && mode=copy
-            stage_entry "$item" "$build_dir" "$item_name" "$mode" yes
-            ;;
-    esac
-}
-
-show_progress "Processing project files"
-# Process all items in PROJECT_ROOT
-for item in "$PROJECT_ROOT"/*; do
-    handle_item "$item" "$BUILD_DIR"
-done
-
-show_progress "Updating version info"
+# Stage PROJECT_ROOT into the build dir in one pass (scripts/core/build.py):
+# src/ entries are staged file by file, libs/* is copied and merged into
+# build/libs, requirements.txt is linked unless filtered above, and everything
+# else is symlinked unless it matches EXCLUDE_FROM_BUILD_SYMLINK.
+# Incremental builds only restage what changed since the last run.
+show_progress "Staging project files" staging
+STAGE_ARGS=()
+[ "$INCREMENTAL" = true ] && STAGE_ARGS+=(--manifest "$MANIFEST")
+[ "$PROFILE_MODE" = true ] && STAGE_ARGS+=(--stats "$TMPWORK/stage-stats.json")
+"$PYTHON" "$BUILD_PY" "${BUILD_PY_ARGS[@]}" stage \
+    --project-root "$PROJECT_ROOT" \
+    --build-dir "$BUILD_DIR" \
+    --excluded "$EXCLUDED_LIST" \
+    --copy "$EXCLUDE_FROM_BUILD_SYMLINK" \
+    --link-mode "$STAGE_COPY_MODE" \
+    --hook-modifies "$HOOK_MODIFIES" \
+    --linked-list "$TMPWORK/linked" \
+    "${STAGE_ARGS[@]}"
+
+show_progress "Updating version info" version_info
 # Use sed to replace the string with the environment variable
 if [ -f "$BUILD_DIR/README" ]; then
     if [[ "$(uname)" == "Darwin" ]]; then
@@ -532,7 +499,7 @@ fi
 # All dependencies should be in the libs directory
 cd $BUILD_DIR/libs
 
-show_progress "Running build hooks"
+show_progress "Running build hooks" hooks "$BUILD_DIR"
 # Execute the project's build hook if present. Legacy projects may still use
 # the older filenames; we accept those too so builds keep working until migration.
 HOOK_SCRIPT=""
@@ -546,27 +513,79 @@ elif [ -f "$SRC_DIR/dependencies.sh" ]; then
     log_verbose "⚠  Using legacy 'dependencies.sh'; rename to 'hooks.sh' (or run 'cli sync' to do it for you)."
 fi
 
-if [ -n "$HOOK_SCRIPT" ]; then
+run_hook_script() {
     log_verbose "Executing build hook: $HOOK_SCRIPT"
 
     # Set environment variables visible to the hook
     export SRC_DIR PROJECT_ROOT APP_NAME TOOL_NAME TOOL_VERSION TOOL_DIR BUILD_DIR
 
-    # Run script (suppress output in progress mode)
+    # Run script (its output goes to a log in progress mode, shown if it fails)
     if [ "$PROGRESS_MODE" = true ]; then
-        bash "$HOOK_SCRIPT" > /dev/null 2>&1
+        mkdir -p "$HOOK_LOG_DIR"
+        local status=0
+        bash "$HOOK_SCRIPT" > "$HOOK_LOG_DIR/hooks.sh.log" 2>&1 || status=$?
+        if [ "$status" -ne 0 ]; then
+            echo "ERROR: $HOOK_SCRIPT failed (exit $status); its output is in $HOOK_LOG_DIR/hooks.sh.log" >&2
+            tail -n 20 "$HOOK_LOG_DIR/hooks.sh.log" | sed 's/^/  /' >&2
+            return "$status"
+        fi
     else
         bash "$HOOK_SCRIPT"
     fi
 
     log_verbose "✓ Build hook completed"
+}
+
+# Incremental builds rerun the hook when it or build.conf changed, when
+# anything under libs/ or src/ was restaged, or when a file it modified was.
+if [ -n "$HOOK_SCRIPT" ]; then
+    cached_step hooks run_hook_script --inputs "$HOOK_SCRIPT" "$SRC_DIR/build.conf" --watch libs src
+fi
+
+# The hook steps declared in build.conf (HOOK_STEPS) run next: in parallel as
+# far as their dependencies allow, and only when their inputs changed since
+# their last run — otherwise their cached outputs are copied back, in full
+# builds too.
+run_hook_steps() {
+    local name cmd inputs outputs deps
+    local step_args=()
+    for name in $HOOK_STEPS; do
+        if ! [[ "$name" =~ ^[A-Za-z_][A-Za-z0-9_]*$ ]]; then
+            echo "ERROR: invalid hook step name '$name' in HOOK_STEPS (use letters, digits and '_')" >&2
+            exit 1
+        fi
+        cmd="HOOK_${name}_CMD" inputs="HOOK_${name}_INPUTS" outputs="HOOK_${name}_OUTPUTS" deps="HOOK_${name}_DEPS"
+        if [ -z "${!cmd}" ]; then
+            echo "ERROR: hook step '$name' is listed in HOOK_STEPS but $cmd is not set in scripts/build.conf" >&2
+            exit 1
+        fi
+        step_args+=(--step "$name" "${!cmd}" "${!inputs}" "${!outputs}" "${!deps}")
+    done
+    export SRC_DIR PROJECT_ROOT APP_NAME TOOL_NAME TOOL_VERSION TOOL_DIR BUILD_DIR
+    "$PYTHON" "$BUILD_PY" "${BUILD_PY_ARGS[@]}" hook-steps \
+        --project-root "$PROJECT_ROOT" \
+        --build-dir "$BUILD_DIR" \
+        --cache-dir "$PROJECT_ROOT/build/.ngbuild/hooks" \
+        --log-dir "$HOOK_LOG_DIR" \
+        ${HOOK_JOBS:+--jobs "$HOOK_JOBS"} \
+        "${step_args[@]}"
+}
+if [ -n "$HOOK_STEPS" ]; then
+    run_hook_steps
 fi
 
+# Hard-linked files share their inode with the project's: a hook writing one in
+# place has changed the source too. Fail loudly so it gets listed in HOOK_MODIFIES.
+if [ "$STAGE_COPY_MODE" = hardlink ]; then
+    "$PYTHON" "$BUILD_PY" verify-links --linked-list "$TMPWORK/linked"
+fi
+
+show_progress "Finalizing build directory" finalize "$BUILD_DIR"
 cd $BUILD_DIR
 
-# Create version file
+# Create version file (dated SOURCE_DATE_EPOCH, in UTC, to stay reproducible)
 echo ${TOOL_VERSION} > VERSION
-date >> VERSION
+date -u -d "@$SOURCE_DATE_EPOCH" >> VERSION 2>/dev/null || date -u -r "$SOURCE_DATE_EPOCH" >> VERSION
 
 # Remove macOS resource fork files
 find . -type f -name '._*' -delete
@@ -576,15 +595,42 @@ log_verbose "Ensuring __init__.py files exist in all libs directories..."
 ensure_init_files "$BUILD_DIR/libs"
 log_verbose "✓ All __init__.py files ensured"
 
-# Create tarball in build directory
-show_progress "Creating tarball"
+# Create tarball in build directory. build.py follows symlinks like tar -h,
+# adds members in sorted order with normalized metadata, reuses a cached
+# tarball for an unchanged tree, and otherwise compresses on every core (pigz when
+# installed, else its own thread pool; zstd -T0 for TARBALL_COMPRESSION=zstd).
+show_progress "Creating tarball" packaging
 cd $PROJECT_ROOT/build
 if [ -n "$TARBALL_PREFIX" ]; then
-    TAR_NAME="${TARBALL_PREFIX}$(echo $TOOL_NAME | tr '[:lower:]' '[:upper:]')-${TOOL_VERSION}.tar.gz"
+    TAR_NAME="${TARBALL_PREFIX}$(echo $TOOL_NAME | tr '[:lower:]' '[:upper:]')-${TOOL_VERSION}${TARBALL_EXT}"
 else
-    TAR_NAME="${TOOL_NAME}-${TOOL_VERSION}.tar.gz"
+    TAR_NAME="${TOOL_NAME}-${TOOL_VERSION}${TARBALL_EXT}"
+fi
+"$PYTHON" "$BUILD_PY" "${BUILD_PY_ARGS[@]}" package \
+    --build-root "$PROJECT_ROOT/build" \
+    --tool-dir "$TOOL_DIR" \
+    --output "$TAR_NAME" \
+    --compression "$TARBALL_COMPRESSION" \
+    --mtime "$SOURCE_DATE_EPOCH" \
+    "${PACKAGE_ARGS[@]}"
+
+# --profile: per-step wall time, files and bytes -> build/build-profile.json
+# (outside $TOOL_DIR, so it never ships)
+if [ "$PROFILE_MODE" = true ]; then
+    profile_mark end
+    [ "$PROGRESS_MODE" = true ] && echo ""
+    "$PYTHON" "$BUILD_PY" profile-write \
+        --log "$PROFILE_LOG" \
+        --output "$PROJECT_ROOT/build/build-profile.json" \
+        --stage-stats "$TMPWORK/stage-stats.json" \
+        --candidates "$TMPWORK/candidates" \
+        --excluded "$EXCLUDED_LIST" \
+        --tarball "$PROJECT_ROOT/build/$TAR_NAME" \
+        --build-root "$PROJECT_ROOT/build" \
+        --tool-dir "$TOOL_DIR" \
+        --meta "tool_dir=$TOOL_DIR" "tarball=$TAR_NAME" "incremental=$INCREMENTAL" \
+            "stage_copy_mode=$STAGE_COPY_MODE" "compression=$TARBALL_COMPRESSION"
 fi
-tar -chzf "$TAR_NAME" $TOOL_DIR
 
 if [ "$PROGRESS_MODE" = true ]; then
     echo ""
@@ -6,26 +6,24 @@
 import json
 from pathlib import Path
 from core.result_writer import write_results
+from core.job_descriptions import iter_job_descriptions
+from core.timing import INSTRUMENTATION_SUFFIXES
 
 
-def read_json(jfile):
-    content = json.load(jfile)
-    jfile.seek(0)
-
-    return json.dumps(content)
-
-def collect_all_job_results(job_descriptions):
-    aggregate_job = job_descriptions[-1]
+def collect_all_job_results(jd_file):
+    # Stream the job descriptions once, remembering each job's result file.
+    # The last job is the aggregate (postprocess) job.
+    job_result_files = {}
+    for job in iter_job_descriptions(jd_file):
+        job_result_files[job['job_id']] = job['expected_outputs'][0]
+        aggregate_job = job
     dependent_jobs = aggregate_job['depends_on_job_ids']
 
     # Iterate through expected_outputs from all the dependent jobs and combine the results
     final_table_data = []
     final_table_header = []
-    for job in job_descriptions:
-        if job['job_id'] not in dependent_jobs:
-            continue
-
-        job_result_file = job['expected_outputs'][0]
+    for job_id in dependent_jobs:
+        job_result_file = job_result_files[job_id]
 
         with open(job_result_file, 'r') as f :
             table_data = json.load(f)
@@ -38,7 +36,7 @@ def collect_all_job_results(job_descriptions):
         for td in job_result_table_data:
             final_table_data.append(td)
 
-    return final_table_header, final_table_data
+    return final_table_header, final_table_data, aggregate_job
 
 def collect_all_job_results_without_jd(args):
     '''
@@ -53,6 +51,9 @@ def collect_all_job_results_without_jd(args):
     final_table_data = []
     final_table_header = []
     for job_result_file in preprocess_results_dir.iterdir():
+        # Skip timing sidecars and profiles written next to each result
+        if job_result_file.name.endswith(INSTRUMENTATION_SUFFIXES):
+            continue
         with open(job_result_file, 'r') as f :
             table_data = json.load(f)
 
@@ -87,14 +88,9 @@ def run(**kwargs):
     output_format = kwargs.get('output_format') or 'json'
     
     if jd_file:
-        jd_file = read_json(jd_file)
-        job_descriptions = json.loads(jd_file)
-        
-        post_jd = job_descriptions[-1]
-        default_path = Path(post_jd['expected_outputs'][0])
-
         # 2.1 Aggregate all the results.
-        final_header, final_data = collect_all_job_results(job_descriptions)
+        final_header, final_data, post_jd = collect_all_job_results(jd_file)
+        default_path = Path(post_jd['expected_outputs'][0])
 
     else:
         # allow user to perform postprocess without job-description
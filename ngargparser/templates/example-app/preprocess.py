@@ -16,6 +16,7 @@
 import json
 import tempfile
 from pathlib import Path
+from core.job_descriptions import RunManifest
 
 
 def read_json(jfile):
@@ -24,7 +25,15 @@ def read_json(jfile):
 
     return json.dumps(content)
     
-def split_by_length(jdata, input_dir_path, param_dir_path):
+def estimate_resources(unit):
+    '''
+    Per-unit resource hints for schedulers, from the unit's size and record count.
+    Counting amino acids is cheap, so only wall time grows with the number of peptides.
+    '''
+    records = unit.get('records', 0)
+    return {'cpus': 1, 'memory_mb': 256, 'walltime_s': 60 + records // 1000}
+
+def split_by_length(jdata, input_dir_path, param_dir_path, manifest):
     data = json.loads(jdata)
     peptides = data['peptide']
     pep_lengths = [len(p) for p in peptides]
@@ -77,6 +86,9 @@ def split_by_length(jdata, input_dir_path, param_dir_path):
         with tempfile.NamedTemporaryFile(dir=param_dir_path, prefix=f'{i}-', suffix='.json', mode='w', delete=False) as tmpfile:
             json.dump(splitted_input_params[i], tmpfile, indent=4)
 
+        # Record the unit so job descriptions are built from exactly this run
+        manifest.add_unit(tmpfile.name, records=len(splitted_input_seqs[i]))
+
 
 def run(**kwargs):
     # ADD CODE LOGIC TO SPLIT RESULTS.
@@ -91,4 +103,6 @@ def run(**kwargs):
     if param_dir_path:
         param_dir_path = Path(param_dir_path)
 
-    split_by_length(data, input_dir_path, param_dir_path)
+    manifest = RunManifest(kwargs.get('output_dir'), estimator=estimate_resources)
+    split_by_length(data, input_dir_path, param_dir_path, manifest)
+    manifest.save()
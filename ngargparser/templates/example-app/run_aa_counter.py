@@ -1,7 +1,5 @@
 import json
 import re
-import preprocess
-import postprocess
 from AACounterArgumentParser import AACounterArgumentParser
 from core.result_writer import write_results
 
@@ -179,14 +177,16 @@ def main():
         write_results(result_json, args.output_prefix, args.output_format)
 
     if args.subcommand == 'preprocess':        
-        # Run preprocess logic
+        # Run preprocess logic. Imported here so predict jobs never load it.
+        import preprocess
         preprocess.run(**vars(args))
         
         # Create job description file
         parser.create_job_descriptions_file(args)
 
     if args.subcommand == 'postprocess':
-        # Run postprocess logic
+        # Run postprocess logic. Imported here so predict jobs never load it.
+        import postprocess
         postprocess.run(**vars(args))
 
 if __name__=='__main__':
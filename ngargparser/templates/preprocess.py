@@ -4,6 +4,11 @@
 # * Take the rest of the parameters from the input JSON file, and split them into an atomic job units.
 #     * Make sure for each atomic job units have a key/value pair pointing to the input sequence files under 'preprocess_job/input_units'.
 #     * Each job units should be stored under 'preprocess_job/parameter_units'.
+# * Record every parameter unit written in a run manifest (core.job_descriptions.RunManifest):
+#       manifest = RunManifest(kwargs['output_dir'])
+#       manifest.add_unit(param_file)   # once per unit
+#       manifest.save()
+#   'job_descriptions.json' is built from exactly these units, so stale files are ignored.
 # * Lastly, it should create 'job_descriptions.json' file under 'preprocess_job/'.
 #     * This file will have list of descriptions for each job units.
 #     * Each description will contain a command that runs single prediction (utilizes 'predict' subcommand).
@@ -1,41 +1,55 @@
-import os
-import preprocess
-import postprocess
-import validators
 import core.set_pythonpath  # This automatically configures PYTHONPATH
 from CHILDPARSER import CHILDPARSER
-from dotenv import load_dotenv
-load_dotenv()
+
+# Keep this module's top-level imports minimal. Every predict job in a run pays
+# for them, so subcommand-specific modules (preprocess, postprocess and their
+# heavy dependencies) are imported inside the handler that needs them.
+# tests/test_startup.py in the ngargparser framework enforces this budget for
+# the generated entry point.
+
+
+def run_predict(args):
+    # ADD PREDICTION LOGIC HERE, importing heavy dependencies (models, numpy,
+    # pandas, ...) inside this function rather than at the top of the file.
+    # Build the standard result envelope and serialize it uniformly
+    # (defaults to tsv; pass -f json for JSON). Example:
+    #
+    #   from core.result_writer import write_results
+    #   result = {
+    #       "warnings": [], "errors": [],
+    #       "results": [{
+    #           "type": "my_table",
+    #           "table_columns": ["col1", "col2"],
+    #           "table_data": [[...], ...],
+    #       }],
+    #   }
+    #   write_results(result, args.output_prefix, args.output_format)
+    pass
+
+
+def run_preprocess(args):
+    # ADD CODE LOGIC TO SPLIT INPUTS INSIDE PREPROCESS.PY
+    import preprocess
+    preprocess.run(**vars(args))
+
+
+def run_postprocess(args):
+    # ADD CODE LOGIC TO COMBINE RESULTS INSIDE POSTPROCESS.PY
+    import postprocess
+    postprocess.run(**vars(args))
+
+
+HANDLERS = {
+    'predict': run_predict,
+    'preprocess': run_preprocess,
+    'postprocess': run_postprocess,
+}
 
 
 def main():
     parser = CHILDPARSER()
     args = parser.parse_args()
-
-    if args.subcommand == 'predict':
-        # ADD PREDICTION LOGIC HERE.
-        # Build the standard result envelope and serialize it uniformly
-        # (defaults to tsv; pass -f json for JSON). Example:
-        #
-        #   from core.result_writer import write_results
-        #   result = {
-        #       "warnings": [], "errors": [],
-        #       "results": [{
-        #           "type": "my_table",
-        #           "table_columns": ["col1", "col2"],
-        #           "table_data": [[...], ...],
-        #       }],
-        #   }
-        #   write_results(result, args.output_prefix, args.output_format)
-        pass
-
-    if args.subcommand == 'preprocess':
-        # ADD CODE LOGIC TO SPLIT INPUTS INSIDE PREPROCESS.PY
-        preprocess.run(**vars(args))
-
-    if args.subcommand == 'postprocess':
-        # ADD CODE LOGIC TO COMBINE RESULTS INSIDE POSTPROCESS.PY
-        postprocess.run(**vars(args))
+    HANDLERS[args.subcommand](args)
 
 if __name__=='__main__':
-    main()
\ No newline at end of file
+    main()
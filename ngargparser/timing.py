@@ -0,0 +1,356 @@
+"""
+Stage timing for ngargparser tools (framework-owned).
+
+This module is installed into each project as ``src/core/timing.py`` and is
+refreshed by ``cli sync``. Do not edit it in a project — edit it in the
+ngargparser framework and re-sync.
+
+Wrap the phases of a subcommand in ``stage`` to record their wall time, CPU
+time and peak RSS::
+
+    from core import timing
+
+    with timing.stage("parse"):
+        records = parse_input(args.input_tsv)
+    with timing.stage("score"):
+        scores = model.score(records)
+
+``stage`` also works as a decorator (``@timing.stage("write")``).
+``NGArgumentParser`` already times argument parsing and job-description
+writing, and ``core.result_writer`` times ``write_results``.
+
+When ``NGARGPARSER_TIMING=1`` is set, ``NGArgumentParser.parse_args`` calls
+``start_command``. Each subcommand then writes its stages, plus a
+whole-process total, to a JSON sidecar next to its outputs:
+
+* predict: ``<output_prefix>.timing.json``
+* preprocess: ``<output_dir>/preprocess.timing.json``
+* postprocess: ``<output_prefix>.timing.json``, or
+  ``<postprocessed_results_dir>/postprocess.timing.json``
+
+Timing is opt-in so that postprocess code which reads every file in a results
+directory doesn't pick up the sidecars. Export the variable once, for example
+in the Slurm job environment or before ``cli run-jobs``, and every job in the
+run writes a sidecar.
+
+``load_report`` and ``format_report`` (``cli report <output_dir>``) aggregate
+every sidecar under a run directory into a slowest-jobs table and a per-stage
+summary.
+
+Every subcommand also takes ``--profile[=cprofile|tracemalloc]``.
+``NGArgumentParser.parse_args`` then calls ``start_profile``, which profiles
+the rest of the process and writes the result next to the same output stem at
+exit:
+
+* ``cprofile`` (the default): ``<stem>.prof``. Open it with ``python -m pstats``
+  or snakeviz.
+* ``tracemalloc``: a ``<stem>.tracemalloc`` snapshot, which
+  ``tracemalloc.Snapshot.load`` can read, and a ``<stem>.tracemalloc.txt``
+  listing the top allocation sites.
+
+A predict run that prints to stdout has no output stem, so its profile goes to
+``./predict.prof`` and its snapshot to ``./predict.tracemalloc``.
+"""
+
+import atexit
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+TIMING_ENV_VAR = "NGARGPARSER_TIMING"
+SIDECAR_SUFFIX = ".timing.json"
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+PROFILE_SUFFIXES = {"cprofile": ".prof", "tracemalloc": ".tracemalloc"}
+
+# Every file this module may write next to a tool's outputs. Code that reads all
+# files in a results directory should skip names ending in one of these.
+INSTRUMENTATION_SUFFIXES = (SIDECAR_SUFFIX, ".prof", ".tracemalloc", ".tracemalloc.txt")
+
+# Stack depth kept per allocation, and allocation sites listed in the text summary.
+TRACEMALLOC_FRAMES = 25
+TRACEMALLOC_TOP = 25
+
+# Process-level clocks, read on first import so the total covers startup too.
+_T0_WALL = time.perf_counter()
+_T0_CPU = time.process_time()
+
+_stages: list = []  # completed stage records, in completion order
+_command: dict = {}  # {"subcommand": ..., "sidecar": ...} once start_command is called
+
+
+def enabled():
+    """Whether ``NGARGPARSER_TIMING`` asks for sidecars to be written."""
+    return os.environ.get(TIMING_ENV_VAR, "").strip().lower() not in ("", "0", "false", "no", "off")
+
+
+def max_rss_mb():
+    """Peak resident set size of this process so far, in MiB (``None`` if unknown)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+@contextmanager
+def stage(name):
+    """Time a block as stage ``name``.
+
+    Yields the stage record, a dict that gains ``wall_s``, ``cpu_s`` and
+    ``max_rss_mb`` when the block exits. Callers may add their own keys to it,
+    such as a row count. The record is kept even if the block raises.
+    """
+    record = {"name": name}
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+    try:
+        yield record
+    finally:
+        record["wall_s"] = round(time.perf_counter() - wall0, 6)
+        record["cpu_s"] = round(time.process_time() - cpu0, 6)
+        record["max_rss_mb"] = max_rss_mb()
+        _stages.append(record)
+
+
+def stages():
+    """The stages recorded so far in this process, in completion order."""
+    return list(_stages)
+
+
+def reset():
+    """Forget recorded stages and the current command (for tests and long-lived processes)."""
+    _stages.clear()
+    _command.clear()
+
+
+def output_stem(subcommand, output_prefix=None, output_dir=None):
+    """The path instrumentation files are named from: ``output_prefix``, else ``<output_dir>/<subcommand>``.
+
+    Returns:
+        Path | None: ``None`` when the subcommand writes nowhere but stdout.
+    """
+    if output_prefix:
+        return Path(output_prefix)
+    if output_dir:
+        return Path(output_dir) / subcommand
+    return None
+
+
+def sidecar_path(subcommand, output_prefix=None, output_dir=None):
+    """Where a subcommand's sidecar goes: next to ``output_prefix``, else in ``output_dir``.
+
+    Returns:
+        Path | None: ``None`` when the subcommand writes nowhere but stdout.
+    """
+    stem = output_stem(subcommand, output_prefix, output_dir)
+    return Path(f"{stem}{SIDECAR_SUFFIX}") if stem else None
+
+
+def start_command(subcommand, sidecar):
+    """Register ``subcommand`` for timing and, when enabled, write ``sidecar`` at exit.
+
+    Returns:
+        bool: Whether a sidecar will be written.
+    """
+    first = not _command
+    _command.update(subcommand=subcommand, sidecar=sidecar)
+    if not (enabled() and sidecar):
+        return False
+    if first:
+        atexit.register(_write_at_exit)
+    return True
+
+
+def _write_at_exit():
+    if _command.get("sidecar") and enabled():
+        try:
+            write_sidecar(_command["sidecar"], _command.get("subcommand"))
+        except OSError as e:
+            print(f"warning: could not write timing sidecar: {e}", file=sys.stderr)
+
+
+def start_profile(mode, stem):
+    """Profile the rest of this process and write the result next to ``stem`` at exit.
+
+    Args:
+        mode (str): One of ``PROFILE_MODES``.
+        stem (str | Path): Output stem; the mode's suffix is appended.
+
+    Returns:
+        callable: Stops profiling and writes the output, returning the paths
+        written. It is registered with ``atexit``, and calling it again does nothing.
+
+    Raises:
+        ValueError: On an unknown mode.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}'. Choose from: {', '.join(PROFILE_MODES)}")
+    path = Path(f"{stem}{PROFILE_SUFFIXES[mode]}")
+    written: list = []
+
+    if mode == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def dump():
+            profiler.disable()
+            profiler.dump_stats(path)
+            return [path]
+
+    else:
+        import tracemalloc
+
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+        def dump():
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            snapshot.dump(str(path))
+            summary = Path(f"{path}.txt")
+            with open(summary, "w") as f:
+                for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP]:
+                    f.write(f"{stat}\n")
+            return [path, summary]
+
+    def finish():
+        if written:
+            return written
+        path.parent.mkdir(parents=True, exist_ok=True)
+        written.extend(dump())
+        for p in written:
+            print(f"Wrote {p}", file=sys.stderr)
+        return written
+
+    atexit.register(finish)
+    return finish
+
+
+def write_sidecar(path, subcommand=None):
+    """Write the recorded stages and the process total to ``path`` as JSON.
+
+    Returns:
+        Path: The sidecar written.
+    """
+    path = Path(path)
+    payload = {
+        "subcommand": subcommand,
+        "argv": sys.argv,
+        "pid": os.getpid(),
+        "finished_at": time.time(),
+        "total": {
+            "wall_s": round(time.perf_counter() - _T0_WALL, 6),
+            "cpu_s": round(time.process_time() - _T0_CPU, 6),
+            "max_rss_mb": max_rss_mb(),
+        },
+        "stages": stages(),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+    return path
+
+
+def iter_sidecars(output_dir):
+    """Yield every ``*.timing.json`` under ``output_dir``, in sorted walk order."""
+    for root, dirs, files in os.walk(output_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(SIDECAR_SUFFIX):
+                yield Path(root) / name
+
+
+def load_report(output_dir, top=10):
+    """Aggregate the sidecars under ``output_dir``.
+
+    Args:
+        output_dir (str | Path): A run directory, such as a preprocess ``--output-dir``.
+        top (int): How many of the slowest jobs to keep.
+
+    Returns:
+        dict: ``sidecars`` (count), ``unreadable`` (paths that failed to parse),
+        ``jobs`` (the ``top`` slowest: ``job``, ``subcommand`` and the total's
+        ``wall_s``/``cpu_s``/``max_rss_mb``) and ``stages`` (per stage name:
+        ``count``, ``wall_s``, ``mean_wall_s``, ``max_wall_s``, ``cpu_s`` and
+        ``max_rss_mb``, slowest total first).
+    """
+    output_dir = Path(output_dir)
+    jobs = []
+    by_stage = {}
+    unreadable = []
+    n_sidecars = 0
+    for path in iter_sidecars(output_dir):
+        try:
+            with open(path) as f:
+                sidecar = json.load(f)
+            total = sidecar["total"]
+        except (OSError, ValueError, KeyError, TypeError):
+            unreadable.append(str(path))
+            continue
+        n_sidecars += 1
+        job = str(path.relative_to(output_dir))[: -len(SIDECAR_SUFFIX)]
+        jobs.append({"job": job, "subcommand": sidecar.get("subcommand"), **total})
+        for record in sidecar.get("stages") or []:
+            agg = by_stage.setdefault(
+                record["name"],
+                {
+                    "name": record["name"],
+                    "count": 0,
+                    "wall_s": 0.0,
+                    "max_wall_s": 0.0,
+                    "cpu_s": 0.0,
+                    "max_rss_mb": None,
+                },
+            )
+            agg["count"] += 1
+            agg["wall_s"] += record.get("wall_s") or 0.0
+            agg["max_wall_s"] = max(agg["max_wall_s"], record.get("wall_s") or 0.0)
+            agg["cpu_s"] += record.get("cpu_s") or 0.0
+            if record.get("max_rss_mb") is not None:
+                agg["max_rss_mb"] = max(agg["max_rss_mb"] or 0.0, record["max_rss_mb"])
+
+    jobs.sort(key=lambda job: job["wall_s"], reverse=True)
+    stage_rows = sorted(by_stage.values(), key=lambda agg: agg["wall_s"], reverse=True)
+    for agg in stage_rows:
+        agg["mean_wall_s"] = agg["wall_s"] / agg["count"]
+    return {"sidecars": n_sidecars, "unreadable": unreadable, "jobs": jobs[:top], "stages": stage_rows}
+
+
+def _mb(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def format_report(report):
+    """Render a ``load_report`` result as printable lines."""
+    lines = [f"Slowest jobs ({len(report['jobs'])} of {report['sidecars']}):"]
+    lines.append(f"  {'wall_s':>10} {'cpu_s':>10} {'rss_mb':>8}  job")
+    for job in report["jobs"]:
+        lines.append(
+            f"  {job['wall_s']:>10.3f} {job['cpu_s']:>10.3f} {_mb(job.get('max_rss_mb')):>8}  "
+            f"{job['job']} ({job['subcommand']})"
+        )
+    lines.append("")
+    lines.append("Slowest stages (summed over jobs):")
+    lines.append(f"  {'wall_s':>10} {'mean_s':>10} {'max_s':>10} {'cpu_s':>10} {'rss_mb':>8} {'count':>6}  stage")
+    for agg in report["stages"]:
+        lines.append(
+            f"  {agg['wall_s']:>10.3f} {agg['mean_wall_s']:>10.3f} {agg['max_wall_s']:>10.3f} "
+            f"{agg['cpu_s']:>10.3f} {_mb(agg['max_rss_mb']):>8} {agg['count']:>6}  {agg['name']}"
+        )
+    if report["unreadable"]:
+        lines.append("")
+        lines.append(f"Skipped {len(report['unreadable'])} unreadable sidecar(s): {', '.join(report['unreadable'])}")
+    return lines
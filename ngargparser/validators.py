@@ -14,7 +14,8 @@ from core.core_validators import (
     validate_file,
     validate_directory,
     validate_directory_given_filename,
-    validate_preprocess_dir
+    validate_preprocess_dir,
+    skip_if_assume_valid
 )
 
 
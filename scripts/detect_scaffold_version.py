@@ -17,21 +17,33 @@ Two detection layers:
 
 Run it from (or pointed at) an ngargparser git checkout -- the tags live there.
 
-    python detect_scaffold_version.py [TARGET] [--repo PATH] [--force-fingerprint] [--json]
+    python detect_scaffold_version.py [TARGET ...] [--repo PATH] [--force-fingerprint] [--json]
 
 TARGET defaults to the current directory; --repo defaults to the ngargparser checkout
 this script lives in.
+
+Fleet mode: pass several targets, or a quoted glob ('~/tools/*'), to audit many projects
+in one run. The tag index is built once, the projects are hashed on a process pool
+(--jobs), and a combined report (--json: one document with every result) is printed.
+
+The tag -> blob index is cached (--cache, default under $XDG_CACHE_HOME/ngargparser/),
+per tag: only tags that are new or were moved since the last run are read, all of them
+through one `git cat-file --batch` process, so repeated detections cost one `git
+for-each-ref`.
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
+import glob
 import hashlib
 import json
 import os
 import re
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # --- reused from ngargparser/cli.py (SCAFFOLD_STAMP_RE) --------------------------------
@@ -61,6 +73,9 @@ IGNORE_DIRS = {
 # Only the ngargparser package subtree gets copied into projects; index just that.
 INDEX_PATHSPEC = "ngargparser"
 
+# Bump when the cached index layout changes; older caches are then rebuilt.
+INDEX_CACHE_VERSION = 1
+
 # Distinctive framework filenames users keep verbatim-named (even if they edit contents).
 # Their mere presence flags "this is an ngargparser project" even when nothing fingerprints.
 FRAMEWORK_BASENAMES = {"NGArgumentParser.py", "NGChildArgumentParser.py", "core_validators.py"}
@@ -107,22 +122,158 @@ def scan_target(target: Path) -> tuple[dict[str, str], list[str]]:
     return by_hash, markers
 
 
+def tag_refs(repo: Path) -> dict[str, str]:
+    """tag -> the object it points at, in version order (`git tag --sort=v:refname`)."""
+    out = run_git(repo, "for-each-ref", "--sort=v:refname", "--format=%(objectname) %(refname:short)", "refs/tags")
+    refs = {}
+    for line in out.splitlines():
+        obj, _, tag = line.partition(" ")
+        if tag.strip():
+            refs[tag] = obj
+    return refs
+
+
 def list_tags(repo: Path) -> list[str]:
-    return [t for t in run_git(repo, "tag", "--sort=v:refname").splitlines() if t.strip()]
-
-
-def build_index(repo: Path, tags: list[str]) -> dict[str, dict[str, str]]:
-    """blob-hash -> {tag: path-in-tag} across every tag's ngargparser/ subtree."""
-    index: dict[str, dict[str, str]] = {}
-    for tag in tags:
-        out = run_git(repo, "ls-tree", "-r", tag, "--", INDEX_PATHSPEC)
-        for line in out.splitlines():
-            # "<mode> blob <sha>\t<path>"
-            meta, _, path = line.partition("\t")
-            parts = meta.split()
-            if len(parts) < 3 or parts[1] != "blob":
-                continue
-            index.setdefault(parts[2], {}).setdefault(tag, path)
+    return list(tag_refs(repo))
+
+
+class TreeReader:
+    """Lists the blobs under tag trees through one `git cat-file --batch` process.
+
+    Trees are read object by object (one request, then its answer), and each
+    tree's listing is kept, so a subtree shared by many tags is only read once.
+    """
+
+    def __init__(self, repo: Path):
+        self.proc = subprocess.Popen(
+            ["git", "-C", str(repo), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self.listings: dict[str, list[tuple[str, str]]] = {}
+
+    def _read(self, name: str) -> tuple[str, str, bytes] | None:
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        self.proc.stdin.write(name.encode() + b"\n")
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().decode()
+        if not header:
+            raise SystemExit(f"error: git cat-file exited while reading '{name}'")
+        fields = header.split()
+        if len(fields) != 3:  # "<name> missing" / "<name> ambiguous"
+            return None
+        obj, kind, size = fields
+        data = self.proc.stdout.read(int(size) + 1)[:-1]  # contents, then a newline
+        return obj, kind, data
+
+    def _listing(self, tree: str, data: bytes) -> list[tuple[str, str]]:
+        """(path, blob) pairs under ``tree``, in `git ls-tree -r` order."""
+        listing: list[tuple[str, str]] = []
+        id_len = len(tree) // 2  # 20 bytes for SHA-1, 32 for SHA-256 repos
+        pos = 0
+        while pos < len(data):
+            space = data.index(b" ", pos)
+            nul = data.index(b"\0", space)
+            mode, name = data[pos:space], data[space + 1 : nul].decode(errors="surrogateescape")
+            obj = data[nul + 1 : nul + 1 + id_len].hex()
+            pos = nul + 1 + id_len
+            if mode == b"40000":
+                listing.extend((f"{name}/{path}", blob) for path, blob in self.tree(obj))
+            elif mode != b"160000":  # files and symlinks are blobs; submodules are not
+                listing.append((name, obj))
+        return listing
+
+    def tree(self, obj: str) -> list[tuple[str, str]]:
+        if obj not in self.listings:
+            read = self._read(obj)
+            self.listings[obj] = self._listing(obj, read[2]) if read and read[1] == "tree" else []
+        return self.listings[obj]
+
+    def blobs(self, tag: str, pathspec: str) -> list[tuple[str, str]]:
+        """(path, blob) pairs under ``pathspec`` in ``tag``; none when the tag lacks it."""
+        read = self._read(f"refs/tags/{tag}:{pathspec}")
+        if read is None or read[1] != "tree":
+            return []
+        obj, _kind, data = read
+        if obj not in self.listings:
+            self.listings[obj] = self._listing(obj, data)
+        return [(f"{pathspec}/{path}", blob) for path, blob in self.listings[obj]]
+
+    def close(self) -> None:
+        assert self.proc.stdin is not None
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+def default_cache_path(repo: Path) -> Path:
+    """One cache file per ngargparser checkout, under $XDG_CACHE_HOME (~/.cache)."""
+    base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "ngargparser" / f"tag-index-{hashlib.sha1(str(repo).encode()).hexdigest()[:12]}.json"
+
+
+def load_index_cache(path: Path | None) -> dict:
+    """The cached ``{"tags": {tag: object}, "index": {blob: {tag: path}}}``, or an empty one."""
+    empty: dict = {"version": INDEX_CACHE_VERSION, "tags": {}, "index": {}}
+    if path is None:
+        return empty
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return empty
+    if not isinstance(cache, dict) or cache.get("version") != INDEX_CACHE_VERSION:
+        return empty
+    return cache
+
+
+def save_index_cache(path: Path, cache: dict) -> None:
+    """Write atomically, so concurrent runs never read a half-written cache."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(cache, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"warning: could not write the tag index cache {path}: {e}", file=sys.stderr)
+
+
+def build_index(
+    repo: Path, tags: list[str], refs: dict[str, str] | None = None, cache_path: Path | None = None
+) -> dict[str, dict[str, str]]:
+    """blob-hash -> {tag: path-in-tag} across every tag's ngargparser/ subtree.
+
+    With ``cache_path``, the index is read from and saved to that file: the
+    tags whose ref (``refs``, tag -> object) is unchanged are not read again.
+    """
+    refs = refs if refs is not None else tag_refs(repo)
+    cache = load_index_cache(cache_path)
+    cached_tags: dict[str, str] = cache["tags"]
+    index: dict[str, dict[str, str]] = cache["index"]
+    stale = {tag for tag, obj in cached_tags.items() if refs.get(tag) != obj or tag not in tags}
+    missing = [tag for tag in tags if tag not in cached_tags or tag in stale]
+    if stale:
+        for blob in list(index):
+            for tag in stale & index[blob].keys():
+                del index[blob][tag]
+            if not index[blob]:
+                del index[blob]
+        for tag in stale:
+            del cached_tags[tag]
+    if missing:
+        reader = TreeReader(repo)
+        try:
+            for tag in missing:
+                for path, blob in reader.blobs(tag, INDEX_PATHSPEC):
+                    index.setdefault(blob, {}).setdefault(tag, path)
+                cached_tags[tag] = refs[tag]
+        finally:
+            reader.close()
+        # Keep each blob's tags in version order, as a full rebuild would list them
+        position = {tag: i for i, tag in enumerate(tags)}
+        for blob, paths in index.items():
+            if len(paths) > 1:
+                index[blob] = {tag: paths[tag] for tag in sorted(paths, key=position.__getitem__)}
+    if cache_path is not None and (stale or missing):
+        save_index_cache(cache_path, cache)
     return index
 
 
@@ -143,6 +294,7 @@ def format_range(tags: list[str], subset: set[str]) -> str:
     return ", ".join(ordered)
 
 
+@functools.lru_cache(maxsize=None)  # fleet mode: many targets share a range
 def changed_between(repo: Path, lo: str, hi: str) -> list[str]:
     try:
         out = run_git(repo, "diff", "--name-only", lo, hi, "--", INDEX_PATHSPEC)
@@ -151,12 +303,23 @@ def changed_between(repo: Path, lo: str, hi: str) -> list[str]:
         return []
 
 
-def fingerprint(target: Path, repo: Path):
-    tags = list_tags(repo)
+def load_tag_index(repo: Path, cache_path: Path | None = None) -> tuple[list[str], dict[str, dict[str, str]]]:
+    """(tags in version order, blob-hash -> {tag: path}) for ``repo``."""
+    refs = tag_refs(repo)
+    tags = list(refs)
     if not tags:
         raise SystemExit(f"error: no git tags found in ngargparser repo '{repo}'")
-    index = build_index(repo, tags)
-    target_hashes, markers = scan_target(target)
+    return tags, build_index(repo, tags, refs, cache_path)
+
+
+def fingerprint(target: Path, repo: Path, cache_path: Path | None = None, tag_index=None, scan=None):
+    """Match ``target``'s files against the tag index.
+
+    Fleet mode passes the shared ``tag_index`` (see :func:`load_tag_index`) and the
+    ``scan`` (:func:`scan_target`'s result) a pool worker already made.
+    """
+    tags, index = tag_index if tag_index is not None else load_tag_index(repo, cache_path)
+    target_hashes, markers = scan if scan is not None else scan_target(target)
 
     matches = []  # list of dicts: {file, template_path, tags(set)}
     for h, relpath in target_hashes.items():
@@ -190,10 +353,8 @@ def fingerprint(target: Path, repo: Path):
     }
 
 
-def detect(target: Path, repo: Path, force_fingerprint: bool):
-    result: dict = {"target": str(target), "ngargparser_repo": str(repo)}
-
-    # Layer 1: authoritative stamp ---------------------------------------------------
+def read_stamps(target: Path) -> tuple[str | None, str | None]:
+    """(pyproject.toml scaffold_version stamp, README badge version); None when absent."""
     stamp = badge = None
     pyproject = target / "pyproject.toml"
     if pyproject.is_file():
@@ -206,6 +367,16 @@ def detect(target: Path, repo: Path, force_fingerprint: bool):
             if m:
                 badge = m.group(1)
                 break
+    return stamp, badge
+
+
+def detect(
+    target: Path, repo: Path, force_fingerprint: bool, cache_path: Path | None = None, tag_index=None, scan=None
+):
+    result: dict = {"target": str(target), "ngargparser_repo": str(repo)}
+
+    # Layer 1: authoritative stamp ---------------------------------------------------
+    stamp, badge = read_stamps(target)
     result["scaffold_version_stamp"] = stamp
     result["readme_badge_version"] = badge
 
@@ -215,7 +386,7 @@ def detect(target: Path, repo: Path, force_fingerprint: bool):
         return result
 
     # Layer 2: content fingerprint ---------------------------------------------------
-    fp = fingerprint(target, repo)
+    fp = fingerprint(target, repo, cache_path, tag_index, scan)
     result["method"] = "fingerprint"
     result["files_scanned"] = fp["total_files"]
     result["framework_markers"] = fp["markers"]
@@ -242,6 +413,70 @@ def detect(target: Path, repo: Path, force_fingerprint: bool):
     return result
 
 
+# --- fleet mode -----------------------------------------------------------------------
+def _is_glob(pattern: str) -> bool:
+    return any(c in pattern for c in "*?[")
+
+
+def expand_targets(patterns: list[str]) -> list[Path]:
+    """Targets as given, with quoted globs ('~/tools/*') expanded to their directories."""
+    targets: list[Path] = []
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        if _is_glob(pattern) and not os.path.isdir(pattern):
+            targets.extend(Path(p).resolve() for p in sorted(glob.glob(pattern)) if os.path.isdir(p))
+        else:
+            targets.append(Path(pattern).resolve())
+    return list(dict.fromkeys(targets))
+
+
+def as_tag(version: str, tags: list[str]) -> str:
+    """``version`` spelled as its tag, so a ``0.1.0`` stamp and a ``v0.1.0`` fingerprint agree."""
+    return f"v{version}" if version not in tags and f"v{version}" in tags else version
+
+
+def detect_fleet(
+    targets: list[Path], repo: Path, force_fingerprint: bool, cache_path: Path | None = None, jobs: int | None = None
+) -> dict:
+    """Detect every target: one tag index for all, project hashing on a process pool.
+
+    Returns the combined report: every target's :func:`detect` result (or its
+    ``error``) and a summary grouping the targets by estimate.
+    """
+    missing = [t for t in targets if not t.is_dir()]
+    found = [t for t in targets if t.is_dir()]
+    # Stamped projects are settled without hashing anything (unless forced)
+    to_scan = [t for t in found if force_fingerprint or not read_stamps(t)[0]]
+    tag_index = load_tag_index(repo, cache_path) if to_scan else None
+    scans: dict[Path, tuple[dict[str, str], list[str]]] = {}
+    if to_scan:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            scans = dict(zip(to_scan, pool.map(scan_target, to_scan)))
+
+    results_by_target = {t: detect(t, repo, force_fingerprint, tag_index=tag_index, scan=scans.get(t)) for t in found}
+    results_by_target.update({t: {"target": str(t), "error": "not a directory"} for t in missing})
+    results = [results_by_target[t] for t in targets]
+    tags = tag_index[0] if tag_index else list_tags(repo)
+
+    by_estimate: dict[str, list[str]] = {}
+    for r in results:
+        if "error" in r:
+            key = "error"
+        elif r.get("estimate"):
+            key = as_tag(r["estimate"], tags) if r["method"] == "stamp" else r["estimate"]
+        elif r.get("conflict"):
+            key = f"mixed (last sync ≈ {r.get('last_sync_estimate')})"
+        else:
+            key = "unknown"
+        by_estimate.setdefault(key, []).append(r["target"])
+    return {
+        "ngargparser_repo": str(repo),
+        "tags": tags,
+        "targets": results,
+        "summary": {"total": len(results), "by_estimate": by_estimate},
+    }
+
+
 # --- pretty printing ------------------------------------------------------------------
 C = {"g": "\033[92m", "y": "\033[93m", "r": "\033[91m", "b": "\033[1m", "x": "\033[0m"}
 
@@ -306,9 +541,32 @@ def print_report(r: dict) -> None:
             print(f"   doesn't contain — {', '.join(changes)})")
 
 
+def print_fleet_report(report: dict) -> None:
+    print(_c(f"{report['summary']['total']} projects", "b") + f" (ngargparser repo: {report['ngargparser_repo']})")
+    print()
+    width = max(len(r["target"]) for r in report["targets"])
+    for r in report["targets"]:
+        if "error" in r:
+            print(f"  {r['target']:<{width}}  {_c('error: ' + r['error'], 'r')}")
+        elif r.get("estimate"):
+            print(f"  {r['target']:<{width}}  {_c(r['estimate'], 'g')}  ({r['method']})")
+        elif r.get("conflict"):
+            print(f"  {r['target']:<{width}}  {_c('mixed', 'y')}, last sync ≈ {r.get('last_sync_estimate')}")
+        else:
+            print(f"  {r['target']:<{width}}  {_c('indeterminate', 'y')}")
+    print()
+    for estimate, targets in report["summary"]["by_estimate"].items():
+        print(f"  {estimate}: {len(targets)}")
+
+
 def main(argv=None) -> int:
     p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
-    p.add_argument("target", nargs="?", default=".", help="Project directory (default: cwd)")
+    p.add_argument(
+        "target",
+        nargs="*",
+        default=["."],
+        help="Project directories or quoted globs (default: cwd); several targets run in fleet mode",
+    )
     p.add_argument(
         "--repo",
         default=str(Path(__file__).resolve().parents[1]),
@@ -320,18 +578,37 @@ def main(argv=None) -> int:
         help="Run the content fingerprint even when a scaffold_version stamp exists",
     )
     p.add_argument("--json", action="store_true", help="Emit the structured result as JSON")
+    p.add_argument(
+        "--cache",
+        help="Tag index cache file (default: $XDG_CACHE_HOME/ngargparser/tag-index-<repo hash>.json)",
+    )
+    p.add_argument("--no-cache", action="store_true", help="Rebuild the tag index in memory; read and write no cache")
+    p.add_argument("--jobs", "-j", type=int, help="Fleet mode: processes hashing projects (default: every CPU)")
     args = p.parse_args(argv)
 
-    target = Path(args.target).resolve()
+    targets = expand_targets(args.target)
     repo = Path(args.repo).resolve()
-    if not target.is_dir():
-        print(f"error: target '{target}' is not a directory", file=sys.stderr)
+    if not targets:
+        print(f"error: no project directory matches {' '.join(args.target)}", file=sys.stderr)
         return 2
     if not (repo / ".git").exists():
         print(f"error: --repo '{repo}' is not a git checkout of ngargparser", file=sys.stderr)
         return 2
 
-    r = detect(target, repo, args.force_fingerprint)
+    cache_path = None if args.no_cache else Path(args.cache) if args.cache else default_cache_path(repo)
+    if len(targets) > 1 or len(args.target) > 1 or _is_glob(args.target[0]):
+        report = detect_fleet(targets, repo, args.force_fingerprint, cache_path, args.jobs)
+        if args.json:
+            print(json.dumps(report, indent=2, default=list))
+        else:
+            print_fleet_report(report)
+        return 1 if "error" in report["summary"]["by_estimate"] else 0
+
+    target = targets[0]
+    if not target.is_dir():
+        print(f"error: target '{target}' is not a directory", file=sys.stderr)
+        return 2
+    r = detect(target, repo, args.force_fingerprint, cache_path)
     if args.json:
         # sets aren't JSON-serializable; report already flattened them to strings
         print(json.dumps(r, indent=2, default=list))
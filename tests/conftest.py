@@ -1,4 +1,6 @@
+import argparse
 import re
+import sys
 from argparse import Namespace
 
 import pytest
@@ -45,3 +47,52 @@ def scaffolded_project(in_tmp_dir, monkeypatch):
     project_dir = in_tmp_dir / "demo"
     monkeypatch.chdir(project_dir)
     return project_dir
+
+
+@pytest.fixture
+def ngparser(scaffolded_project, monkeypatch):
+    """The generated project's ``core.NGArgumentParser`` module, imported in-process.
+
+    Parsers also get ``parse_args_list(argv)``, since ``NGArgumentParser.parse_args()``
+    reads ``sys.argv``.
+    """
+    (scaffolded_project / "paths.py").write_text("")
+    monkeypatch.syspath_prepend(str(scaffolded_project / "src"))
+
+    def parse_args_list(self, argv):
+        monkeypatch.setattr(sys, "argv", ["run_demo.py", *argv])
+        return self.parse_args()
+
+    monkeypatch.setattr(argparse.ArgumentParser, "parse_args_list", parse_args_list, raising=False)
+    import core.NGArgumentParser as module
+
+    yield module
+    for name in list(sys.modules):
+        if name == "core" or name.startswith("core."):
+            del sys.modules[name]
+
+
+@pytest.fixture
+def deep_wide_tree(tmp_path):
+    """A results-dir-shaped tree: many wide job-output dirs plus one deep chain.
+
+    Returns ``(root, leaf)`` where ``leaf`` is the bottom of the deep chain.
+    Shaped like a real run (``predict-outputs/`` holding thousands of files,
+    a vendored ``libs/`` tree) so unbounded walks show up as slow tests.
+    """
+    root = tmp_path / "results"
+    outputs = root / "predict-outputs"
+    outputs.mkdir(parents=True)
+    for i in range(2000):
+        (outputs / f"result.{i}.json").write_text("{}")
+    for i in range(50):
+        job_dir = root / f"job-{i}"
+        job_dir.mkdir()
+        for j in range(20):
+            (job_dir / f"unit.{j}.json").write_text("{}")
+    (root / "libs" / "vendored" / "pkg").mkdir(parents=True)
+    leaf = root
+    for depth in range(12):
+        leaf = leaf / f"level{depth}"
+    leaf.mkdir(parents=True)
+    return root, leaf
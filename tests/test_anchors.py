@@ -0,0 +1,104 @@
+"""Bounded anchor resolution (ngargparser/anchors.py → src/core/anchors.py)."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ngargparser import anchors
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.delenv(anchors.ANCHOR_ROOT_ENV, raising=False)
+    anchors.clear_cache()
+    yield
+    anchors.clear_cache()
+
+
+def count_scandirs(monkeypatch):
+    calls = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        calls.append(str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(anchors.os, "scandir", counting_scandir)
+    return calls
+
+
+def test_finds_anchor_in_ancestor(deep_wide_tree):
+    root, leaf = deep_wide_tree
+    (root / "LICENSE").write_text("x")
+    assert anchors.find_app_root(leaf) == str(root)
+
+
+def test_finds_anchor_in_shallow_subtree(tmp_path):
+    (tmp_path / "app" / "src").mkdir(parents=True)
+    (tmp_path / "app" / "LICENSE").write_text("x")
+    assert anchors.find_app_root(tmp_path, max_depth=1) == str(tmp_path / "app")
+
+
+def test_anchor_beyond_max_depth_is_not_found(tmp_path):
+    deep = tmp_path / "a" / "b" / "c" / "d"
+    deep.mkdir(parents=True)
+    (deep / "ANCHOR").write_text("x")
+    assert anchors.find_app_root(tmp_path, ["ANCHOR"], max_depth=2) is None
+    anchors.clear_cache()
+    assert anchors.find_app_root(tmp_path, ["ANCHOR"], max_depth=4) == str(deep)
+
+
+def test_pruned_dirs_are_never_entered(deep_wide_tree, monkeypatch):
+    root, _ = deep_wide_tree
+    (root / "predict-outputs" / "nested").mkdir()
+    (root / "predict-outputs" / "nested" / "ANCHOR").write_text("x")
+    calls = count_scandirs(monkeypatch)
+    assert anchors.find_file(root, "ANCHOR", max_depth=None) is None
+    scanned_parts = {part for call in calls for part in Path(call).relative_to(root).parts}
+    assert not scanned_parts & anchors.PRUNE_DIRS
+
+
+def test_ancestor_levels_do_not_rescan_searched_child(deep_wide_tree, monkeypatch):
+    _, leaf = deep_wide_tree
+    calls = count_scandirs(monkeypatch)
+    anchors.find_app_root(leaf, ["NO_SUCH_ANCHOR"], max_depth=2)
+    assert len(calls) == len(set(calls)), "a directory was scanned twice"
+
+
+def test_env_override_skips_search(deep_wide_tree, monkeypatch):
+    root, leaf = deep_wide_tree
+    monkeypatch.setenv(anchors.ANCHOR_ROOT_ENV, str(root))
+    calls = count_scandirs(monkeypatch)
+    assert anchors.find_app_root(leaf) == str(root)
+    assert calls == []
+
+
+def test_env_override_scopes_file_lookup(tmp_path, monkeypatch):
+    (tmp_path / "app" / "conf").mkdir(parents=True)
+    (tmp_path / "app" / "conf" / "paths.py").write_text("")
+    (tmp_path / "elsewhere").mkdir()
+    monkeypatch.setenv(anchors.ANCHOR_ROOT_ENV, str(tmp_path / "app"))
+    found = anchors.find_file(tmp_path / "elsewhere", "paths.py")
+    assert found == str(tmp_path / "app" / "conf" / "paths.py")
+
+
+def test_find_file_ignores_directories_with_that_name(tmp_path):
+    (tmp_path / "sub" / "paths.py").mkdir(parents=True)
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "paths.py").write_text("")
+    assert anchors.find_file(tmp_path, "paths.py") == str(tmp_path / "other" / "paths.py")
+
+
+def test_results_are_cached_per_process(deep_wide_tree, monkeypatch):
+    root, leaf = deep_wide_tree
+    (root / "LICENSE").write_text("x")
+    anchors.find_app_root(leaf)
+    calls = count_scandirs(monkeypatch)
+    assert anchors.find_app_root(leaf) == str(root)
+    assert calls == []
+
+
+def test_find_file_requires_filename():
+    with pytest.raises(ValueError):
+        anchors.find_file()
@@ -0,0 +1,95 @@
+"""--assume-valid: the validation pipeline skips filesystem and schema checks."""
+
+import argparse
+
+import pytest
+
+
+@pytest.fixture
+def parser(ngparser, monkeypatch):
+    monkeypatch.delenv("NGARGPARSER_ASSUME_VALID", raising=False)
+    parser = ngparser.NGArgumentParser()
+    parser.add_predict_subparser(help="Run one unit.")
+    return parser
+
+
+def test_path_validators_are_skipped(parser, tmp_path):
+    argv = ["postprocess", "-i", str(tmp_path / "missing"), "-p", str(tmp_path / "missing")]
+
+    with pytest.raises(SystemExit):
+        parser.parse_args_list(argv)
+    args = parser.parse_args_list([*argv, "--assume-valid"])
+
+    assert args.assume_valid_flag is True
+    assert args.postprocess_input_dir == tmp_path / "missing"
+    # Not skippable: postprocess still needs exactly one input source.
+    with pytest.raises(SystemExit):
+        parser.parse_args_list(["postprocess", "-p", str(tmp_path), "--assume-valid"])
+
+
+def test_preprocess_builds_the_output_tree_without_validating(parser, tmp_path):
+    calls = []
+    parser.add_validation_step(lambda args: calls.append(args.subcommand), subcommands=["preprocess"])
+    (tmp_path / "input.json").write_text("{}")
+    argv = ["preprocess", "-j", str(tmp_path / "input.json"), "--inputs-dir", str(tmp_path / "missing")]
+
+    # An abbreviation argparse accepts skips the type= validators too
+    for flag in ("--assume-valid", "--assume"):
+        out = tmp_path / flag.strip("-")
+        args = parser.parse_args_list([*argv, "-o", str(out), flag])
+        args.input_json.close()
+        assert args.assume_valid_flag
+        assert args.preprocess_inputs_dir == tmp_path / "missing"
+        assert (out / "predict-inputs" / "params").is_dir()
+        assert (out / "predict-inputs" / "data").is_dir()
+
+    assert calls == []
+    with pytest.raises(SystemExit):
+        parser.parse_args_list([*argv, "-o", str(tmp_path / "checked")])
+
+
+def test_skippable_steps_and_the_environment_variable(ngparser, parser, monkeypatch):
+    calls = []
+
+    def check_schema(args):
+        calls.append(args.subcommand)
+        raise argparse.ArgumentTypeError("input does not match the schema")
+
+    parser.add_validation_step(check_schema, subcommands=["predict"])
+
+    with pytest.raises(SystemExit):
+        parser.parse_args_list(["predict"])
+    assert parser.parse_args_list(["predict", "--assume-valid"]).assume_valid_flag
+    monkeypatch.setenv("NGARGPARSER_ASSUME_VALID", "1")
+    parser.parse_args_list(["predict"])
+
+    assert calls == ["predict"]
+    assert ngparser.validators.assume_valid()
+
+
+def test_decorated_tool_validators_return_the_converted_value(ngparser):
+    validators = ngparser.validators
+
+    @validators.skip_if_assume_valid(convert=str.upper)
+    def validate_allele(name):
+        raise argparse.ArgumentTypeError(f"unknown allele {name}")
+
+    with pytest.raises(argparse.ArgumentTypeError):
+        validate_allele("hla-a*02:01")
+    validators.set_assume_valid(True)
+    assert validate_allele("hla-a*02:01") == "HLA-A*02:01"
+    assert validators.validate_file("/no/such/file") == validators.Path("/no/such/file")
+
+
+def test_preprocess_dir_validator_still_creates_the_tree(ngparser, parser, tmp_path):
+    parser.parser_preprocess.add_argument("--work-dir", type=ngparser.validators.validate_preprocess_dir)
+    (tmp_path / "input.json").write_text("{}")
+    (tmp_path / "paths.py").write_text("")
+    work = tmp_path / "work"
+
+    argv = ["preprocess", "-j", str(tmp_path / "input.json"), "-o", str(tmp_path / "out"), "--work-dir", str(work)]
+
+    args = parser.parse_args_list([*argv, "--assume"])
+    args.input_json.close()
+
+    assert sorted(p.name for p in work.iterdir()) == ["aggregate", "predict-inputs", "predict-outputs", "results"]
@@ -0,0 +1,450 @@
+"""Build staging engine (ngargparser/build.py → scripts/core/build.py)."""
+
+import gzip
+import io
+import json
+import os
+import shutil
+import subprocess
+import tarfile
+
+import pytest
+
+from ngargparser import build
+
+
+def make_tree(root, files):
+    for rel in files:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+
+
+def staged_files(build_dir):
+    found = set()
+    for dirpath, _dirnames, filenames in os.walk(build_dir, followlinks=True):
+        for name in filenames:
+            found.add(os.path.relpath(os.path.join(dirpath, name), build_dir))
+    return found
+
+
+def test_exclusion_sets_match_the_listed_paths():
+    exclusions = build.Exclusions(["libs/pkg/tests/", "libs/pkg/tests/t.py", "src/x.pyc", "top.log"])
+
+    assert exclusions.is_excluded("libs/pkg/tests/")
+    assert not exclusions.is_excluded("libs/pkg/tests")
+    assert exclusions.subtree_has_exclusions("libs/pkg")
+    assert exclusions.subtree_has_exclusions("libs/pkg/tests")
+    assert exclusions.subtree_has_exclusions("src")
+    assert not exclusions.subtree_has_exclusions("libs/pkg/core")
+    assert not exclusions.subtree_has_exclusions("lib")
+
+
+def test_evaluate_exclusions_prunes_excluded_directories(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    make_tree(
+        project,
+        [
+            "src/run_demo.py",
+            "src/debug.log",
+            "src/important.log",
+            "data/raw/a.tsv",
+            "data/keep.txt",
+            "libs/pkg/.git/HEAD",
+            "build/old.tar.gz",
+            ".git/HEAD",
+        ],
+    )
+    repo = tmp_path / "repo"
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    (repo / ".gitignore").write_text(".*\ndata/\n!data/keep.txt\n*.log\n!important.log\n")
+    listed = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(build.os, "scandir", lambda path: listed.append(path) or real_scandir(path))
+
+    candidates, excluded = build.evaluate_exclusions(str(project), str(repo), batch=2)
+
+    assert sorted(candidates) == [
+        "data/",
+        "libs/",
+        "libs/pkg/",
+        "libs/pkg/.git/",
+        "src/",
+        "src/debug.log",
+        "src/important.log",
+        "src/run_demo.py",
+    ]
+    # A file cannot be re-included from an excluded directory, so data/ is never read
+    assert sorted(excluded) == ["data/", "libs/pkg/.git/", "src/debug.log"]
+    assert not any(path.endswith(("data", ".git")) for path in listed)
+
+
+def test_stage_project(tmp_path):
+    project = tmp_path / "project"
+    make_tree(
+        project,
+        [
+            "src/run_demo.py",
+            "src/core/NGArgumentParser.py",
+            "src/core/__pycache__/x.pyc",
+            "libs/clean/mod.py",
+            "libs/clean/sub/deep.py",
+            "libs/mixed/keep.py",
+            "libs/mixed/tests/test_it.py",
+            "libs/mixed/.git/HEAD",
+            "data/table.tsv",
+            "notes.log",
+        ],
+    )
+    (project / "empty").mkdir()
+    excluded = [
+        "src/core/__pycache__/",
+        "src/core/__pycache__/x.pyc",
+        "libs/mixed/tests/",
+        "libs/mixed/tests/test_it.py",
+        "libs/mixed/.git/",
+        "libs/mixed/.git/HEAD",
+        "notes.log",
+    ]
+    build_dir = tmp_path / "build" / "tool"
+    logged = []
+
+    build.Stager(build.Exclusions(excluded), logged.append).stage_project(
+        str(project), str(build_dir), ["libs", "run_*.py"]
+    )
+
+    assert staged_files(build_dir) == {
+        "src/run_demo.py",
+        "src/core/NGArgumentParser.py",
+        "libs/clean/mod.py",
+        "libs/clean/sub/deep.py",
+        "libs/clean/__init__.py",
+        "libs/clean/sub/__init__.py",
+        "libs/mixed/keep.py",
+        "libs/mixed/__init__.py",
+        "data/table.tsv",
+    }
+    # run_*.py and libs/ are copies; src/ is staged file by file, the rest is linked whole.
+    assert not (build_dir / "src" / "run_demo.py").is_symlink()
+    assert (build_dir / "src" / "core" / "NGArgumentParser.py").is_symlink()
+    assert not (build_dir / "src" / "core").is_symlink()
+    assert not (build_dir / "libs" / "clean").is_symlink()
+    assert (build_dir / "data").is_symlink()
+    assert (build_dir / "empty").is_symlink()
+    assert "Copying directory: libs/clean" in logged
+    assert "Copying file: libs/mixed/keep.py" in logged
+
+
+def test_ensure_init_files_skips_existing_and_symlinked_dirs(tmp_path):
+    make_tree(tmp_path, ["pkg/__init__.py", "pkg/a/mod.py", "pkg/b/c/mod.py", "elsewhere/mod.py"])
+    (tmp_path / "pkg" / "link").symlink_to(tmp_path / "elsewhere")
+
+    assert build.ensure_init_files(tmp_path / "pkg") == 3
+    assert (tmp_path / "pkg" / "__init__.py").read_text() == "pkg/__init__.py"
+    assert (tmp_path / "pkg" / "b" / "c" / "__init__.py").read_text() == build.INIT_FILE_CONTENT
+    assert not (tmp_path / "elsewhere" / "__init__.py").exists()
+
+
+def stage_incremental(project, build_dir, manifest_path, excluded=()):
+    manifest = build.prepare_incremental(str(manifest_path), str(build_dir), "key")
+    logged = []
+    build.Stager(build.Exclusions(excluded), logged.append, manifest).stage_project(
+        str(project), str(build_dir), ["libs", "run_*.py"]
+    )
+    manifest.save()
+    return manifest, logged
+
+
+def test_incremental_stage_only_touches_changed_entries(tmp_path):
+    project = tmp_path / "project"
+    make_tree(project, ["src/run_demo.py", "libs/pkg/a.py", "libs/pkg/b.py", "libs/pkg/gone.py", "data/x.tsv"])
+    build_dir = tmp_path / "build" / "tool"
+    manifest_path = tmp_path / "build" / ".ngbuild" / "tool.json"
+    manifest, _ = stage_incremental(project, build_dir, manifest_path)
+    assert "libs/pkg/a.py" in manifest.restaged
+    assert not (build_dir / "libs" / "pkg").is_symlink()
+
+    (project / "libs" / "pkg" / "a.py").write_text("changed")
+    os.utime(project / "libs" / "pkg" / "b.py", ns=(1, 1))  # same content, new mtime
+    (project / "libs" / "pkg" / "gone.py").unlink()
+    manifest, logged = stage_incremental(project, build_dir, manifest_path)
+
+    assert manifest.restaged == ["libs/pkg/a.py", "libs/pkg/gone.py"]
+    assert logged == [
+        "Merging project libs/* into " + str(build_dir / "libs"),
+        "Copying file: libs/pkg/a.py",
+        "Removing: libs/pkg/gone.py",
+    ]
+    assert (build_dir / "libs" / "pkg" / "a.py").read_text() == "changed"
+    assert not (build_dir / "libs" / "pkg" / "gone.py").exists()
+    assert manifest.entries["libs/pkg/b.py"]["mtime_ns"] == 1
+    assert staged_files(build_dir) == {
+        "src/run_demo.py",
+        "libs/pkg/a.py",
+        "libs/pkg/b.py",
+        "libs/pkg/__init__.py",
+        "data/x.tsv",
+    }
+
+    # A different key (e.g. a new TOOL_VERSION) starts from an empty build dir.
+    build.prepare_incremental(str(manifest_path), str(build_dir), "other")
+    assert not build_dir.exists()
+
+
+def test_incremental_stage_replaces_a_linked_dir_without_writing_through_it(tmp_path):
+    project = tmp_path / "project"
+    make_tree(project, ["data/keep.tsv", "data/skip.log"])
+    build_dir = tmp_path / "build" / "tool"
+    manifest_path = tmp_path / "manifest.json"
+    stage_incremental(project, build_dir, manifest_path)
+    assert (build_dir / "data").is_symlink()
+
+    manifest, _ = stage_incremental(project, build_dir, manifest_path, excluded=["data/skip.log"])
+
+    assert not (build_dir / "data").is_symlink()
+    assert (build_dir / "data" / "keep.tsv").is_symlink()
+    assert (project / "data" / "skip.log").exists()
+    assert staged_files(build_dir) == {"data/keep.tsv"}
+
+
+def test_cached_step_reruns_only_when_its_inputs_change(tmp_path):
+    project = tmp_path / "project"
+    make_tree(project, ["src/run_demo.py", "libs/pkg/a.py"])
+    build_dir = tmp_path / "build" / "tool"
+    manifest_path = tmp_path / "manifest.json"
+
+    def hook(manifest, key="k"):
+        if build.check_step(manifest, str(build_dir), "hooks", key, watch=["libs"]):
+            return False
+        # Patches a staged copy and generates a file.
+        with open(build_dir / "src" / "run_demo.py", "a") as f:
+            f.write(" patched")
+        (build_dir / "libs" / "generated.txt").write_text("gen")
+        build.record_step(manifest, str(build_dir), "hooks")
+        return True
+
+    manifest, _ = stage_incremental(project, build_dir, manifest_path)
+    assert hook(manifest)
+    assert manifest.steps["hooks"]["outputs"] == ["libs/generated.txt"]
+    assert manifest.steps["hooks"]["touched"] == ["src/run_demo.py"]
+
+    # Nothing changed: the patched file is kept and the hook is skipped.
+    manifest, _ = stage_incremental(project, build_dir, manifest_path)
+    assert manifest.restaged == []
+    assert not hook(manifest)
+    assert (build_dir / "src" / "run_demo.py").read_text() == "src/run_demo.py patched"
+
+    # A new key reruns it on a clean slate: the patch is not applied twice.
+    manifest, _ = stage_incremental(project, build_dir, manifest_path)
+    assert hook(manifest, key="k2")
+    assert (build_dir / "src" / "run_demo.py").read_text() == "src/run_demo.py patched"
+
+    # So does a change under a watched path.
+    (project / "libs" / "pkg" / "a.py").write_text("changed")
+    manifest, _ = stage_incremental(project, build_dir, manifest_path)
+    assert manifest.restaged == ["libs/pkg/a.py"]
+    assert hook(manifest, key="k2")
+    assert (build_dir / "libs" / "generated.txt").read_text() == "gen"
+
+
+def test_parallel_gzip_is_standard_gzip_and_independent_of_jobs():
+    data = b"".join(b"line %d of a compressible payload\n" % i for i in range(200_000))
+    outputs = []
+    for jobs in (1, 4):
+        out = io.BytesIO()
+        with build.ParallelGzipWriter(out, jobs=jobs, block_size=64 * 1024) as gz:
+            for start in range(0, len(data), 10_000):
+                gz.write(data[start : start + 10_000])
+        outputs.append(out.getvalue())
+
+    assert outputs[0] == outputs[1]
+    assert gzip.decompress(outputs[0]) == data
+    assert len(outputs[0]) < len(data) // 5
+
+
+@pytest.mark.parametrize(
+    "compression",
+    [
+        "python",
+        pytest.param("zstd", marks=pytest.mark.skipif(not shutil.which("zstd"), reason="zstd not installed")),
+    ],
+)
+def test_write_tarball_follows_links_in_sorted_order(tmp_path, compression):
+    make_tree(tmp_path / "src", ["b.txt", "a/z.txt", "a/y.txt"])
+    tool = tmp_path / "build" / "tool-1"
+    tool.mkdir(parents=True)
+    (tool / "data").symlink_to(tmp_path / "src")
+    (tool / "VERSION").write_text("1\n")
+    output = tmp_path / "build" / f"tool-1{build.COMPRESSIONS[compression]}"
+
+    build.write_tarball(str(tmp_path / "build"), "tool-1", str(output), compression, jobs=2)
+
+    if compression == "zstd":
+        subprocess.run(["zstd", "-q", "-d", "-o", str(tmp_path / "tool.tar"), str(output)], check=True)
+        output = tmp_path / "tool.tar"
+    with tarfile.open(output) as tar:
+        names = tar.getnames()
+        assert tar.getmember("tool-1/data").isdir()
+        assert tar.extractfile("tool-1/data/a/y.txt").read() == b"a/y.txt"
+    assert names == [
+        "tool-1",
+        "tool-1/VERSION",
+        "tool-1/data",
+        "tool-1/data/a",
+        "tool-1/data/a/y.txt",
+        "tool-1/data/a/z.txt",
+        "tool-1/data/b.txt",
+    ]
+    assert not os.path.exists(f"{output}.tmp")
+
+
+def test_write_tarball_reuses_the_cached_artifact_of_an_unchanged_tree(tmp_path):
+    tool = tmp_path / "build" / "tool-1"
+    make_tree(tool, ["a.txt", "bin/run"])
+    (tool / "bin" / "run").chmod(0o775)
+    output, cache = str(tmp_path / "build" / "tool-1.tar.gz"), str(tmp_path / "cache")
+
+    def package(key="1.0"):
+        return build.write_tarball(str(tmp_path / "build"), "tool-1", output, "python", 1, 42, cache, key)
+
+    assert package() == "python"
+    with tarfile.open(output) as tar:
+        assert [(m.mode, m.mtime) for m in tar.getmembers()] == [(0o755, 42), (0o644, 42), (0o755, 42), (0o755, 42)]
+    first = open(output, "rb").read()
+
+    os.utime(tool / "a.txt", ns=(1, 1))
+    assert package() == "cache"
+    assert open(output, "rb").read() == first
+    assert package(key="2.0") == "python"
+    (tool / "a.txt").write_text("changed")
+    assert package() == "python"
+    assert len(os.listdir(cache)) == 3
+
+
+def test_hardlink_staging_copies_what_hooks_modify(tmp_path):
+    project = tmp_path / "project"
+    make_tree(project, ["libs/pkg/a.bin", "libs/pkg/b.bin", "libs/pkg/config.py", "src/run_demo.py"])
+    build_dir = tmp_path / "build" / "tool"
+    stager = build.Stager(build.Exclusions(), link_mode="hardlink", hook_modifies=["config.py", "src/run_*.py"])
+
+    stager.stage_project(str(project), str(build_dir), ["libs", "run_*.py"])
+
+    def linked_to_source(rel):
+        return os.path.samefile(build_dir / rel, project / rel)
+
+    assert linked_to_source("libs/pkg/a.bin")
+    assert not linked_to_source("libs/pkg/config.py")
+    assert not linked_to_source("src/run_demo.py")
+    linked = tmp_path / "linked.json"
+    build.save_linked(stager.linked, linked)
+    assert build.verify_links(linked) == []
+
+    # Replacing a linked file (like sed -i) is safe; writing through it is not.
+    staged = build_dir / "libs" / "pkg"
+    (staged / "a.new").write_text("replaced")
+    os.replace(staged / "a.new", staged / "a.bin")
+    with open(staged / "b.bin", "a") as f:
+        f.write(" appended")
+
+    assert build.verify_links(linked) == [str(staged / "b.bin")]
+    assert (project / "libs" / "pkg" / "a.bin").read_text() == "libs/pkg/a.bin"
+
+
+def test_auto_link_mode_falls_back_to_a_copy(tmp_path):
+    project = tmp_path / "project"
+    make_tree(project, ["libs/pkg/mod.py"])
+    build_dir = tmp_path / "build"
+
+    build.Stager(build.Exclusions(), link_mode="auto").stage_project(str(project), str(build_dir), ["libs"])
+
+    assert (build_dir / "libs" / "pkg" / "mod.py").read_text() == "libs/pkg/mod.py"
+    assert not os.path.samefile(build_dir / "libs" / "pkg" / "mod.py", project / "libs" / "pkg" / "mod.py")
+
+
+def test_build_profile_splits_staging_and_counts_each_step(tmp_path):
+    project = tmp_path / "project"
+    make_tree(project, ["libs/pkg/a.py", "libs/pkg/b.py", "data/x.tsv"])
+    stager = build.Stager(build.Exclusions())
+    stager.stage_project(str(project), str(tmp_path / "build" / "tool"), ["libs"])
+    assert stager.stats["libs_merge"]["files"] == 2
+    assert stager.stats["libs_merge"]["bytes"] == len("libs/pkg/a.py") + len("libs/pkg/b.py")
+    assert stager.stats["staging"]["files"] == 1  # data/ is one link
+
+    stats = tmp_path / "stats.json"
+    stats.write_text(json.dumps(dict(stager.stats, libs_merge=dict(stager.stats["libs_merge"], wall_s=0.5))))
+    log = tmp_path / "profile.log"
+    log.write_text(
+        "\n".join(
+            json.dumps(record)
+            for record in [
+                {"name": "staging", "start": 10.0, "time": 10.0},
+                {"name": "hooks", "files": 4, "bytes": 100},
+                {"name": "hooks", "start": 12.0, "time": 13.0},
+                {"name": "finalize", "files": 6, "bytes": 150},
+                {"name": "finalize", "start": 14.0, "time": 15.0},
+            ]
+        )
+    )
+
+    profile = build.build_profile(str(log), str(stats), meta={"tool_dir": "tool"})
+
+    assert profile["tool_dir"] == "tool"
+    assert profile["wall_s"] == 3.0
+    assert [(step["name"], step["wall_s"], step.get("files")) for step in profile["steps"]] == [
+        ("staging", 1.5, 1),
+        ("libs_merge", 0.5, 2),
+        ("hooks", 1.0, 2),
+    ]
+    assert profile["steps"][2]["bytes"] == 50
+    assert build.format_profile(profile)[2].split()[-1] == "staging"
+
+
+def hook_step(name, cmd, inputs=(), outputs=(), deps=()):
+    return {"name": name, "cmd": cmd, "inputs": list(inputs), "outputs": list(outputs), "deps": list(deps)}
+
+
+def test_order_hook_steps_rejects_bad_dependencies():
+    steps = [hook_step("merge", "", deps=["a", "b"]), hook_step("a", ""), hook_step("b", "", deps=["a"])]
+    assert [step["name"] for step in build.order_hook_steps(steps)] == ["a", "b", "merge"]
+
+    with pytest.raises(build.HookStepError, match="'c', which is not in HOOK_STEPS"):
+        build.order_hook_steps([hook_step("a", "", deps=["c"])])
+    with pytest.raises(build.HookStepError, match="a -> b -> a"):
+        build.order_hook_steps([hook_step("a", "", deps=["b"]), hook_step("b", "", deps=["a"])])
+
+
+def test_hook_runner_reuses_cached_outputs_and_skips_after_a_failure(tmp_path):
+    project, build_dir = tmp_path / "project", tmp_path / "build"
+    make_tree(project, ["models/m.txt"])
+    (build_dir / "libs").mkdir(parents=True)
+    steps = [
+        hook_step(
+            "prep", f"cp {project}/models/m.txt prep.txt && echo prep >> {tmp_path}/runs", ["models"], ["libs/prep.txt"]
+        ),
+        hook_step("other", "echo other > other.txt", outputs=["libs/other.txt"]),
+        hook_step("merge", "cat prep.txt other.txt > merged.txt", outputs=["libs/merged.txt"], deps=["prep", "other"]),
+    ]
+
+    def run(steps):
+        shutil.rmtree(build_dir / "libs")
+        (build_dir / "libs").mkdir()
+        runner = build.HookRunner(
+            steps, str(project), str(build_dir), str(tmp_path / "cache"), str(tmp_path / "logs"), 2
+        )
+        return runner.run(), runner.results
+
+    assert run(steps) == ([], {"prep": "ran", "other": "ran", "merge": "ran"})
+    assert run(steps) == ([], {"prep": "cached", "other": "cached", "merge": "cached"})
+    assert (build_dir / "libs" / "merged.txt").read_text() == "models/m.txtother\n"
+    assert (tmp_path / "runs").read_text() == "prep\n"
+
+    # A changed input reruns the step and the steps depending on it
+    (project / "models" / "m.txt").write_text("v2\n")
+    assert run(steps)[1] == {"prep": "ran", "other": "cached", "merge": "ran"}
+
+    steps[1]["cmd"] = "echo failing; exit 3"
+    errors, results = run(steps)
+    assert results == {"prep": "cached", "other": "failed", "merge": "skipped"}
+    assert "hook step 'other' failed (exit 3)" in errors[0]
+    assert errors[0].endswith("  failing")
+    assert (tmp_path / "logs" / "other.log").read_text() == "failing\n"
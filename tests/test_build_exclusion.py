@@ -8,6 +8,7 @@ built-in `.*` baseline (hidden files excluded unless re-included with `!`) and
 force-included deploy-contract files (README, deploy/install.sh).
 """
 
+import json
 import os
 import shutil
 import subprocess
@@ -46,10 +47,10 @@ Makefile
 """
 
 
-def run_build(project_dir):
+def run_build(project_dir, *args):
     """Run build.sh, return (staged_build_dir, {relpath: TarInfo})."""
     result = subprocess.run(
-        ["bash", "scripts/core/build.sh"],
+        ["bash", "scripts/core/build.sh", *args],
         cwd=project_dir,
         env={**os.environ, "TOOL_VERSION": VERSION},
         capture_output=True,
@@ -236,3 +237,140 @@ def test_empty_dir_semantics(scaffolded_project):
     # ... but a dir emptied by exclusion (scripts/core, whose only content is
     # the excluded build.sh) is dropped entirely.
     assert not any(m == "scripts/core" or m.startswith("scripts/core/") for m in members)
+
+
+def test_incremental_build_matches_a_full_build(scaffolded_project):
+    (scaffolded_project / "scripts" / "hooks.sh").write_text('echo hooked >> "$BUILD_DIR/hook.log"\n')
+    data = scaffolded_project / "data"
+    data.mkdir()
+    (data / "a.txt").write_text("a\n")
+    manifest = scaffolded_project / "build" / ".ngbuild" / f"{TOOL_DIR}.json"
+
+    run_build(scaffolded_project, "--incremental")
+    (data / "a.txt").write_text("changed\n")
+    (scaffolded_project / "src" / "extra.py").write_text("x = 1\n")
+    build_dir, incremental = run_build(scaffolded_project, "--incremental")
+
+    assert manifest.exists()
+    # The hook's inputs did not change: it was not run again.
+    assert (build_dir / "hook.log").read_text() == "hooked\n"
+    assert (build_dir / "data" / "a.txt").read_text() == "changed\n"
+
+    _, full = run_build(scaffolded_project)
+    assert not manifest.exists()
+    assert sorted(incremental) == sorted(full)
+
+
+def test_rebuilds_are_byte_identical_and_cached(scaffolded_project, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    tarball = scaffolded_project / "build" / TARBALL
+
+    build_dir, members = run_build(scaffolded_project)
+    first = tarball.read_bytes()
+    assert {(m.mtime, m.uid, m.gid, m.uname) for m in members.values()} == {(1700000000, 0, 0, "")}
+    assert (build_dir / "VERSION").read_text().startswith(f"{VERSION}\nTue Nov 14 22:13:20 UTC 2023")
+
+    (scaffolded_project / "configure").touch()
+    run_build(scaffolded_project)
+    assert tarball.read_bytes() == first
+    assert len(list((scaffolded_project / "build" / ".ngbuild" / "artifacts").iterdir())) == 1
+
+    monkeypatch.setenv("ARTIFACT_CACHE_DIR", "off")
+    run_build(scaffolded_project)
+    assert tarball.read_bytes() == first
+
+
+def test_hardlink_staging_guards_files_hooks_modify(scaffolded_project):
+    lib = scaffolded_project / "libs" / "mylib"
+    lib.mkdir(parents=True)
+    (lib / "data.bin").write_text("data\n")
+    (lib / "config.py").write_text("VERSION = 'dev'\n")
+    (scaffolded_project / "scripts" / "hooks.sh").write_text("echo \"VERSION = '$TOOL_VERSION'\" >> mylib/config.py\n")
+    conf = scaffolded_project / "scripts" / "build.conf"
+    conf.write_text(conf.read_text() + 'STAGE_COPY_MODE="hardlink"\nHOOK_MODIFIES="config.py"\n')
+
+    build_dir, members = run_build(scaffolded_project)
+
+    assert os.path.samefile(build_dir / "libs" / "mylib" / "data.bin", lib / "data.bin")
+    assert (lib / "config.py").read_text() == "VERSION = 'dev'\n"
+    assert (build_dir / "libs" / "mylib" / "config.py").read_text().endswith(f"VERSION = '{VERSION}'\n")
+    assert "libs/mylib/data.bin" in members
+
+    # Without HOOK_MODIFIES the hook writes through the link: the build fails.
+    conf.write_text(conf.read_text().replace('HOOK_MODIFIES="config.py"', ""))
+    result = subprocess.run(
+        ["bash", "scripts/core/build.sh"], cwd=scaffolded_project, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode != 0
+    assert "libs/mylib/config.py" in result.stderr
+
+
+def test_profile_writes_build_profile_json(scaffolded_project):
+    run_build(scaffolded_project, "--profile")
+
+    profile = json.loads((scaffolded_project / "build" / "build-profile.json").read_text())
+    steps = {step["name"]: step for step in profile["steps"]}
+    assert list(steps) == [
+        "setup",
+        "requirements",
+        "exclusions",
+        "staging",
+        "libs_merge",
+        "version_info",
+        "hooks",
+        "finalize",
+        "packaging",
+    ]
+    assert steps["exclusions"]["excluded"] > 0
+    assert steps["packaging"]["output_bytes"] == (scaffolded_project / "build" / TARBALL).stat().st_size
+    assert profile["tool_dir"] == TOOL_DIR
+    assert not (scaffolded_project / "build" / TOOL_DIR / "build-profile.json").exists()
+
+
+def test_declared_hook_steps_run_once_per_input_change(scaffolded_project):
+    (scaffolded_project / "models").mkdir()
+    (scaffolded_project / "models" / "m.txt").write_text("v1\n")
+    conf = scaffolded_project / "scripts" / "build.conf"
+    conf.write_text(
+        conf.read_text()
+        + 'HOOK_STEPS="prep merge"\n'
+        + 'HOOK_prep_CMD="mkdir -p prep && cp $PROJECT_ROOT/models/m.txt prep/ && echo prep >> $PROJECT_ROOT/runs"\n'
+        + 'HOOK_prep_INPUTS="models"\n'
+        + 'HOOK_prep_OUTPUTS="libs/prep"\n'
+        + 'HOOK_merge_CMD="cat prep/m.txt > merged.txt && echo merge >> $PROJECT_ROOT/runs"\n'
+        + 'HOOK_merge_OUTPUTS="libs/merged.txt"\n'
+        + 'HOOK_merge_DEPS="prep"\n'
+    )
+    runs = scaffolded_project / "runs"
+
+    build_dir, members = run_build(scaffolded_project)
+    assert runs.read_text() == "prep\nmerge\n"
+    assert "libs/merged.txt" in members
+
+    # A full rebuild with the same inputs copies the cached outputs back
+    build_dir, members = run_build(scaffolded_project)
+    assert runs.read_text() == "prep\nmerge\n"
+    assert (build_dir / "libs" / "merged.txt").read_text() == "v1\n"
+    assert (scaffolded_project / "build" / ".ngbuild" / "logs" / "prep.log").exists()
+
+    (scaffolded_project / "models" / "m.txt").write_text("v2\n")
+    build_dir, _members = run_build(scaffolded_project)
+    assert runs.read_text() == "prep\nmerge\nprep\nmerge\n"
+    assert (build_dir / "libs" / "merged.txt").read_text() == "v2\n"
+
+
+def test_failing_hook_output_is_shown_in_progress_mode(scaffolded_project):
+    conf = scaffolded_project / "scripts" / "build.conf"
+    conf.write_text(conf.read_text() + 'HOOK_STEPS="broken"\nHOOK_broken_CMD="echo compiler says no; exit 2"\n')
+
+    result = subprocess.run(
+        ["bash", "scripts/core/build.sh", "--progress"],
+        cwd=scaffolded_project,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert result.returncode != 0
+    assert "hook step 'broken' failed (exit 2)" in result.stderr
+    assert "compiler says no" in result.stderr
@@ -29,5 +29,5 @@ def test_version_flag():
 def test_help_lists_subcommands():
     result = _run(["--help"])
     assert result.returncode == 0
-    for command in ("generate", "deps", "sync", "upgrade"):
+    for command in ("generate", "deps", "sync", "upgrade", "export-jobs", "run-jobs", "report"):
         assert command in result.stdout
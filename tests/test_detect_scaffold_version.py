@@ -0,0 +1,185 @@
+"""scripts/detect_scaffold_version.py: the cached tag index and fleet mode."""
+
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "detect_scaffold_version.py"
+
+
+@pytest.fixture(scope="module")
+def dsv():
+    spec = importlib.util.spec_from_file_location("detect_scaffold_version", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so fleet mode's process pool can pickle scan_target by name
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    yield module
+    del sys.modules[spec.name]
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, text=True).stdout
+
+
+def commit(repo, files, message):
+    for rel, text in files.items():
+        path = repo / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", message)
+    return git(repo, "rev-parse", "HEAD").strip()
+
+
+def ls_tree_index(repo):
+    """The index a full `git ls-tree -r` walk of every tag gives, tags in version order."""
+    index = {}
+    for tag in git(repo, "tag", "--sort=v:refname").split():
+        for line in git(repo, "ls-tree", "-r", tag, "--", "ngargparser").splitlines():
+            meta, path = line.split("\t", 1)
+            index.setdefault(meta.split()[2], {}).setdefault(tag, path)
+    return index
+
+
+def as_ordered(index):
+    return {blob: list(paths.items()) for blob, paths in index.items()}
+
+
+@pytest.fixture
+def tagged_repo(tmp_path, monkeypatch):
+    for var, value in {
+        "GIT_AUTHOR_NAME": "t",
+        "GIT_AUTHOR_EMAIL": "t@example.com",
+        "GIT_COMMITTER_NAME": "t",
+        "GIT_COMMITTER_EMAIL": "t@example.com",
+    }.items():
+        monkeypatch.setenv(var, value)
+    repo = tmp_path / "ngargparser-repo"
+    repo.mkdir()
+    git(repo, "init", "-q")
+    first = commit(repo, {"ngargparser/a.py": "1\n", "ngargparser/sub/b.py": "b\n", "README.md": "r\n"}, "one")
+    git(repo, "tag", "v0.1.0")
+    git(repo, "tag", "v0.3.0", first)
+    commit(repo, {"ngargparser/a.py": "2\n"}, "two")
+    git(repo, "tag", "-a", "v0.2.0", "-m", "annotated")
+    # a.py goes back to its v0.1.0 content, so that blob's tags are not contiguous
+    third = commit(repo, {"ngargparser/a.py": "1\n", "ngargparser/sub/c.py": "c\n"}, "three")
+    git(repo, "tag", "v0.10.0")
+    return repo, first, third
+
+
+def test_cached_tag_index_matches_ls_tree_across_tag_changes(dsv, tagged_repo, tmp_path, monkeypatch):
+    repo, first, third = tagged_repo
+    cache = tmp_path / "cache" / "tag-index.json"
+
+    tags, index = dsv.load_tag_index(repo, cache)
+    assert tags == ["v0.1.0", "v0.2.0", "v0.3.0", "v0.10.0"]
+    assert as_ordered(index) == as_ordered(ls_tree_index(repo))
+    assert cache.is_file()
+
+    # Nothing changed: the cache answers without reading a single tree
+    with monkeypatch.context() as m:
+        m.setattr(dsv, "TreeReader", None)
+        assert as_ordered(dsv.load_tag_index(repo, cache)[1]) == as_ordered(index)
+
+    git(repo, "tag", "-d", "v0.2.0")
+    tags, index = dsv.load_tag_index(repo, cache)
+    assert tags == ["v0.1.0", "v0.3.0", "v0.10.0"]
+    assert as_ordered(index) == as_ordered(ls_tree_index(repo))
+
+    # Re-create the annotated tag on another commit and move a lightweight one
+    git(repo, "tag", "-f", "-a", "v0.2.0", "-m", "moved", third)
+    git(repo, "tag", "-f", "v0.10.0", first)
+    tags, index = dsv.load_tag_index(repo, cache)
+    assert tags == ["v0.1.0", "v0.2.0", "v0.3.0", "v0.10.0"]
+    assert as_ordered(index) == as_ordered(ls_tree_index(repo))
+    assert as_ordered(index) == as_ordered(dsv.build_index(repo, tags))
+
+
+def project(path, files):
+    for rel, text in files.items():
+        (path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (path / rel).write_text(text)
+    return path
+
+
+def stamped(path, version):
+    return project(path, {"pyproject.toml": f'[tool.ngargparser]\nscaffold_version = "{version}"\n'})
+
+
+def test_expand_targets(dsv, tmp_path, monkeypatch):
+    tools = tmp_path / "tools"
+    for name in ("a", "b"):
+        (tools / name).mkdir(parents=True)
+    (tools / "notes.txt").write_text("")
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    # Directories only; a repeated target is listed once, in first-seen order
+    assert dsv.expand_targets([str(tools / "b"), "~/tools/*", str(tools / "a" / ".." / "b")]) == [
+        tools / "b",
+        tools / "a",
+    ]
+    assert dsv.expand_targets([str(tools / "*.txt")]) == []
+    # A plain target is kept even when it doesn't exist, so fleet mode can report it
+    assert dsv.expand_targets(["~/missing"]) == [tmp_path / "missing"]
+
+
+def test_detect_fleet_hashes_only_unstamped_projects(dsv, tagged_repo, tmp_path, monkeypatch):
+    repo = tagged_repo[0]
+    old = stamped(tmp_path / "old", "0.2.0")
+    fingerprinted = project(tmp_path / "fp", {"src/core/a.py": "2\n"})
+    missing = tmp_path / "missing"
+    scanned = []
+
+    class InlinePool:
+        def __init__(self, max_workers=None):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, fn, targets):
+            scanned.extend(targets)
+            return map(fn, targets)
+
+    monkeypatch.setattr(dsv, "ProcessPoolExecutor", InlinePool)
+    report = dsv.detect_fleet([old, fingerprinted, missing], repo, False, tmp_path / "cache.json")
+
+    assert scanned == [fingerprinted]
+    assert [r.get("method") for r in report["targets"]] == ["stamp", "fingerprint", None]
+    assert report["targets"][2] == {"target": str(missing), "error": "not a directory"}
+    # The 0.2.0 stamp and the v0.2.0 fingerprint are the same version
+    assert report["summary"] == {
+        "total": 3,
+        "by_estimate": {"v0.2.0": [str(old), str(fingerprinted)], "error": [str(missing)]},
+    }
+
+
+def test_main_fleet_json_report(dsv, tagged_repo, tmp_path, capsys):
+    repo = tagged_repo[0]
+    stamped(tmp_path / "fleet" / "one", "0.1.0")
+    project(tmp_path / "fleet" / "two", {"core/c.py": "c\n"})
+    argv = ["--repo", str(repo), "--no-cache", "--json", "-j", "2"]
+
+    assert dsv.main([str(tmp_path / "fleet" / "*"), *argv]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert set(report) == {"ngargparser_repo", "tags", "targets", "summary"}
+    assert report["tags"] == ["v0.1.0", "v0.2.0", "v0.3.0", "v0.10.0"]
+    assert [r["estimate"] for r in report["targets"]] == ["0.1.0", "v0.10.0"]
+    assert report["summary"]["by_estimate"] == {
+        "v0.1.0": [str(tmp_path / "fleet" / "one")],
+        "v0.10.0": [str(tmp_path / "fleet" / "two")],
+    }
+
+    assert dsv.main([str(tmp_path / "fleet" / "*"), str(tmp_path / "gone"), *argv]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["summary"]["total"] == 3
+    assert report["summary"]["by_estimate"]["error"] == [str(tmp_path / "gone")]
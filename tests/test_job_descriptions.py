@@ -0,0 +1,242 @@
+"""Run manifests and job descriptions (ngargparser/job_descriptions.py → src/core/job_descriptions.py)."""
+
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from ngargparser import job_descriptions as jd
+
+
+def write_units(params_dir, names):
+    params_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in names:
+        path = params_dir / name
+        path.write_text(json.dumps({"unit": name}))
+        paths.append(path)
+    return paths
+
+
+def test_manifest_round_trip_records_sizes_and_run_id(tmp_path):
+    (param,) = write_units(tmp_path / "params", ["0-a.json"])
+    manifest = jd.RunManifest(tmp_path)
+    manifest.add_unit(param)
+    manifest.add_unit(tmp_path / "params" / "0-a.json", size=7)
+    manifest.save()
+
+    loaded = jd.RunManifest.load(tmp_path)
+    assert loaded.run_id == manifest.run_id
+    assert loaded.units == [
+        {"param_file": str(param), "size": param.stat().st_size},
+        {"param_file": str(param), "size": 7},
+    ]
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_load_without_manifest_returns_none(tmp_path):
+    assert jd.RunManifest.load(tmp_path) is None
+
+
+def test_jobs_come_from_manifest_and_ignore_stale_files(tmp_path):
+    params = tmp_path / "params"
+    write_units(params, ["stale-1.json", "stale-2.json"])
+    current = write_units(params, ["0-x.json", "1-y.json"])
+    manifest = jd.RunManifest(tmp_path)
+    for path in current:
+        manifest.add_unit(path)
+    manifest.save()
+
+    jd_path, n_jobs = jd.create_job_descriptions_file(tmp_path, "/app/run_demo.py", params)
+
+    assert jd_path == tmp_path / jd.JOB_DESCRIPTIONS_FILENAME
+    jobs = json.loads(jd_path.read_text())
+    assert n_jobs == len(jobs)
+    assert [job["job_type"] for job in jobs] == ["prediction", "prediction", "postprocess"]
+    assert f"-j {current[0]} " in jobs[0]["shell_cmd"]
+    assert f"-j {current[1]} " in jobs[1]["shell_cmd"]
+    assert jobs[1]["shell_cmd"].endswith(" --assume-valid")
+    assert jobs[1]["expected_outputs"] == [f"{tmp_path}/predict-outputs/result.1.json"]
+    assert jobs[2]["depends_on_job_ids"] == [0, 1]
+    assert f"--job-desc-file={jd_path}" in jobs[2]["shell_cmd"]
+
+
+def test_manifest_path_never_stats_params_dir(tmp_path, monkeypatch):
+    params = tmp_path / "params"
+    manifest = jd.RunManifest(tmp_path)
+    for path in write_units(params, [f"{i}-u.json" for i in range(50)]):
+        manifest.add_unit(path)
+    manifest.save()
+
+    def no_scandir(path):
+        raise AssertionError(f"params dir scanned: {path}")
+
+    monkeypatch.setattr(jd.os, "scandir", no_scandir)
+    _, n_jobs = jd.create_job_descriptions_file(tmp_path, "run.py", params)
+    assert n_jobs == 51
+
+
+def test_without_manifest_falls_back_to_newest_ctime_group(tmp_path, monkeypatch):
+    params = tmp_path / "params"
+    ctimes = {"old.json": 100.0, "new-0.json": 200.0, "new-1.json": 200.05}
+    paths = write_units(params, list(ctimes))
+    real_scandir = os.scandir
+
+    class Entry:
+        def __init__(self, entry):
+            self.path, self.name = entry.path, entry.name
+            self.is_file = entry.is_file
+
+        def stat(self):
+            return os.stat_result((0,) * 9 + (ctimes[self.name],))
+
+    monkeypatch.setattr(jd.os, "scandir", lambda d: (Entry(e) for e in list(real_scandir(d))))
+
+    jd_path, _ = jd.create_job_descriptions_file(tmp_path, "run.py", params)
+    jobs = list(jd.iter_job_descriptions(jd_path))
+
+    assert [job["job_type"] for job in jobs] == ["prediction", "prediction", "postprocess"]
+    assert f"-j {paths[1]} " in jobs[0]["shell_cmd"]
+    assert f"-j {paths[2]} " in jobs[1]["shell_cmd"]
+
+
+def test_without_manifest_or_params_dir_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        jd.create_job_descriptions_file(tmp_path, "run.py")
+
+
+def make_jobs(n):
+    return list(
+        jd.generate_job_descriptions([{"param_file": f"/p/{i}.json"} for i in range(n)], "/out", "run.py", "jd")
+    )
+
+
+def test_written_file_is_json_with_one_compact_job_per_line(tmp_path):
+    jobs = make_jobs(3)
+    path = tmp_path / "jd.json"
+
+    assert jd.write_job_descriptions(path, iter(jobs)) == 4
+    assert json.loads(path.read_text()) == jobs
+    lines = path.read_text().splitlines()
+    assert lines[0] == "[" and lines[-1] == "]" and len(lines) == 6
+    assert lines[1] == json.dumps(jobs[0], separators=(",", ":")) + ","
+    assert list(jd.iter_job_descriptions(path)) == jobs
+
+
+def test_get_job_description_seeks_via_index(tmp_path, monkeypatch):
+    jobs = make_jobs(1000)
+    path = tmp_path / "jd.json"
+    jd.write_job_descriptions(path, jobs)
+    assert (tmp_path / "jd.json.idx").stat().st_size == 8 * len(jobs)
+
+    def no_scan(source):
+        raise AssertionError("scanned the whole file")
+
+    monkeypatch.setattr(jd, "iter_job_descriptions", no_scan)
+    assert jd.get_job_description(path, 0) == jobs[0]
+    assert jd.get_job_description(path, 617) == jobs[617]
+    assert jd.get_job_description(path, 1000) == jobs[1000]
+
+
+def test_get_job_description_without_or_with_stale_index_scans(tmp_path):
+    path = tmp_path / "jd.json"
+    jd.write_job_descriptions(path, make_jobs(5))
+    jobs = make_jobs(2)
+    jd.write_job_descriptions(tmp_path / "other.json", jobs)
+    # Stale index from a longer run: offsets no longer point at the right jobs
+    (tmp_path / "other.json.idx").write_bytes((tmp_path / "jd.json.idx").read_bytes())
+
+    assert jd.get_job_description(tmp_path / "other.json", 1) == jobs[1]
+    (tmp_path / "other.json.idx").unlink()
+    assert jd.get_job_description(tmp_path / "other.json", 2) == jobs[2]
+    with pytest.raises(KeyError):
+        jd.get_job_description(tmp_path / "other.json", 3)
+
+
+def test_readers_accept_indented_files_and_open_handles(tmp_path):
+    jobs = make_jobs(2)
+    for name, text in [("indented.json", json.dumps(jobs, indent=4)), ("oneline.json", json.dumps(jobs))]:
+        path = tmp_path / name
+        path.write_text(text)
+        assert list(jd.iter_job_descriptions(path)) == jobs
+        assert jd.get_job_description(path, 1) == jobs[1]
+        with open(path) as handle:
+            assert list(jd.iter_job_descriptions(handle)) == jobs
+            assert not handle.closed
+
+
+def test_get_job_description_from_open_files(tmp_path, monkeypatch):
+    path = tmp_path / "jd.json"
+    jobs = make_jobs(3)
+    jd.write_job_descriptions(path, jobs)
+
+    class Stdin(io.StringIO):
+        name = "<stdin>"
+
+    # No path to re-open: the handle itself is scanned
+    assert jd.get_job_description(io.StringIO(path.read_text()), 2) == jobs[2]
+    assert jd.get_job_description(Stdin(path.read_text()), 0) == jobs[0]
+    with pytest.raises(KeyError):
+        jd.get_job_description(Stdin(path.read_text()), 9)
+
+    # A named file on disk still seeks via its index
+    monkeypatch.setattr(jd, "iter_job_descriptions", lambda source: iter(()))
+    with open(path) as handle:
+        assert jd.get_job_description(handle, 1) == jobs[1]
+
+
+def test_estimator_hints_flow_from_manifest_to_prediction_jobs(tmp_path):
+    params = tmp_path / "params"
+    small, big = write_units(params, ["0-small.json", "1-big.json"])
+
+    def estimate(unit):
+        return {"cpus": 1, "memory_mb": 256 if unit["records"] < 1000 else 4096, "walltime_s": None}
+
+    manifest = jd.RunManifest(tmp_path, estimator=estimate)
+    manifest.add_unit(small, records=10)
+    manifest.add_unit(big, records=5000, resources={"walltime_s": 3600})
+    manifest.save()
+    assert jd.RunManifest.load(tmp_path).units[1] == {
+        "param_file": str(big),
+        "size": big.stat().st_size,
+        "records": 5000,
+        "resources": {"cpus": 1, "memory_mb": 4096, "walltime_s": 3600},
+    }
+
+    jd_path, _ = jd.create_job_descriptions_file(tmp_path, "run.py", params)
+    jobs = list(jd.iter_job_descriptions(jd_path))
+
+    assert jobs[0]["walltime_s"] == 3600  # longest first
+    assert {k: jobs[1].get(k) for k in jd.RESOURCE_KEYS} == {"cpus": 1, "memory_mb": 256, "walltime_s": None}
+    assert not set(jd.RESOURCE_KEYS) & set(jobs[2])
+
+
+@pytest.mark.parametrize("hints", [{"gpus": 1}, {"cpus": 0}, {"memory_mb": 1.5}, {"cpus": True}])
+def test_invalid_resource_hints_are_rejected(tmp_path, hints):
+    (param,) = write_units(tmp_path, ["u.json"])
+    with pytest.raises(ValueError):
+        jd.RunManifest(tmp_path).add_unit(param, resources=hints)
+
+
+def test_prediction_jobs_are_ordered_longest_first_with_priorities(tmp_path):
+    params = tmp_path / "params"
+    paths = write_units(params, ["a.json", "b.json", "c.json", "d.json"])
+    manifest = jd.RunManifest(tmp_path)
+    manifest.add_unit(paths[0], size=10)
+    manifest.add_unit(paths[1], size=999, records=5)
+    manifest.add_unit(paths[2], size=1, records=50)
+    manifest.add_unit(paths[3], size=1, records=5, resources={"walltime_s": 10})
+    manifest.save()
+
+    jd_path, _ = jd.create_job_descriptions_file(tmp_path, "run.py", params)
+    jobs = list(jd.iter_job_descriptions(jd_path))
+
+    order = [paths.index(Path(job["shell_cmd"].split(" -j ")[1].split(" ")[0])) for job in jobs[:-1]]
+    assert order == [3, 2, 1, 0]
+    assert [job["job_id"] for job in jobs] == [0, 1, 2, 3, 4]
+    assert [job["priority"] for job in jobs] == [4, 3, 2, 1, 5]
+
+    jd_path, _ = jd.create_job_descriptions_file(tmp_path, "run.py", params, longest_first=False)
+    assert f"-j {paths[0]} " in next(jd.iter_job_descriptions(jd_path))["shell_cmd"]
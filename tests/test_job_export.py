@@ -0,0 +1,164 @@
+"""Scheduler exports (ngargparser/job_export.py → src/core/job_export.py)."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from ngargparser import job_descriptions as jd
+from ngargparser import job_export
+
+
+def write_dag(tmp_path, n_units):
+    """A real preprocess-shaped DAG whose commands just create their expected output."""
+    out = tmp_path / "run"
+    units = [{"param_file": f"/p/{i}.json"} for i in range(n_units)]
+    jobs = []
+    for job in jd.generate_job_descriptions(units, out, "run.py", out / "jd.json"):
+        job["shell_cmd"] = f"echo {job['job_id']} > {job['expected_outputs'][0]}"
+        jobs.append(job)
+    out.mkdir()
+    jd.write_job_descriptions(out / "jd.json", jobs)
+    return out / "jd.json", jobs
+
+
+def test_slurm_arrays_are_chunked_and_chained(tmp_path):
+    jd_file, _ = write_dag(tmp_path, 2500)
+
+    submit = job_export.export_jobs(jd_file, "slurm", tmp_path / "slurm", name="demo", max_array_size=1000)
+
+    script = submit.read_text()
+    assert "--array=0-999 --export=ALL,JOB_OFFSET=0 level-0.sbatch" in script
+    assert "--array=0-499 --export=ALL,JOB_OFFSET=2000 level-0.sbatch" in script
+    assert "--array=0-0 --export=ALL,JOB_OFFSET=0 level-1.sbatch" in script
+    assert script.count("${dep:+--dependency=afterok:$dep}") == 4
+    assert "#SBATCH --job-name=demo-L1" in (tmp_path / "slurm" / "level-1.sbatch").read_text()
+    assert len((tmp_path / "slurm" / "level-0.cmds").read_text().splitlines()) == 2500
+    assert (tmp_path / "slurm" / "level-1.cmds").read_text().startswith("echo 2500 ")
+
+
+def test_slurm_submit_script_chains_job_ids(tmp_path):
+    jd_file, _ = write_dag(tmp_path, 3)
+    submit = job_export.export_jobs(jd_file, "slurm", tmp_path / "slurm", max_array_size=2)
+    fake_bin = tmp_path / "bin"
+    fake_bin.mkdir()
+    (fake_bin / "sbatch").write_text('#!/bin/bash\necho "$@" >> sbatch.log\necho "$RANDOM;cluster"\n')
+    (fake_bin / "sbatch").chmod(0o755)
+
+    result = subprocess.run([str(submit)], capture_output=True, text=True, env={"PATH": f"{fake_bin}:/usr/bin:/bin"})
+
+    assert result.returncode == 0, result.stderr
+    calls = (tmp_path / "slurm" / "sbatch.log").read_text().splitlines()
+    assert len(calls) == 3
+    assert "--dependency" not in calls[0] + calls[1]
+    first_ids = [line.split("-> ")[1] for line in result.stdout.splitlines()][0]
+    assert calls[2].startswith(f"--parsable --dependency=afterok:{first_ids} ")
+
+
+def test_make_export_runs_the_dag_in_parallel(tmp_path):
+    jd_file, jobs = write_dag(tmp_path, 5)
+
+    makefile = job_export.export_jobs(jd_file, "make", tmp_path / "make")
+
+    text = makefile.read_text()
+    postprocess = jobs[-1]
+    deps = " ".join(jobs[i]["expected_outputs"][0] for i in range(5))
+    assert f"{postprocess['expected_outputs'][0]}: {deps}\n" in text
+    assert f"all: {postprocess['expected_outputs'][0]}\n" in text
+    if shutil.which("make"):
+        result = subprocess.run(["make", "-f", str(makefile), "-j", "4"], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert (tmp_path / "run" / "aggregate" / "final-result.json").read_text() == "5\n"
+
+
+def test_make_escapes_dollars_and_stamps_jobs_without_outputs(tmp_path):
+    jobs = [{"shell_cmd": "echo $HOME", "job_id": 0, "job_type": "prediction", "depends_on_job_ids": []}]
+    jd.write_job_descriptions(tmp_path / "jd.json", jobs)
+
+    text = job_export.export_jobs(tmp_path / "jd.json", "make", tmp_path / "make").read_text()
+
+    assert "\techo $$HOME\n" in text
+    assert f"{tmp_path}/make/.jobs/0.done:\n" in text
+    assert "\t@touch $@\n" in text
+
+
+def test_parallel_export_runs_levels_in_order(tmp_path):
+    jd_file, _ = write_dag(tmp_path, 3)
+
+    run = job_export.export_jobs(jd_file, "parallel", tmp_path / "parallel", command_prefix="nice")
+
+    lines = run.read_text().splitlines()
+    assert [line.split(" :::: ")[1] for line in lines if line.startswith("parallel ")] == [
+        "level-0.cmds",
+        "level-1.cmds",
+    ]
+    assert "--joblog level-0.joblog --resume-failed" in lines[-2]
+    assert all(line.startswith("nice echo ") for line in (tmp_path / "parallel" / "level-0.cmds").open())
+
+
+def test_rejects_unknown_format_and_forward_dependencies(tmp_path):
+    jobs = [
+        {"shell_cmd": "a", "job_id": 0, "job_type": "postprocess", "depends_on_job_ids": [1]},
+        {"shell_cmd": "b", "job_id": 1, "job_type": "prediction", "depends_on_job_ids": []},
+    ]
+    jd.write_job_descriptions(tmp_path / "jd.json", jobs)
+
+    with pytest.raises(ValueError, match="Unknown export format"):
+        job_export.export_jobs(tmp_path / "jd.json", "pbs", tmp_path / "out")
+    with pytest.raises(ValueError, match="not listed before it"):
+        job_export.export_jobs(tmp_path / "jd.json", "make", tmp_path / "out")
+
+
+def test_cli_export_jobs_writes_every_backend(tmp_path, strip_ansi, capsys):
+    from argparse import Namespace
+
+    from ngargparser import cli
+
+    jd_file, _ = write_dag(tmp_path, 2)
+    args = Namespace(
+        job_desc_file=str(jd_file), format="all", output_dir=None, name="jobs", command_prefix=None, max_array_size=1000
+    )
+
+    assert cli.export_jobs_command(args) == 0
+    export = jd_file.parent / "export"
+    assert (export / "slurm" / "submit.sh").is_file()
+    assert (export / "make" / "Makefile").is_file()
+    assert (export / "parallel" / "run.sh").is_file()
+    assert "✓ make:" in strip_ansi(capsys.readouterr().out)
+
+    args.job_desc_file = str(tmp_path / "missing.json")
+    assert cli.export_jobs_command(args) == 1
+
+
+def test_slurm_splits_levels_by_resource_request(tmp_path):
+    jobs = [
+        {"shell_cmd": "a", "job_id": 0, "job_type": "prediction", "depends_on_job_ids": [], "cpus": 4},
+        {"shell_cmd": "b", "job_id": 1, "job_type": "prediction", "depends_on_job_ids": []},
+        {
+            "shell_cmd": "c",
+            "job_id": 2,
+            "job_type": "prediction",
+            "depends_on_job_ids": [],
+            "cpus": 4,
+            "memory_mb": 2048,
+            "walltime_s": 90061,
+        },
+        {"shell_cmd": "d", "job_id": 3, "job_type": "prediction", "depends_on_job_ids": [], "cpus": 4},
+        {"shell_cmd": "e", "job_id": 4, "job_type": "postprocess", "depends_on_job_ids": [0, 1, 2, 3]},
+    ]
+    jd.write_job_descriptions(tmp_path / "jd.json", jobs)
+
+    submit = job_export.export_jobs(tmp_path / "jd.json", "slurm", tmp_path / "slurm")
+
+    out = tmp_path / "slurm"
+    assert (out / "level-0.cmds").read_text() == "a\nd\n"
+    assert (out / "level-0-1.cmds").read_text() == "b\n"
+    assert (out / "level-0-2.cmds").read_text() == "c\n"
+    assert "#SBATCH --cpus-per-task=4\n" in (out / "level-0.sbatch").read_text()
+    assert "#SBATCH" not in (out / "level-0-1.sbatch").read_text().replace("#SBATCH --job-name", "").replace(
+        "#SBATCH --output", ""
+    )
+    big = (out / "level-0-2.sbatch").read_text()
+    assert "#SBATCH --mem=2048M\n" in big and "#SBATCH --time=1-01:01:01\n" in big
+    script = submit.read_text()
+    assert script.count("level-0") == 3 and "level 0: 4 job(s)" in script
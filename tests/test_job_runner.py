@@ -0,0 +1,182 @@
+"""Local job runner (ngargparser/job_runner.py → src/core/job_runner.py)."""
+
+import time
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from ngargparser import cli, job_runner
+from ngargparser import job_descriptions as jd
+
+
+def job(job_id, cmd, deps=(), **extra):
+    return {
+        "shell_cmd": cmd,
+        "job_id": job_id,
+        "job_type": "prediction",
+        "depends_on_job_ids": list(deps),
+        "expected_outputs": [],
+        **extra,
+    }
+
+
+def run(tmp_path, jobs, **kwargs):
+    jd.write_job_descriptions(tmp_path / "jd.json", jobs)
+    return job_runner.run_jobs(tmp_path / "jd.json", echo=lambda *_: None, **kwargs)
+
+
+def test_runs_dag_in_dependency_and_priority_order(tmp_path):
+    order = tmp_path / "order.txt"
+    jobs = [
+        job(0, f"echo 0 >> {order}", priority=1),
+        job(1, f"echo 1 >> {order}", priority=9),
+        job(2, f"echo 2 >> {order}", deps=[0, 1], priority=99),
+    ]
+
+    summary = run(tmp_path, jobs, max_cpus=1)
+
+    assert order.read_text().split() == ["1", "0", "2"]
+    assert summary["succeeded"] == [1, 0, 2]
+    assert summary["failed"] == summary["skipped"] == []
+    assert summary["attempts"] == 3
+    assert (tmp_path / "job-logs" / "job-2.1.log").is_file()
+
+
+def test_timed_out_job_is_killed_and_retried_with_backoff(tmp_path):
+    marker = tmp_path / "attempted"
+    # First attempt hangs; the retry finds the marker and succeeds at once.
+    cmd = f"if [ -e {marker} ]; then exit 0; fi; touch {marker}; sleep 30"
+    started = time.monotonic()
+
+    summary = run(tmp_path, [job(0, cmd, timeout_s=0.3, max_retries=2, retry_backoff_s=0.2)])
+
+    assert time.monotonic() - started < 10
+    assert summary["succeeded"] == [0]
+    assert summary["timeouts"] == 1
+    assert summary["retries"] == {0: 1}
+    assert summary["attempts"] == 2
+
+
+def test_exhausted_retries_fail_and_skip_dependents(tmp_path):
+    jobs = [
+        job(0, "exit 3", max_retries=1),
+        job(1, "true"),
+        job(2, "true", deps=[0, 1]),
+        job(3, "true", deps=[2]),
+    ]
+
+    summary = run(tmp_path, jobs)
+
+    assert summary["failed"] == [0]
+    assert summary["skipped"] == [2, 3]
+    assert summary["succeeded"] == [1]
+    assert summary["retries"] == {0: 1}
+    lines = job_runner.format_summary(summary)
+    assert "1 succeeded, 1 failed, 2 skipped" in lines[0]
+    assert "1 job(s) retried (1 extra attempt(s)), 0 timeout(s)" in lines[1]
+
+
+def test_walltime_hint_is_a_timeout_only_when_opted_in(tmp_path):
+    summary = run(tmp_path, [job(0, "sleep 0.5", walltime_s=0.2)])
+    assert summary["succeeded"] == [0]
+    assert summary["timeouts"] == 0
+
+    summary = run(tmp_path, [job(0, "sleep 30", walltime_s=1)], walltime_as_timeout=True)
+    assert summary["failed"] == [0]
+    assert summary["timeouts"] == 1
+
+
+def test_interrupted_run_kills_running_jobs(tmp_path, monkeypatch):
+    pid_file = tmp_path / "pid"
+    real_sleep = time.sleep
+
+    def interrupt_once_started(seconds):
+        if pid_file.is_file() and pid_file.read_text().strip():
+            raise KeyboardInterrupt
+        real_sleep(seconds)
+
+    monkeypatch.setattr(job_runner.time, "sleep", interrupt_once_started)
+    with pytest.raises(KeyboardInterrupt):
+        run(tmp_path, [job(0, f"sleep 30 & echo $! > {pid_file}; wait")])
+
+    # The backgrounded sleep shares the job's process group, so it must be gone too.
+    stat = Path(f"/proc/{int(pid_file.read_text())}/stat")
+
+    def gone():
+        try:
+            return stat.read_text().split(") ")[1].startswith("Z")
+        except FileNotFoundError:
+            return True
+
+    deadline = time.monotonic() + job_runner.KILL_GRACE_S
+    while not gone() and time.monotonic() < deadline:
+        real_sleep(0.05)
+    assert gone()
+
+
+def test_cpu_hints_limit_concurrency(tmp_path):
+    log = tmp_path / "log.txt"
+    # Two 2-cpu jobs on 3 slots must not overlap.
+    cmd = f"echo start >> {log}; sleep 0.3; echo end >> {log}"
+    summary = run(tmp_path, [job(0, cmd, cpus=2), job(1, cmd, cpus=2)], max_cpus=3)
+
+    assert summary["succeeded"] == [0, 1]
+    assert log.read_text().split() == ["start", "end", "start", "end"]
+
+
+def test_unknown_dependency_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="unknown job"):
+        run(tmp_path, [job(0, "true", deps=[7])])
+
+
+def test_dependency_cycle_is_rejected(tmp_path):
+    jobs = [job(0, "true", deps=[1]), job(1, "true", deps=[0]), job(2, "true", deps=[1]), job(3, "true")]
+
+    with pytest.raises(ValueError, match=r"dependency cycle can never start: \[0, 1, 2\]"):
+        run(tmp_path, jobs)
+
+
+def test_lower_priority_jobs_do_not_pass_a_job_waiting_for_cpus(tmp_path):
+    order = tmp_path / "order.txt"
+    jobs = [
+        job(0, f"echo first >> {order}; sleep 0.3", priority=10),
+        job(1, f"echo wide >> {order}; sleep 0.3", priority=9, cpus=2),
+        job(2, f"echo low >> {order}; sleep 0.3", priority=1),
+        job(3, f"echo low >> {order}; sleep 0.3", priority=1),
+    ]
+
+    summary = run(tmp_path, jobs, max_cpus=2)
+
+    assert sorted(summary["succeeded"]) == [0, 1, 2, 3]
+    assert order.read_text().split() == ["first", "wide", "low", "low"]
+
+
+def test_retry_policy_from_manifest_reaches_every_job(tmp_path):
+    (tmp_path / "p.json").write_text("{}")
+    manifest = jd.RunManifest(tmp_path, retry_policy={"timeout_s": 600, "max_retries": 2, "retry_backoff_s": 5})
+    manifest.add_unit(tmp_path / "p.json")
+    manifest.save()
+
+    jd_path, _ = jd.create_job_descriptions_file(tmp_path, "run.py")
+
+    for described in jd.iter_job_descriptions(jd_path):
+        assert {k: described[k] for k in jd.RETRY_POLICY_KEYS} == {
+            "timeout_s": 600,
+            "max_retries": 2,
+            "retry_backoff_s": 5,
+        }
+    with pytest.raises(ValueError):
+        jd.RunManifest(tmp_path, retry_policy={"max_retries": -1})
+
+
+def test_cli_run_jobs_reports_summary_and_exit_code(tmp_path, strip_ansi, capsys):
+    jd.write_job_descriptions(tmp_path / "jd.json", [job(0, "true"), job(1, "exit 1", deps=[0])])
+    args = Namespace(
+        job_desc_file=str(tmp_path / "jd.json"), jobs=2, log_dir=None, command_prefix=None, walltime_as_timeout=False
+    )
+
+    assert cli.run_jobs_command(args) == 1
+    out = strip_ansi(capsys.readouterr().out)
+    assert "✗ Ran 2 job(s)" in out
+    assert "Failed jobs: 1" in out
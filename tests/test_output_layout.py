@@ -0,0 +1,92 @@
+"""Preprocess's output layout: planned while parsing, created afterwards in one pass."""
+
+import os
+
+import pytest
+
+from ngargparser import cli, core_validators
+
+
+@pytest.fixture
+def paths_file(tmp_path):
+    sections = [cli.generate_dependency_section(name) for name in ("T Cell Class I", "unused tool")]
+    sections[0] = sections[0].replace("t_cell_class_i_path=None", "t_cell_class_i_path='/opt/mhci'")
+    path = tmp_path / "paths.py"
+    path.write_text("\n\n".join(sections) + "\n")
+    return path
+
+
+def test_plan_creates_nothing_and_materialize_creates_leaves_once(paths_file, tmp_path, monkeypatch):
+    out = tmp_path / "out"
+    monkeypatch.setattr(core_validators, "APP_NAME", "demo")
+
+    layout, main_dir = core_validators.plan_output_layout(out, paths_file)
+
+    assert not out.exists()
+    assert list(layout) == ["T Cell Class I", "demo"]
+    assert main_dir == out / "demo"
+    assert out / "mhci" / "predict-inputs" / "params" in layout["T Cell Class I"]
+
+    created = core_validators.materialize_layout(layout)
+    assert sorted(created) == core_validators.leaf_directories(layout)
+    assert len(created) == 4 + 5
+    assert (out / "demo" / "results").is_dir()
+    assert core_validators.layout_exists(layout)
+
+    def no_makedirs(*args, **kwargs):
+        raise AssertionError("existing layout must not be created again")
+
+    monkeypatch.setattr(core_validators.os, "makedirs", no_makedirs)
+    assert core_validators.materialize_layout(layout) == []
+
+
+def test_leaf_directories_drops_ancestors():
+    layout = {"a": ["/o", "/o/a/b", "/o/a-b"], "b": ["/o/a", "/o/a/b/"]}
+
+    assert core_validators.leaf_directories(layout) == [os.path.normpath("/o/a-b"), os.path.normpath("/o/a/b")]
+
+
+@pytest.fixture
+def parser(ngparser):
+    parser = ngparser.NGArgumentParser()
+    parser.add_predict_subparser(help="Run one unit.")
+    return parser
+
+
+def test_failed_parse_creates_no_directories(parser, tmp_path):
+    (tmp_path / "input.json").write_text("{}")
+    out = tmp_path / "out"
+    argv = ["preprocess", "-j", str(tmp_path / "input.json"), "-o", str(out)]
+
+    with pytest.raises(SystemExit):
+        parser.parse_args_list([*argv, "--inputs-dir", str(tmp_path / "missing")])
+    assert not out.exists()
+
+    # A directory --output-dir is about to create is a valid --params-dir.
+    args = parser.parse_args_list([*argv, "--params-dir", str(out / "predict-inputs" / "params")])
+    args.input_json.close()
+    assert (out / "predict-inputs" / "params").is_dir()
+    assert (out / "results").is_dir()
+
+
+def test_preprocess_dir_validator_only_plans(ngparser, parser, tmp_path, capsys):
+    parser.parser_preprocess.add_argument("--work-dir", type=ngparser.validators.validate_preprocess_dir)
+    (tmp_path / "input.json").write_text("{}")
+    (tmp_path / "paths.py").write_text("")
+    work = tmp_path / "work"
+    work.mkdir()
+    argv = ["preprocess", "-j", str(tmp_path / "input.json"), "--work-dir", str(work)]
+
+    with pytest.raises(SystemExit):
+        parser.parse_args_list([*argv, "--inputs-dir", str(tmp_path / "missing")])
+    with pytest.raises(SystemExit):
+        parser.parse_args_list([*argv, "--help"])
+    assert list(work.iterdir()) == []
+
+    capsys.readouterr()
+    args = parser.parse_args_list([*argv, "-o", str(tmp_path / "out")])
+    args.input_json.close()
+    assert args.work_dir == work
+    assert (work / "predict-inputs" / "data").is_dir()
+    assert (tmp_path / "out" / "results").is_dir()
+    assert capsys.readouterr().out.count("Successfully created") == 1
@@ -0,0 +1,110 @@
+"""Parser spec cache (ngargparser/parser_cache.py → src/core/parser_cache.py)."""
+
+import argparse
+import subprocess
+import sys
+
+from ngargparser import parser_cache
+
+
+def positive_int(value):
+    return int(value)
+
+
+class ToolParser(argparse.ArgumentParser):
+    builds = 0
+
+    def __init__(self):
+        super().__init__(prog="run_tool.py")
+        type(self).builds += 1
+        sub = self.add_subparsers(dest="subcommand", required=True, parser_class=argparse.ArgumentParser)
+        predict = sub.add_parser("predict")
+        predict.add_argument("--count", "-c", type=positive_int, default=3)
+        predict.add_argument("--quiet", action="store_true")
+        predict.add_argument("--hidden", default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+        predict.add_argument("names", nargs="*")
+
+
+def test_second_load_skips_construction(tmp_path, monkeypatch):
+    monkeypatch.setattr(ToolParser, "builds", 0)
+    argv = ["predict", "-c", "7", "a", "b"]
+
+    first = parser_cache.load_or_build(ToolParser, argv, cache_dir=tmp_path)
+    second = parser_cache.load_or_build(ToolParser, argv, cache_dir=tmp_path)
+
+    assert ToolParser.builds == 1
+    assert type(second) is ToolParser and second is not first
+    # SUPPRESS must survive by identity, or 'hidden' would leak into the namespace.
+    assert (
+        vars(second.parse_args(argv))
+        == vars(first.parse_args(argv))
+        == {
+            "subcommand": "predict",
+            "count": 7,
+            "quiet": False,
+            "names": ["a", "b"],
+        }
+    )
+    assert len(list(tmp_path.glob("ToolParser.parser-*.pickle"))) == 1
+
+
+def test_help_disabled_and_corrupt_caches_build_from_scratch(tmp_path, monkeypatch):
+    monkeypatch.setattr(ToolParser, "builds", 0)
+    parser_cache.load_or_build(ToolParser, ["predict"], cache_dir=tmp_path)
+
+    parser_cache.load_or_build(ToolParser, ["predict", "--help"], cache_dir=tmp_path)
+    monkeypatch.setenv(parser_cache.CACHE_ENV_VAR, "0")
+    parser_cache.load_or_build(ToolParser, ["predict"], cache_dir=tmp_path)
+    monkeypatch.delenv(parser_cache.CACHE_ENV_VAR)
+    parser_cache.cache_path(ToolParser, tmp_path).write_bytes(b"not a pickle")
+    parser = parser_cache.load_or_build(ToolParser, ["predict"], cache_dir=tmp_path)
+
+    assert ToolParser.builds == 4
+    assert parser.parse_args(["predict"]).count == 3
+    assert parser_cache.load_or_build(ToolParser, ["predict"], cache_dir=tmp_path) is not None
+    assert ToolParser.builds == 4  # the rebuilt pickle was written back
+
+
+def test_key_changes_when_a_source_file_changes(tmp_path, monkeypatch):
+    module = tmp_path / "mytool_parser.py"
+    module.write_text("import argparse\nclass P(argparse.ArgumentParser):\n    pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import mytool_parser
+
+    before = parser_cache.cache_key(mytool_parser.P)
+    (tmp_path / "validators.py").write_text("# new file next to the parser\n")
+
+    assert parser_cache.cache_key(mytool_parser.P) != before
+    assert parser_cache.cache_path(mytool_parser.P).parent == tmp_path / "__pycache__"
+
+
+def test_read_only_cache_dir_skips_pickling(tmp_path, monkeypatch):
+    def no_dumps(parser):
+        raise AssertionError("a cache that can't be written must not be pickled")
+
+    monkeypatch.setattr(parser_cache, "dumps", no_dumps)
+    monkeypatch.setattr(parser_cache.os, "access", lambda path, mode: False)
+
+    parser = parser_cache.load_or_build(ToolParser, ["predict"], cache_dir=tmp_path / "cache")
+
+    assert parser.parse_args(["predict"]).count == 3
+    assert not (tmp_path / "cache").exists()
+
+
+def test_generated_tool_caches_its_parser_only_when_opted_in(scaffolded_project, tmp_path):
+    (scaffolded_project / "paths.py").write_text("")
+    src = scaffolded_project / "src"
+    run = [sys.executable, "run_demo.py", "predict", "-o", str(tmp_path / "result"), "-f", "json"]
+
+    def run_twice():
+        for _ in range(2):
+            result = subprocess.run(run, cwd=src, capture_output=True, text=True)
+            assert result.returncode == 0, result.stderr
+        return list((src / "__pycache__").glob("DemoArgumentParser.parser-*.pickle"))
+
+    assert run_twice() == []
+    entry = src / "run_demo.py"
+    entry.write_text(entry.read_text().replace("DemoArgumentParser()", "DemoArgumentParser.cached()"))
+    assert len(run_twice()) == 1
+    helped = subprocess.run([*run[:3], "--help"], cwd=src, capture_output=True, text=True)
+    assert "--profile" in helped.stdout
@@ -12,6 +12,12 @@ def test_create_project_structure_builds_expected_tree(in_tmp_dir):
         "src/core/NGArgumentParser.py",
         "src/core/core_validators.py",
         "src/core/result_writer.py",
+        "src/core/anchors.py",
+        "src/core/job_descriptions.py",
+        "src/core/job_export.py",
+        "src/core/job_runner.py",
+        "src/core/timing.py",
+        "src/core/parser_cache.py",
         "src/core/set_pythonpath.py",
         "src/core/configure.py",
         "src/core/__init__.py",
@@ -21,6 +27,7 @@ def test_create_project_structure_builds_expected_tree(in_tmp_dir):
         "src/preprocess.py",
         "src/postprocess.py",
         "scripts/core/build.sh",
+        "scripts/core/build.py",
         "scripts/build.conf",
         "scripts/hooks.sh",
         ".distignore",
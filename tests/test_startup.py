@@ -0,0 +1,61 @@
+"""Cold-start budget for the generated run_<tool>.py (templates/run_app.py).
+
+Every predict job in a run pays the entry point's import cost, so predict must
+not import preprocess/postprocess code, and the project's own imports must stay
+within STARTUP_BUDGET_S.
+"""
+
+import re
+import subprocess
+import sys
+
+# Cumulative import time of everything the entry point imports beyond a bare
+# interpreter, measured with ``python -X importtime`` (best of a few runs). It
+# is about 0.05s today; the budget leaves room for slow CI runners, not for new
+# heavy top-level imports.
+STARTUP_BUDGET_S = 0.5
+RUNS = 3
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_profile(args, cwd):
+    """Return ``(modules, top_level)`` from ``-X importtime``: every module imported,
+    and ``{module: cumulative seconds}`` for the top-level imports only."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=cwd, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    modules, top_level = set(), {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            modules.add(match.group(4))
+            if not match.group(3):
+                top_level[match.group(4)] = int(match.group(2)) / 1e6
+    return modules, top_level
+
+
+def test_predict_does_not_import_preprocess_or_postprocess(scaffolded_project, tmp_path):
+    (scaffolded_project / "paths.py").write_text("")
+    src = scaffolded_project / "src"
+    # Give preprocess/postprocess a dependency that must never load for predict.
+    (src / "heavy_dependency.py").write_text("")
+    for name in ("preprocess.py", "postprocess.py"):
+        (src / name).write_text("import heavy_dependency\n" + (src / name).read_text())
+
+    modules, _ = import_profile(["run_demo.py", "predict", "-o", str(tmp_path / "result")], src)
+
+    assert "core.NGArgumentParser" in modules
+    assert not {"preprocess", "postprocess", "heavy_dependency"} & modules
+
+
+def test_predict_startup_budget(scaffolded_project, tmp_path):
+    (scaffolded_project / "paths.py").write_text("")
+    src = scaffolded_project / "src"
+    _, baseline = import_profile(["-c", "pass"], src)
+
+    costs = []
+    for _ in range(RUNS):
+        _, top_level = import_profile(["run_demo.py", "predict", "-o", str(tmp_path / "result")], src)
+        costs.append(sum(seconds for module, seconds in top_level.items() if module not in baseline))
+
+    assert min(costs) < STARTUP_BUDGET_S, f"predict startup imports took {min(costs):.3f}s"
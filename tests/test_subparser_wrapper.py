@@ -0,0 +1,71 @@
+"""Index-based argument customization (SubparserWrapper.update_arguments,
+NGArgumentParser.remove_argument, group= on add_argument)."""
+
+import pytest
+
+
+@pytest.fixture
+def parser(ngparser):
+    parser = ngparser.NGArgumentParser()
+    parser.add_predict_subparser(help="Run one unit.")
+    return parser
+
+
+def group_titles(wrapper, action):
+    return [group.title for group in wrapper._action_groups if action in group._group_actions]
+
+
+def test_update_arguments_renames_and_regroups(parser):
+    predict = parser.parser_predict
+
+    # The option strings given replace the old ones: -f becomes -F.
+    assert predict.update_arguments("--output-format", "-F", default="json", group="formats")
+
+    action = predict._option_string_actions["-F"]
+    assert action is predict._option_string_actions["--output-format"]
+    assert "-f" not in predict._option_string_actions
+    assert group_titles(predict, action) == ["formats"]
+    assert action.container.title == "formats"
+    assert parser.parse_args_list(["predict", "-F", "tsv"]).output_format == "tsv"
+    assert parser.parse_args_list(["predict"]).output_format == "json"
+    with pytest.raises(SystemExit):
+        parser.parse_args_list(["predict", "-f", "tsv"])
+    assert not predict.update_arguments("--no-such-option", help="x")
+
+
+def test_update_arguments_keeps_the_group_when_none_is_given(parser):
+    predict = parser.parser_predict
+    before = group_titles(predict, predict._option_string_actions["-o"])
+
+    assert predict.update_arguments("-o", help="where results go")
+
+    action = predict._option_string_actions["-o"]
+    assert action.help == "where results go"
+    assert group_titles(predict, action) == before == ["output options"]
+
+
+def test_remove_argument_stops_accepting_the_option(parser):
+    parser.remove_argument("--profile", "predict")
+
+    predict = parser.parser_predict
+    assert "--profile" not in predict._option_string_actions
+    assert all(action.dest != "profile" for action in predict._actions)
+    with pytest.raises(SystemExit):
+        parser.parse_args_list(["predict", "--profile"])
+    parser.remove_argument("--profile", "predict")  # already gone: no error
+
+
+def test_grouped_add_argument_indexes_groups_by_title(ngparser, parser):
+    predict = parser.parser_predict
+    for i in range(300):
+        predict.add_argument(f"--method-{i}", group=f"method {i % 3}")
+
+    titles = [group.title for group in predict._action_groups]
+    assert titles.count("method 0") == 1 and titles.count("output options") == 1
+    assert len(ngparser.group_by_title(predict, "method 2")._group_actions) == 100
+    assert ngparser.group_by_title(predict, "missing") is None
+
+    # A group created directly on the subparser is still found by title.
+    direct = predict.add_argument_group("direct")
+    predict.add_argument("--direct-flag", group="direct")
+    assert direct._group_actions[-1].dest == "direct_flag"
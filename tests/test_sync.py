@@ -8,6 +8,7 @@ FRAMEWORK_FILES = [
     "src/core/set_pythonpath.py",
     "src/core/configure.py",
     "scripts/core/build.sh",
+    "scripts/core/build.py",
     "Makefile",
 ]
 
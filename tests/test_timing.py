@@ -0,0 +1,128 @@
+"""Stage timing and reports (ngargparser/timing.py → src/core/timing.py)."""
+
+import atexit
+import json
+import pstats
+import subprocess
+import sys
+import tracemalloc
+from argparse import Namespace
+
+import pytest
+
+from ngargparser import cli, result_writer, timing
+
+
+@pytest.fixture(autouse=True)
+def clean_timing():
+    timing.reset()
+    yield
+    timing.reset()
+
+
+def test_stage_records_wall_cpu_and_rss_even_on_error():
+    with timing.stage("parse") as record:
+        record["rows"] = 3
+    with pytest.raises(RuntimeError), timing.stage("score"):
+        raise RuntimeError("boom")
+
+    parse, score = timing.stages()
+    assert parse["name"] == "parse" and parse["rows"] == 3
+    assert parse["wall_s"] >= 0 and parse["cpu_s"] >= 0
+    assert parse["max_rss_mb"] is None or parse["max_rss_mb"] > 0
+    assert score["name"] == "score"
+
+
+def test_write_results_is_timed(tmp_path):
+    result_writer.write_results({"results": []}, tmp_path / "out", "json")
+
+    assert [record["name"] for record in timing.stages()] == ["write_results"]
+
+
+def test_sidecar_paths_and_opt_in(tmp_path, monkeypatch):
+    assert timing.sidecar_path("predict", "/o/result.0") == timing.Path("/o/result.0.timing.json")
+    assert timing.sidecar_path("preprocess", None, "/o") == timing.Path("/o/preprocess.timing.json")
+    assert timing.sidecar_path("predict") is None
+
+    monkeypatch.delenv(timing.TIMING_ENV_VAR, raising=False)
+    assert not timing.start_command("predict", tmp_path / "x.timing.json")
+    monkeypatch.setenv(timing.TIMING_ENV_VAR, "1")
+    assert timing.start_command("predict", tmp_path / "x.timing.json")
+    assert not timing.start_command("predict", None)
+
+
+def write_job(run_dir, name, subcommand, total_wall, stages):
+    timing.reset()
+    for stage_name, wall in stages:
+        with timing.stage(stage_name):
+            pass
+        timing._stages[-1]["wall_s"] = wall
+    path = timing.write_sidecar(run_dir / f"{name}{timing.SIDECAR_SUFFIX}", subcommand)
+    sidecar = json.loads(path.read_text())
+    sidecar["total"]["wall_s"] = total_wall
+    path.write_text(json.dumps(sidecar))
+
+
+def test_report_ranks_jobs_and_aggregates_stages(tmp_path):
+    run = tmp_path / "run"
+    write_job(run / "predict-outputs", "result.0", "predict", 5.0, [("parse", 1.0), ("score", 3.0)])
+    write_job(run / "predict-outputs", "result.1", "predict", 9.0, [("parse", 2.0), ("score", 6.0)])
+    write_job(run, "preprocess", "preprocess", 1.0, [("job_descriptions", 0.5)])
+    (run / "broken.timing.json").write_text("{")
+
+    report = timing.load_report(run, top=2)
+
+    assert report["sidecars"] == 3
+    assert [job["job"] for job in report["jobs"]] == ["predict-outputs/result.1", "predict-outputs/result.0"]
+    assert report["unreadable"] == [str(run / "broken.timing.json")]
+    score = report["stages"][0]
+    assert (score["name"], score["count"], score["wall_s"], score["max_wall_s"]) == ("score", 2, 9.0, 6.0)
+    assert score["mean_wall_s"] == 4.5
+    assert [agg["name"] for agg in report["stages"]] == ["score", "parse", "job_descriptions"]
+    lines = timing.format_report(report)
+    assert lines[0] == "Slowest jobs (2 of 3):"
+    assert any(line.endswith("predict-outputs/result.1 (predict)") for line in lines)
+
+
+def test_cli_report(tmp_path, strip_ansi, capsys):
+    args = Namespace(output_dir=str(tmp_path), top=10, json=False)
+    assert cli.report_command(args) == 1
+    assert "NGARGPARSER_TIMING=1" in strip_ansi(capsys.readouterr().out)
+
+    write_job(tmp_path, "result.0", "predict", 2.0, [("parse", 1.0)])
+    assert cli.report_command(args) == 0
+    assert "Slowest stages" in capsys.readouterr().out
+
+    args.json = True
+    assert cli.report_command(args) == 0
+    assert json.loads(capsys.readouterr().out)["sidecars"] == 1
+
+
+@pytest.mark.parametrize("mode", timing.PROFILE_MODES)
+def test_start_profile_writes_next_to_the_stem(tmp_path, mode):
+    finish = timing.start_profile(mode, tmp_path / "out" / "result.0")
+    atexit.unregister(finish)
+    [b"x" * 1000 for _ in range(100)]
+
+    written = finish()
+
+    assert finish() is written
+    assert written[0] == tmp_path / "out" / f"result.0{timing.PROFILE_SUFFIXES[mode]}"
+    if mode == "cprofile":
+        assert pstats.Stats(str(written[0])).total_calls > 0
+    else:
+        assert tracemalloc.Snapshot.load(str(written[0])).traces
+        assert written[1].read_text()
+    assert all(path.name.endswith(timing.INSTRUMENTATION_SUFFIXES) for path in written)
+    with pytest.raises(ValueError, match="Unknown profile mode"):
+        timing.start_profile("perf", tmp_path / "x")
+
+
+def test_generated_tool_profiles_predict_without_edits(scaffolded_project, tmp_path):
+    (scaffolded_project / "paths.py").write_text("")
+    run = [sys.executable, "run_demo.py", "predict", "-o", str(tmp_path / "p" / "result"), "--profile"]
+
+    result = subprocess.run(run, cwd=scaffolded_project / "src", capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert pstats.Stats(str(tmp_path / "p" / "result.prof")).total_calls > 0